@@ -0,0 +1,65 @@
+# bench_agenda.py
+# Consultas por período numa agenda grande: contagem + primeira página pelo
+# índice de data do evento (como "o que tenho amanhã" faz) x percorrer a
+# agenda inteira filtrando em Python.
+#
+#   python benchmarks/bench_agenda.py [--eventos 50000] [--repeticoes 50]
+import argparse
+import datetime
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from joelma import agenda_store, horarios  # noqa: E402
+
+PAGINA = 5
+CONSULTAS = ["o que tenho hoje", "agenda de amanhã", "agenda desta semana", "o que tenho no mês que vem"]
+
+
+def pelo_indice(store, inicio, fim):
+    total = store.count(inicio, fim, campo='quando')
+    return total, list(itertools.islice(store.iter_events('quando', PAGINA, inicio, fim), PAGINA))
+
+
+def varrendo(store, inicio, fim):
+    achados = [ev for ev in store.iter_events(page_size=1000)
+               if ev.quando is not None and inicio <= ev.quando < fim]
+    achados.sort(key=lambda ev: (ev.quando, ev.id))
+    return len(achados), achados[:PAGINA]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--eventos', type=int, default=50000)
+    parser.add_argument('--repeticoes', type=int, default=50)
+    args = parser.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="bench_agenda_")
+    store = agenda_store.AgendaStore(os.path.join(pasta, 'agenda.db'), legacy_file=None)
+    agora = datetime.datetime.now().replace(microsecond=0)
+    t0 = time.perf_counter()
+    store.add_many((f"evento {i}", agora + datetime.timedelta(minutes=random.randrange(-30 * 1440, 365 * 1440)))
+                   for i in range(args.eventos))
+    print(f"{args.eventos} eventos cadastrados em {time.perf_counter() - t0:.1f}s")
+
+    for consulta in CONSULTAS:
+        inicio, fim, _ = horarios.intervalo(consulta, agora)
+        esperado = varrendo(store, inicio, fim)
+        assert pelo_indice(store, inicio, fim) == esperado, consulta
+        tempos = {}
+        for nome, fn, n in [("índice", pelo_indice, args.repeticoes), ("varredura", varrendo, 3)]:
+            t0 = time.perf_counter()
+            for _ in range(n):
+                fn(store, inicio, fim)
+            tempos[nome] = (time.perf_counter() - t0) / n
+        print(f"  {consulta:28s} {esperado[0]:6d} eventos  índice {tempos['índice'] * 1000:7.2f}ms  "
+              f"varredura {tempos['varredura'] * 1000:8.1f}ms  ({tempos['varredura'] / tempos['índice']:.0f}x)")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# bench_agenda_escrita.py
+# Vários processos, cada um com várias threads, cadastrando eventos na mesma
+# agenda ao mesmo tempo, com cada evento confirmado em disco. Compara o group
+# commit (escritas que chegam juntas dividem uma transação e um fsync) com uma
+# transação por evento, e confere se nenhum evento se perdeu e se o banco está
+# íntegro. Com --matar, um processo é morto no meio das escritas (kill -9) e a
+# agenda precisa abrir íntegra, com todos os eventos que ele confirmou.
+#
+#   python benchmarks/bench_agenda_escrita.py [--processos 4] [--threads 8] [--eventos 200] [--matar]
+import argparse
+import multiprocessing
+import os
+import signal
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from joelma import agenda_store  # noqa: E402
+
+
+def escritor(path, n, threads, eventos, grupo_max, confirmados, pronto):
+    agenda_store.GRUPO_MAX = grupo_max
+    store = agenda_store.AgendaStore(path, legacy_file=None)
+    pronto.wait()
+
+    def cadastrar(t):
+        for i in range(eventos):
+            store.add(f"processo {n} thread {t} evento {i}")
+            with confirmados.get_lock():
+                confirmados.value += 1
+
+    ths = [threading.Thread(target=cadastrar, args=(t,)) for t in range(threads)]
+    for th in ths:
+        th.start()
+    for th in ths:
+        th.join()
+    print(f"  processo {n}: {store.escritas} eventos em {store.transacoes} transações", flush=True)
+    store.close()
+
+
+def rodada(args, grupo_max, matar=False):
+    pasta = tempfile.mkdtemp(prefix="bench_agenda_escrita_")
+    path = os.path.join(pasta, 'agenda.db')
+    agenda_store.AgendaStore(path, legacy_file=None).close()
+    pronto = multiprocessing.Event()
+    confirmados = [multiprocessing.Value('i', 0) for _ in range(args.processos)]
+    procs = [multiprocessing.Process(target=escritor, args=(path, n, args.threads, args.eventos, grupo_max,
+                                                            confirmados[n], pronto))
+             for n in range(args.processos)]
+    for p in procs:
+        p.start()
+    t0 = time.perf_counter()
+    pronto.set()
+    if matar:
+        while confirmados[0].value < args.threads * args.eventos // 2:
+            time.sleep(0.001)
+        os.kill(procs[0].pid, signal.SIGKILL)
+    for p in procs:
+        p.join()
+    dt = time.perf_counter() - t0
+
+    store = agenda_store.AgendaStore(path, legacy_file=None)
+    total = store.count()
+    contados = store.range(limit=None)
+    store.close()
+    db = sqlite3.connect(path)
+    integro = db.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    db.close()
+    esperado = sum(c.value for c in confirmados)
+    ok = integro and len(contados) == total and (total >= esperado if matar else total == esperado)
+    print(f"{'group commit' if grupo_max > 1 else 'um commit por evento':22s} {total:6d} eventos em {dt:5.2f}s "
+          f"({total / dt:7.0f}/s)  confirmados {esperado}  íntegro: {'sim' if integro else 'NÃO'}")
+    return ok, total / dt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--processos', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--eventos', type=int, default=200)
+    parser.add_argument('--matar', action='store_true', help="mata um processo no meio das escritas")
+    args = parser.parse_args()
+
+    ok_um, um = rodada(args, 1)
+    ok_grupo, grupo = rodada(args, agenda_store.GRUPO_MAX)
+    print(f"group commit: {grupo / um:.1f}x a vazão de um commit por evento")
+    ok = ok_um and ok_grupo
+    if args.matar:
+        ok = rodada(args, agenda_store.GRUPO_MAX, matar=True)[0] and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
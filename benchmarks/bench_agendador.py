@@ -0,0 +1,78 @@
+# bench_agendador.py
+# Fila de lembretes com uma agenda grande: custo de agendar, cancelar e
+# recarregar milhares de lembretes, e atraso de disparo de lembretes que
+# vencem durante o teste (a thread dorme até o próximo vencimento).
+#
+#   python benchmarks/bench_agendador.py [--lembretes 10000] [--disparos 200]
+import argparse
+import datetime
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from joelma import agendador  # noqa: E402
+
+
+def percentil(valores, q):
+    ordenados = sorted(valores)
+    return ordenados[min(int(q * len(ordenados)), len(ordenados) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--lembretes', type=int, default=10000)
+    parser.add_argument('--disparos', type=int, default=200)
+    args = parser.parse_args()
+
+    disparados = []
+    fim = threading.Event()
+
+    def on_due(ident, quando, texto):
+        disparados.append((ident, time.time() - quando.timestamp()))
+        if len(disparados) == args.disparos:
+            fim.set()
+
+    ag = agendador.Agendador(on_due, publish=False).iniciar()
+    agora = datetime.datetime.now()
+    futuros = [(i, agora + datetime.timedelta(days=1, seconds=random.randrange(86400 * 30)), f"evento {i}")
+               for i in range(args.lembretes)]
+
+    t0 = time.perf_counter()
+    for ident, quando, texto in futuros:
+        ag.agendar(ident, quando, texto)
+    t_agendar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for ident in random.sample(range(args.lembretes), args.lembretes // 2):
+        ag.cancelar(ident)
+    t_cancelar = time.perf_counter() - t0
+    restantes = len(ag)
+
+    ag.limpar()
+    t0 = time.perf_counter()
+    ag.carregar(futuros)
+    t_carregar = time.perf_counter() - t0
+
+    # Lembretes que vencem nos próximos 2 s, misturados aos milhares pendentes
+    inicio = datetime.datetime.now()
+    for k in range(args.disparos):
+        ag.agendar(args.lembretes + k, inicio + datetime.timedelta(seconds=random.uniform(0.05, 2.0)), "agora")
+    ok = fim.wait(10)
+    ag.parar()
+
+    n = args.lembretes
+    print(f"{n} lembretes: agendar {t_agendar / n * 1e6:.1f} µs, cancelar {t_cancelar / (n // 2) * 1e6:.1f} µs, "
+          f"carregar de uma vez {t_carregar / n * 1e6:.1f} µs por lembrete")
+    print(f"pendentes depois de cancelar metade: {restantes}")
+    atrasos = [a * 1000 for _, a in disparados]
+    if atrasos:
+        print(f"{len(atrasos)}/{args.disparos} disparados; atraso p50 {percentil(atrasos, 0.5):.1f}ms  "
+              f"p95 {percentil(atrasos, 0.95):.1f}ms  máx {max(atrasos):.1f}ms")
+    sys.exit(0 if ok and restantes == n - n // 2 else 1)
+
+
+if __name__ == "__main__":
+    main()
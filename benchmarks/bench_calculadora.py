@@ -0,0 +1,102 @@
+# bench_calculadora.py
+# Micro-benchmark: safe_eval antigo (joelma.3.py) x calculadora.safe_eval.
+#   python benchmarks/bench_calculadora.py [--repeticoes 2000]
+import argparse
+import ast
+import math
+import operator
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from joelma import calculadora  # noqa: E402
+
+EXPRESSOES = [
+    "2 mais 3",
+    "10 vezes 4 menos 2",
+    "100 dividido por 8",
+    "7 x 6",
+    "3,5 mais 1,25",
+    "2 ^ 10",
+    "(4 mais 5) vezes 3",
+    "sqrt(144)",
+    "1 mais 2 mais 3 mais 4 mais 5 mais 6",
+    "81 por 9 menos 2 vezes 3",
+]
+# Números por extenso: o safe_eval antigo não entende, então só o novo é medido
+POR_EXTENSO = {
+    "dois mais três": 5,
+    "vinte e cinco vezes quatro": 100,
+    "dois vírgula cinco mais um e meio": 4.0,
+    "mil e quinhentos dividido por três": 500.0,
+}
+
+
+# Cópia fiel do safe_eval de joelma.3.py antes da calculadora
+def safe_eval_antigo(expr):
+    expr = expr.lower()
+    expr = re.sub(r'\b(x|vezes)\b', '*', expr)
+    expr = re.sub(r'\b(mais)\b', '+', expr)
+    expr = re.sub(r'\b(menos)\b', '-', expr)
+    expr = re.sub(r'\b(dividido por|dividido|por)\b', '/', expr)
+    expr = expr.replace(',', '.')
+    expr = re.sub(r'[^0-9+\-*/().^sqrt ]','',expr)
+    expr = expr.replace("^", "**")
+    if "sqrt" in expr:
+        try:
+            num = float(expr.replace("sqrt", "").strip("() "))
+            return math.sqrt(num)
+        except: raise ValueError("Expressão de raiz inválida")
+    if not any(c in expr for c in "+-*/"): # Se for só um número, não calcule
+        raise ValueError("Expressão incompleta")
+    node = ast.parse(expr, mode='eval')
+    ops = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv, ast.Pow: operator.pow}
+    def _eval(n):
+        if isinstance(n, ast.Expression): return _eval(n.body)
+        if isinstance(n, ast.BinOp):
+            l, r = _eval(n.left), _eval(n.right)
+            return ops[type(n.op)](l,r)
+        if isinstance(n, ast.UnaryOp) and isinstance(n.op, ast.USub): return -_eval(n.operand)
+        if isinstance(n, ast.Constant) and isinstance(n.value, (int, float)): return n.value
+        raise ValueError("Expressão inválida")
+    return _eval(node)
+
+
+def lote(fn):
+    for e in EXPRESSOES:
+        fn(e)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticoes', type=int, default=2000)
+    n = parser.parse_args().repeticoes
+    for e in EXPRESSOES:
+        assert safe_eval_antigo(e) == calculadora.safe_eval(e), e
+    for e, esperado in POR_EXTENSO.items():
+        assert calculadora.safe_eval(e) == esperado, e
+
+    antigo = min(timeit.repeat(lambda: lote(safe_eval_antigo), number=n, repeat=5))
+    # Sem cache: mede só a normalização pré-compilada e o avaliador
+    sem_cache = min(timeit.repeat(
+        lambda: (calculadora.normalize.cache_clear(), calculadora._evaluate_normalized.cache_clear(),
+                 lote(calculadora.safe_eval)),
+        number=n, repeat=5))
+    com_cache = min(timeit.repeat(lambda: lote(calculadora.safe_eval), number=n, repeat=5))
+
+    total = n * len(EXPRESSOES)
+    print(f"{total} avaliações por rodada")
+    for nome, t in [("antigo", antigo), ("novo, sem cache", sem_cache), ("novo, com cache", com_cache)]:
+        print(f"  {nome:16s} {t * 1e6 / total:8.2f} µs/expressão  ({antigo / t:5.1f}x)")
+
+    t0 = timeit.default_timer()
+    try:
+        calculadora.safe_eval("9 ^ 9 ^ 9")
+    except ValueError as e:
+        print(f"  9 ^ 9 ^ 9 recusado em {(timeit.default_timer() - t0) * 1e6:.0f} µs: {e}")
+
+
+if __name__ == "__main__":
+    main()
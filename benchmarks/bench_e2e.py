@@ -0,0 +1,418 @@
+# bench_e2e.py
+# Benchmark de ponta a ponta do assistente, sem microfone nem rede.
+#
+# O assistente (joelma.assistente.main) roda de verdade, mas com:
+#   - um microfone falso que toca falas gravadas (WAV) ou sintéticas em tempo real;
+#   - um reconhecedor local no lugar do recognize_google, com latência configurável;
+#   - um gTTS local com latência configurável e uma reprodução que só registra
+#     o que seria tocado.
+# Um "usuário" roteirizado fala a palavra de ativação, espera o "Sim?", dá o
+# comando e responde às perguntas; mede-se a latência de cada interação (fim da
+# fala do usuário até o início da resposta) e a vazão por comando.
+#
+#   python benchmarks/bench_e2e.py                      # roteiro padrão
+#   python benchmarks/bench_e2e.py roteiro.json         # roteiro próprio
+#   python benchmarks/bench_e2e.py --salvar-baseline    # grava a referência
+#
+# Roteiro (JSON): {"turnos": [{"comando": "que horas são", "wav": "hora.wav",
+#                             "respostas": [{"texto": "...", "wav": "..."}]}]}
+# Sem "wav", a fala é um sinal sintético com a duração de "duracao" segundos.
+import argparse
+import array
+import collections
+import importlib.machinery
+import json
+import math
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import types
+import wave
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_e2e.json')
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+AMPLITUDE = 4000
+TOLERANCIA = 0.10  # piora aceitável do p95 em relação à baseline
+
+ROTEIRO_PADRAO = [
+    {"comando": "que horas são"},
+    {"comando": "que dia é hoje"},
+    {"comando": "calcular 2 mais 3 vezes 4"},
+    {"comando": "cadastrar evento", "respostas": ["reunião com a equipe"]},
+    {"comando": "ler agenda"},
+    {"comando": "resolver equação de primeiro grau", "respostas": ["2", "4"]},
+]
+
+
+# --- MICROFONE FALSO ---
+
+class FakeUser:
+    """Fonte de áudio do microfone falso: silêncio, exceto quando o usuário fala."""
+
+    def __init__(self):
+        self._falas = queue.Queue()
+        self._atual = None
+        self._offset = 0
+        self.transcricoes = collections.deque()
+
+    def say(self, pcm, texto):
+        done = threading.Event()
+        item = {'pcm': pcm, 'texto': texto, 'done': done, 'fim': None}
+        self._falas.put(item)
+        return item
+
+    def read(self, n_bytes):
+        out = bytearray()
+        while len(out) < n_bytes:
+            if self._atual is None:
+                try:
+                    self._atual = self._falas.get_nowait()
+                    self._offset = 0
+                    # O reconhecedor falso devolve as transcrições na ordem das falas
+                    self.transcricoes.append(self._atual['texto'])
+                except queue.Empty:
+                    out.extend(b'\0' * (n_bytes - len(out)))
+                    break
+            pcm = self._atual['pcm']
+            parte = pcm[self._offset:self._offset + n_bytes - len(out)]
+            out.extend(parte)
+            self._offset += len(parte)
+            if self._offset >= len(pcm):
+                self._atual['fim'] = time.monotonic()
+                self._atual['done'].set()
+                self._atual = None
+        return bytes(out)
+
+
+class _FakeStream:
+    def __init__(self, mic):
+        self.mic = mic
+        self._next = time.monotonic()
+
+    def read(self, size, exception_on_overflow=False):
+        # Entrega os blocos no ritmo de um microfone real
+        self._next += size / self.mic.SAMPLE_RATE
+        espera = self._next - time.monotonic()
+        if espera > 0:
+            time.sleep(espera)
+        return self.mic.user.read(size * self.mic.SAMPLE_WIDTH)
+
+
+def make_microphone_class(user):
+    class FakeMicrophone:
+        def __init__(self, device_index=None, sample_rate=None, chunk_size=1024):
+            self.SAMPLE_RATE = sample_rate or SAMPLE_RATE
+            self.SAMPLE_WIDTH = SAMPLE_WIDTH
+            self.CHUNK = chunk_size
+            self.user = user
+            self.stream = None
+
+        def __enter__(self):
+            self.stream = _FakeStream(self)
+            return self
+
+        def __exit__(self, *exc):
+            self.stream = None
+
+    return FakeMicrophone
+
+
+def synthetic_speech(segundos):
+    n = int(segundos * SAMPLE_RATE)
+    amostras = array.array('h', (int(AMPLITUDE * math.sin(2 * math.pi * 220 * i / SAMPLE_RATE))
+                                 for i in range(n)))
+    return amostras.tobytes()
+
+
+def load_wav(path):
+    with wave.open(path, 'rb') as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != SAMPLE_WIDTH or wf.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path}: use WAV mono, 16 bits, {SAMPLE_RATE} Hz")
+        return wf.readframes(wf.getnframes())
+
+
+# --- SUBSTITUTOS DE RECONHECIMENTO E FALA ---
+
+def install_stubs(user, latencia_stt, latencia_tts, reproducao_por_caractere, tocadas):
+    """Troca microfone, reconhecimento, gTTS e playsound por versões locais."""
+    try:
+        import speech_recognition as sr
+    except ImportError:
+        sr = _minimal_speech_recognition()
+        sys.modules['speech_recognition'] = sr
+
+    def recognize_google(self, audio, language=None, **kwargs):
+        time.sleep(latencia_stt)
+        if not user.transcricoes:
+            raise sr.UnknownValueError()
+        return user.transcricoes.popleft()
+
+    sr.Microphone = make_microphone_class(user)
+    sr.Recognizer.recognize_google = recognize_google
+
+    gtts = types.ModuleType('gtts')
+    gtts.__spec__ = importlib.machinery.ModuleSpec('gtts', None)  # visto como instalado por find_spec
+
+    class gTTS:
+        def __init__(self, text, lang='pt', **kwargs):
+            self.text = text
+
+        def write_to_fp(self, fp):
+            time.sleep(latencia_tts)
+            fp.write(self.text.encode('utf-8'))
+
+        def save(self, path):
+            with open(path, 'wb') as fp:
+                self.write_to_fp(fp)
+
+    gtts.gTTS = gTTS
+    sys.modules['gtts'] = gtts
+
+    def _tocar(data, parar=None):
+        texto = data.decode('utf-8')
+        tocadas.append((time.monotonic(), texto))
+        (parar or threading.Event()).wait(len(texto) * reproducao_por_caractere)
+
+    playsound = types.ModuleType('playsound')
+
+    def _playsound(path, block=True):
+        with open(path, 'rb') as f:
+            _tocar(f.read())
+
+    playsound.playsound = _playsound
+    sys.modules['playsound'] = playsound
+
+    # Reprodução em memória, como com o miniaudio instalado
+    from joelma import reproducao
+    reproducao.MINIAUDIO_AVAILABLE = True
+    reproducao.play_bytes = lambda data, suffix=".mp3", parar=None: _tocar(data, parar)
+
+
+def _minimal_speech_recognition():
+    # Só o necessário para o script rodar quando o SpeechRecognition não está instalado
+    sr = types.ModuleType('speech_recognition')
+
+    class WaitTimeoutError(Exception):
+        pass
+
+    class UnknownValueError(Exception):
+        pass
+
+    class RequestError(Exception):
+        pass
+
+    class AudioData:
+        def __init__(self, frame_data, sample_rate, sample_width):
+            self.frame_data = frame_data
+            self.sample_rate = sample_rate
+            self.sample_width = sample_width
+
+        def get_raw_data(self, convert_rate=None, convert_width=None):
+            return self.frame_data
+
+    class Recognizer:
+        def __init__(self):
+            self.energy_threshold = 300
+            self.dynamic_energy_threshold = True
+            self.pause_threshold = 0.8
+            self.phrase_threshold = 0.3
+            self.non_speaking_duration = 0.5
+
+        def adjust_for_ambient_noise(self, source, duration=1):
+            lidos = 0
+            while lidos < duration * source.SAMPLE_RATE:
+                source.stream.read(source.CHUNK)
+                lidos += source.CHUNK
+
+    for cls in (WaitTimeoutError, UnknownValueError, RequestError, AudioData, Recognizer):
+        setattr(sr, cls.__name__, cls)
+    return sr
+
+
+# --- EXECUÇÃO ---
+
+def _percentil(valores, p):
+    if not valores:
+        return float('nan')
+    ordenados = sorted(valores)
+    k = max(int(math.ceil(p / 100 * len(ordenados))) - 1, 0)
+    return ordenados[k]
+
+
+class Runner:
+    def __init__(self, args):
+        self.args = args
+        self.user = FakeUser()
+        self.tocadas = []
+        self.assistente = None
+        self.erro = None
+
+    def _fala(self, item, base):
+        if isinstance(item, str):
+            item = {'texto': item}
+        if item.get('wav'):
+            pcm = load_wav(os.path.join(base, item['wav']))
+        else:
+            pcm = synthetic_speech(item.get('duracao', self.args.duracao))
+        return self.user.say(pcm, item['texto'])
+
+    def _esperar_resposta(self, desde, timeout=30):
+        # Espera a primeira fala do assistente iniciada depois de "desde"
+        fim = time.monotonic() + timeout
+        while time.monotonic() < fim:
+            for t, texto in list(self.tocadas):
+                if t >= desde:
+                    return t, texto
+            time.sleep(0.005)
+        raise TimeoutError("o assistente não respondeu")
+
+    def _esperar_silencio(self):
+        fluxo = self.assistente.fluxo
+        fluxo.wait_idle()
+        time.sleep(self.args.intervalo)
+        fluxo.wait_idle()
+
+    def _run_script(self):
+        try:
+            self.assistente.main()
+        except BaseException as e:
+            self.erro = e
+
+    def run(self, turnos, base):
+        sys.path.insert(0, RAIZ)
+        install_stubs(self.user, self.args.stt, self.args.tts, self.args.reproducao, self.tocadas)
+        # Importado só depois dos stubs, como aconteceria com as bibliotecas reais
+        from joelma import assistente
+        self.assistente = assistente
+        thread = threading.Thread(target=self._run_script, name="assistente", daemon=True)
+        thread.start()
+        while assistente.fluxo is None:
+            if not thread.is_alive():
+                raise RuntimeError(f"o assistente terminou na inicialização: {self.erro!r}")
+            time.sleep(0.01)
+        self._esperar_silencio()
+
+        resultados = []
+        inicio = time.monotonic()
+        for turno in turnos:
+            t0 = time.monotonic()
+            fala = self._fala({'texto': 'ok sexta-feira', 'duracao': 0.8}, base)
+            fala['done'].wait()
+            self._esperar_resposta(fala['fim'])  # "Sim?"
+            self._esperar_silencio()
+            fala = self._fala({k: v for k, v in turno.items() if k != 'respostas'} | {'texto': turno['comando']}, base)
+            fala['done'].wait()
+            t_resp, _ = self._esperar_resposta(fala['fim'])
+            latencia = t_resp - fala['fim']
+            for resposta in turno.get('respostas', []):
+                self._esperar_silencio()
+                fala = self._fala(resposta, base)
+                fala['done'].wait()
+                self._esperar_resposta(fala['fim'])
+            self._esperar_silencio()
+            resultados.append({'comando': turno['comando'], 'latencia': latencia,
+                               'duracao': time.monotonic() - t0})
+        total = time.monotonic() - inicio
+
+        fala = self._fala({'texto': 'ok sexta-feira', 'duracao': 0.8}, base)
+        fala['done'].wait()
+        self._esperar_resposta(fala['fim'])
+        self._esperar_silencio()
+        self._fala({'texto': 'sair', 'duracao': 0.5}, base)
+        thread.join(timeout=30)
+        return resultados, total
+
+
+def resumo(resultados, total):
+    por_comando = collections.OrderedDict()
+    for r in resultados:
+        por_comando.setdefault(r['comando'], []).append(r)
+    out = {'total': {}, 'comandos': {}}
+    for nome, rs in list(por_comando.items()) + [('total', resultados)]:
+        lat = [r['latencia'] for r in rs]
+        tempo = sum(r['duracao'] for r in rs)
+        dados = {
+            'n': len(rs),
+            'vazao_por_min': 60 * len(rs) / tempo if tempo else 0.0,
+            'p50': _percentil(lat, 50),
+            'p95': _percentil(lat, 95),
+            'p99': _percentil(lat, 99),
+        }
+        if nome == 'total':
+            dados['tempo_total'] = total
+            out['total'] = dados
+        else:
+            out['comandos'][nome] = dados
+    return out
+
+
+def imprimir(res, baseline=None):
+    print(f"{'comando':36s} {'n':>3s} {'/min':>6s} {'p50':>7s} {'p95':>7s} {'p99':>7s}")
+    linhas = list(res['comandos'].items()) + [('TOTAL', res['total'])]
+    regressoes = []
+    for nome, d in linhas:
+        ref = None
+        if baseline:
+            ref = baseline['total'] if nome == 'TOTAL' else baseline['comandos'].get(nome)
+        marca = ""
+        if ref and d['p95'] > ref['p95'] * (1 + TOLERANCIA):
+            marca = f"  REGRESSÃO (baseline p95 {ref['p95'] * 1000:.0f} ms)"
+            regressoes.append(nome)
+        print(f"{nome[:36]:36s} {d['n']:3d} {d['vazao_por_min']:6.1f} "
+              f"{d['p50'] * 1000:5.0f}ms {d['p95'] * 1000:5.0f}ms {d['p99'] * 1000:5.0f}ms{marca}")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta do assistente.")
+    parser.add_argument('roteiro', nargs='?', help="arquivo JSON com os turnos")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--stt', type=float, default=0.4, help="latência do reconhecedor (s)")
+    parser.add_argument('--tts', type=float, default=0.3, help="latência da síntese (s)")
+    parser.add_argument('--reproducao', type=float, default=0.01, help="segundos de áudio por caractere")
+    parser.add_argument('--duracao', type=float, default=1.0, help="duração das falas sintéticas (s)")
+    parser.add_argument('--intervalo', type=float, default=0.3, help="pausa do usuário entre falas (s)")
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--salvar-baseline', action='store_true')
+    parser.add_argument('--verbose', action='store_true', help="mostra a saída do assistente")
+    args = parser.parse_args()
+
+    if args.roteiro:
+        with open(args.roteiro, encoding='utf-8') as f:
+            turnos = json.load(f)['turnos']
+        base = os.path.dirname(os.path.abspath(args.roteiro))
+    else:
+        turnos, base = ROTEIRO_PADRAO, RAIZ
+    turnos = [t for _ in range(args.repeticoes) for t in turnos]
+
+    # Diretório de trabalho temporário: agenda e cache de fala começam vazios
+    os.chdir(tempfile.mkdtemp(prefix="bench_e2e_"))
+    saida = sys.stdout
+    if not args.verbose:
+        sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    try:
+        resultados, total = Runner(args).run(turnos, base)
+    finally:
+        sys.stdout = saida
+    res = resumo(resultados, total)
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.salvar_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressoes = imprimir(res, baseline)
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(res, f, indent=2, ensure_ascii=False)
+        print(f"Baseline salva em {args.baseline}")
+    sys.exit(1 if regressoes else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# bench_servidor.py
+# Carga no modo servidor com clientes falsos locais: várias sessões ao mesmo
+# tempo, cada uma com interações de um e de vários turnos (equações, cadastro
+# de evento). Confere se cada sessão recebeu as próprias respostas e mede a
+# latência de cada interação e a vazão total.
+#
+#   python benchmarks/bench_servidor.py [--clientes 20] [--rodadas 5] [--verbose]
+#
+# As sessões usam só texto (quadros T), sem reconhecimento nem síntese.
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+RAIZ = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def roteiro(n):
+    """Interações da sessão n: (falas enviadas, verificação das respostas)."""
+    a, b = n + 1, -(n + 1) * 3
+    return [
+        (["ok sexta-feira que horas são"], lambda r: r[0].startswith("Agora são")),
+        (["ok sexta-feira calcular 2 mais 2"], lambda r: r == ["O resultado é 4"]),
+        # Duas perguntas de acompanhamento, com valores diferentes em cada sessão
+        (["sexta-feira resolver equação de primeiro grau", str(a), str(b)],
+         lambda r: r[-1] == f"A raiz da equação é x = {-b / a:.2f}"),
+        (["sexta-feira", f"calcular {n} vezes 3"], lambda r: r == ["Sim?", f"O resultado é {n * 3}"]),
+        (["ok sexta-feira novo evento", f"reunião da sessão {n}"], lambda r: r[-1] == "Evento cadastrado."),
+    ]
+
+
+def cliente(servidor_mod, porta, n, rodadas, latencias, erros):
+    c = servidor_mod.Cliente(porta=porta)
+    try:
+        for _ in range(rodadas):
+            for falas, ok in roteiro(n):
+                t0 = time.perf_counter()
+                respostas, _, fim = c.turno(*falas)
+                latencias.append(time.perf_counter() - t0)
+                if fim or not ok(respostas):
+                    erros.append((n, falas, respostas))
+    finally:
+        c.fechar()
+
+
+def percentil(valores, q):
+    ordenados = sorted(valores)
+    return ordenados[min(int(q * len(ordenados)), len(ordenados) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--clientes', type=int, default=20)
+    parser.add_argument('--rodadas', type=int, default=5)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    os.environ['JOELMA_DATA'] = tempfile.mkdtemp(prefix="bench_servidor_")
+    sys.path.insert(0, RAIZ)
+    from joelma import servidor as servidor_mod
+
+    srv = servidor_mod.Servidor(('127.0.0.1', 0))
+    porta = srv.server_address[1]
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+
+    saida = sys.stdout
+    if not args.verbose:
+        sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    latencias, erros = [], []
+    t0 = time.perf_counter()
+    try:
+        threads = [threading.Thread(target=cliente, args=(servidor_mod, porta, n, args.rodadas, latencias, erros))
+                   for n in range(args.clientes)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        total = time.perf_counter() - t0
+        sys.stdout = saida
+        srv.shutdown()
+        srv.server_close()
+
+    print(f"{args.clientes} sessões, {len(latencias)} interações em {total:.2f}s "
+          f"({len(latencias) / total:.0f}/s)")
+    if latencias:
+        print(f"latência  p50 {percentil(latencias, 0.5) * 1000:.1f}ms  "
+              f"p95 {percentil(latencias, 0.95) * 1000:.1f}ms  "
+              f"média {statistics.mean(latencias) * 1000:.1f}ms")
+    for n, falas, respostas in erros[:10]:
+        print(f"ERRO sessão {n}: {falas} -> {respostas}")
+    sys.exit(1 if erros else 0)
+
+
+if __name__ == "__main__":
+    main()
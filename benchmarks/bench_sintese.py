@@ -0,0 +1,57 @@
+# bench_sintese.py
+# Latência de cada backend de síntese disponível nesta máquina (gTTS, pyttsx3,
+# espeak-ng) com frases curtas e longas, sem cache, e qual deles o assistente
+# escolheria na partida.
+#
+#   python benchmarks/bench_sintese.py [--repeticoes 3] [--backends gtts,pyttsx3,espeak]
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from joelma import audio, config  # noqa: E402
+
+FRASES = [
+    "Sim?",
+    "Evento cadastrado.",
+    "Você tem três compromissos amanhã. Às nove horas, reunião com a equipe de vendas.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--backends', default=",".join(audio.TTS_NOMES))
+    args = parser.parse_args()
+
+    config.TTS_BACKENDS = [b.strip() for b in args.backends.split(',') if b.strip()]
+    try:
+        seletor = audio.sintetizador()
+    except RuntimeError as e:
+        sys.exit(str(e))
+
+    for backend in seletor.backends:
+        print(f"{backend.name}:")
+        for frase in FRASES:
+            tempos = []
+            try:
+                for _ in range(args.repeticoes):
+                    t0 = time.perf_counter()
+                    data = backend.synthesize(frase)
+                    tempos.append(time.perf_counter() - t0)
+            except Exception as e:
+                print(f"  falhou: {e}")
+                break
+            print(f"  {len(frase):3d} caracteres  mediana {statistics.median(tempos) * 1000:7.0f}ms  "
+                  f"mín {min(tempos) * 1000:7.0f}ms  {len(data) / 1024:6.1f} KiB")
+
+    seletor.auto = True
+    estado = seletor.avaliar()
+    print(f"escolhido na partida: {estado['ativo']}")
+    audio.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+# Assistente de voz "sexta-feira".
+#
+# O pacote pode ser importado sem abrir microfone, sem rede e sem carregar as
+# bibliotecas de áudio: a calculadora, a agenda e as equações funcionam sozinhas.
+# O assistente completo roda com:  python -m joelma
+# Modo servidor (vários dispositivos, um processo):  python -m joelma.servidor
+# Modo lote (falas gravadas ou transcritas, sem microfone):  python -m joelma.lote entrada
+# Backends de fala (o mais rápido medido na partida é usado):
+#   JOELMA_TTS=auto | gtts,pyttsx3,espeak    JOELMA_STT=google,vosk | auto
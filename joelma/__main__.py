@@ -0,0 +1,3 @@
+from .assistente import main
+
+main()
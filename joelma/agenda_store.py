@@ -0,0 +1,380 @@
+# agenda_store.py
+# Agenda em SQLite (modo WAL) com índices por data de cadastro e data do
+# evento. Substitui o arquivo texto data/agenda.txt, que é migrado
+# automaticamente na primeira abertura.
+#
+# Vários processos podem escrever na mesma agenda: o SQLite trava o arquivo
+# durante cada transação e os outros esperam (ESPERA_TRAVA). Cada transação
+# confirmada é gravada em disco (synchronous=FULL); para isso não custar um
+# fsync por evento, as escritas que chegam enquanto outra está gravando entram
+# todas juntas na transação seguinte (group commit). Os quadros do WAL têm
+# checksum: uma gravação interrompida ao meio é descartada na próxima
+# abertura, e o banco volta ao último commit completo. Depois de muitos
+# eventos apagados, o espaço livre é devolvido ao disco em segundo plano.
+import collections
+import datetime
+import os
+import re
+import sqlite3
+import threading
+
+from . import horarios
+
+DB_FILE = os.path.join('data', 'agenda.db')
+LEGACY_FILE = os.path.join('data', 'agenda.txt')
+FORMATO = "%Y-%m-%d %H:%M:%S"  # texto ISO: a ordem alfabética é a cronológica
+CAMPOS = ('criado_em', 'quando')
+ESPERA_TRAVA = 30.0     # segundos esperando outro processo liberar o banco
+GRUPO_MAX = 256         # escritas confirmadas numa mesma transação (um fsync)
+COMPACTAR_APOS = 1000   # eventos apagados até a próxima compactação
+LIVRE_MAX = 0.25        # fração de páginas livres a partir da qual o arquivo é encolhido
+PASSO_VACUUM = 64       # páginas devolvidas por vez, com o banco livre entre os passos
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS eventos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    criado_em TEXT NOT NULL,
+    quando TEXT,
+    texto TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eventos_criado_em ON eventos (criado_em, id);
+CREATE INDEX IF NOT EXISTS idx_eventos_quando ON eventos (quando, id);
+CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor INTEGER NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('total', 0);
+CREATE TRIGGER IF NOT EXISTS eventos_total_ins AFTER INSERT ON eventos
+    BEGIN UPDATE meta SET valor = valor + 1 WHERE chave = 'total'; END;
+CREATE TRIGGER IF NOT EXISTS eventos_total_del AFTER DELETE ON eventos
+    BEGIN UPDATE meta SET valor = valor - 1 WHERE chave = 'total'; END;
+"""
+
+# Linhas do formato antigo: "[dd/mm/YYYY HH:MM] Evento: ..." (joelma.3.py)
+# ou "YYYY-MM-DDTHH:MM:SS.ffffff - ..." (variantes mais antigas)
+_LINHA_NOVA = re.compile(r'^\[(\d{2}/\d{2}/\d{4} \d{2}:\d{2})\] Evento: (.*)$')
+_LINHA_ISO = re.compile(r'^(\d{4}-\d{2}-\d{2}T[\d:.]+) - (.*)$')
+
+
+class Evento(collections.namedtuple('Evento', 'id criado_em quando texto')):
+    __slots__ = ()
+
+    def linha(self):
+        """Texto no mesmo formato que o arquivo antigo usava."""
+        return f"[{self.criado_em.strftime('%d/%m/%Y %H:%M')}] Evento: {self.texto}"
+
+
+def _fmt(dt):
+    return None if dt is None else dt.strftime(FORMATO)
+
+
+def _parse(s):
+    return None if s is None else datetime.datetime.strptime(s, FORMATO)
+
+
+def _row(row):
+    return Evento(row[0], _parse(row[1]), _parse(row[2]), row[3])
+
+
+def _ler_legado(legacy_file):
+    fallback = datetime.datetime.fromtimestamp(os.path.getmtime(legacy_file)).replace(microsecond=0)
+    rows = []
+    with open(legacy_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            criado_em, texto = parse_legacy_line(line)
+            criado_em = criado_em or fallback
+            # O arquivo antigo só tinha o texto: a data do evento sai da frase,
+            # lida em relação ao dia em que ela foi dita ("amanhã às 15h")
+            quando = horarios.interpretar(texto, criado_em)[0]
+            rows.append((_fmt(criado_em), _fmt(quando), texto))
+    return rows
+
+
+def parse_legacy_line(line):
+    """Converte uma linha do agenda.txt em (criado_em, texto)."""
+    m = _LINHA_NOVA.match(line)
+    if m:
+        return datetime.datetime.strptime(m.group(1), "%d/%m/%Y %H:%M"), m.group(2)
+    m = _LINHA_ISO.match(line)
+    if m:
+        return datetime.datetime.fromisoformat(m.group(1)).replace(microsecond=0), m.group(2)
+    return None, line
+
+
+class _Escrita:
+    __slots__ = ('fn', 'feita', 'valor', 'erro')
+
+    def __init__(self, fn):
+        self.fn = fn
+        self.feita = False
+        self.valor = None
+        self.erro = None
+
+
+class AgendaStore:
+    def __init__(self, path=DB_FILE, legacy_file=LEGACY_FILE, duravel=True):
+        self.path = path
+        self._lock = threading.Lock()  # a conexão é de uma operação por vez
+        self._cond = threading.Condition()  # fila de escritas do group commit
+        self._fila = []
+        self._gravando = False
+        self._apagados = 0
+        self._compactacao = None
+        self.transacoes = 0  # transações de escrita confirmadas
+        self.escritas = 0    # escritas nelas (escritas / transacoes = tamanho médio do grupo)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=ESPERA_TRAVA)
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")  # num banco novo; nos antigos, vale após o VACUUM
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={'FULL' if duravel else 'NORMAL'}")
+        self._db.executescript(SCHEMA)
+        if legacy_file and os.path.exists(legacy_file):
+            self.migrate(legacy_file)
+
+    def migrate(self, legacy_file):
+        """Importa o agenda.txt antigo e o renomeia para .migrado.
+
+        O arquivo é lido e renomeado com o banco travado: se dois processos
+        abrirem a agenda ao mesmo tempo, só um deles importa os eventos."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = _ler_legado(legacy_file) if os.path.exists(legacy_file) else None
+                if rows is not None:
+                    self._db.executemany("INSERT INTO eventos (criado_em, quando, texto) VALUES (?, ?, ?)", rows)
+                    os.replace(legacy_file, legacy_file + ".migrado")
+                try:
+                    self._db.execute("COMMIT")
+                except Exception:
+                    if rows is not None:
+                        os.replace(legacy_file + ".migrado", legacy_file)
+                    raise
+            finally:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+        if rows:
+            print(f"Agenda migrada: {len(rows)} eventos importados de {legacy_file}.")
+        return len(rows or ())
+
+    def _escrever(self, fn):
+        """Roda fn(db) numa transação confirmada em disco e retorna o resultado.
+
+        Quem chega enquanto outra transação grava espera na fila; ao fim dela,
+        um dos que esperam grava a fila inteira (até GRUPO_MAX) numa transação
+        só, cada escrita no seu savepoint: um erro desfaz só aquela escrita."""
+        escrita = _Escrita(fn)
+        with self._cond:
+            self._fila.append(escrita)
+            while not escrita.feita:
+                if self._gravando:
+                    self._cond.wait()
+                    continue
+                grupo, self._fila = self._fila[:GRUPO_MAX], self._fila[GRUPO_MAX:]
+                self._gravando = True
+                self._cond.release()
+                try:
+                    self._gravar(grupo)
+                finally:
+                    self._cond.acquire()
+                    self._gravando = False
+                    self._cond.notify_all()
+        if escrita.erro is not None:
+            raise escrita.erro
+        return escrita.valor
+
+    def _gravar(self, grupo):
+        with self._lock:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+                for escrita in grupo:
+                    self._db.execute("SAVEPOINT escrita")
+                    try:
+                        escrita.valor = escrita.fn(self._db)
+                    except Exception as e:
+                        self._db.execute("ROLLBACK TO escrita")
+                        escrita.erro = e
+                    self._db.execute("RELEASE escrita")
+                self._db.execute("COMMIT")
+                self.transacoes += 1
+                self.escritas += len(grupo)
+            except Exception as e:
+                for escrita in grupo:
+                    if escrita.erro is None:
+                        escrita.erro = e
+            finally:
+                if self._db.in_transaction:
+                    self._db.execute("ROLLBACK")
+                for escrita in grupo:
+                    escrita.feita = True
+
+    def add(self, texto, quando=None, criado_em=None):
+        criado_em = criado_em or datetime.datetime.now().replace(microsecond=0)
+        args = (_fmt(criado_em), _fmt(quando), texto)
+        return self._escrever(lambda db: db.execute(
+            "INSERT INTO eventos (criado_em, quando, texto) VALUES (?, ?, ?)", args).lastrowid)
+
+    def add_many(self, eventos):
+        """Cadastra vários (texto, quando) numa transação; retorna os ids."""
+        criado_em = _fmt(datetime.datetime.now().replace(microsecond=0))
+        rows = [(criado_em, _fmt(quando), texto) for texto, quando in eventos]
+
+        def inserir(db):
+            sql = "INSERT INTO eventos (criado_em, quando, texto) VALUES (?, ?, ?)"
+            return [db.execute(sql, row).lastrowid for row in rows]
+        return self._escrever(inserir)
+
+    def get(self, event_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, criado_em, quando, texto FROM eventos WHERE id = ?", (event_id,)).fetchone()
+        return None if row is None else _row(row)
+
+    def delete(self, event_id):
+        apagados = self._escrever(lambda db: db.execute("DELETE FROM eventos WHERE id = ?", (event_id,)).rowcount)
+        self._apagou(apagados)
+        return apagados > 0
+
+    def clear(self):
+        self._apagou(self._escrever(lambda db: db.execute("DELETE FROM eventos").rowcount), forcar=True)
+
+    # --- Compactação: devolve ao disco o espaço dos eventos apagados ---
+
+    def _apagou(self, n, forcar=False):
+        with self._cond:
+            self._apagados += n
+            if not (n and (forcar or self._apagados >= COMPACTAR_APOS)):
+                return
+            if self._compactacao is not None and self._compactacao.is_alive():
+                return
+            self._apagados = 0
+            self._compactacao = threading.Thread(target=self._compactar_fundo, name="agenda-compactacao",
+                                                 daemon=True)
+            self._compactacao.start()
+
+    def _compactar_fundo(self):
+        try:
+            self.compactar()
+        except sqlite3.Error as e:
+            print("Agenda: compactação adiada:", e)
+
+    def compactar(self):
+        """Encolhe o arquivo se há muitas páginas livres e esvazia o WAL.
+        Retorna quantas páginas foram devolvidas ao disco.
+
+        As páginas saem em passos de PASSO_VACUUM, soltando o banco entre um
+        passo e outro: leituras e escritas da agenda não esperam a compactação
+        inteira. Bancos criados antes do auto_vacuum incremental precisam de
+        um vacuum() (manutenção, com o assistente parado)."""
+        with self._lock:
+            paginas = self._db.execute("PRAGMA page_count").fetchone()[0]
+            livres = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+            incremental = self._db.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        if not livres or livres < paginas * LIVRE_MAX:
+            livres = 0
+        elif not incremental:
+            print("Agenda: banco sem auto_vacuum incremental; compacte com python -m joelma.agenda_store.")
+            livres = 0
+        restantes = livres
+        while restantes:
+            with self._lock:
+                # Pelo executescript o pragma roda até o fim; com execute libera uma página só
+                self._db.executescript(f"PRAGMA incremental_vacuum({PASSO_VACUUM});")
+                agora = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+            if agora >= restantes:
+                break  # nada mais a devolver (outro processo pode estar lendo)
+            restantes = agora
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        return livres - restantes
+
+    def vacuum(self):
+        """Reescreve o banco inteiro (VACUUM), que também passa a usar o
+        auto_vacuum incremental. Trava a agenda durante toda a reescrita:
+        é para manutenção, não para o assistente em uso."""
+        with self._lock:
+            self._db.execute("VACUUM")
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+    def _condicoes(self, campo, inicio, fim):
+        if campo not in CAMPOS:
+            raise ValueError(f"Campo inválido: {campo}")
+        cond, args = [], []
+        if inicio is not None:
+            cond.append(f"{campo} >= ?")
+            args.append(_fmt(inicio))
+        if fim is not None:
+            cond.append(f"{campo} < ?")
+            args.append(_fmt(fim))
+        if campo == 'quando' and not cond:
+            cond.append("quando IS NOT NULL")
+        return cond, args
+
+    def _where(self, campo, inicio, fim):
+        cond, args = self._condicoes(campo, inicio, fim)
+        return (" WHERE " + " AND ".join(cond)) if cond else "", args
+
+    def count(self, inicio=None, fim=None, campo='criado_em'):
+        """Total de eventos; sem intervalo usa o contador mantido por trigger."""
+        if inicio is None and fim is None and campo == 'criado_em':
+            with self._lock:
+                return self._db.execute("SELECT valor FROM meta WHERE chave = 'total'").fetchone()[0]
+        where, args = self._where(campo, inicio, fim)
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM eventos{where}", args).fetchone()[0]
+
+    def range(self, inicio=None, fim=None, campo='criado_em', limit=None):
+        """Eventos com campo em [inicio, fim), em ordem, usando o índice."""
+        where, args = self._where(campo, inicio, fim)
+        sql = f"SELECT id, criado_em, quando, texto FROM eventos{where} ORDER BY {campo}, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            return [_row(r) for r in self._db.execute(sql, args).fetchall()]
+
+    def iter_events(self, campo='criado_em', page_size=100, inicio=None, fim=None):
+        """Percorre os eventos com campo em [inicio, fim) em páginas (keyset),
+        pelo índice: só as páginas de fato consumidas são lidas do banco."""
+        base, base_args = self._condicoes(campo, inicio, fim)
+        last = None
+        while True:
+            cond, args = list(base), list(base_args)
+            if last is not None:
+                cond.append(f"({campo}, id) > (?, ?)")
+                args.extend(last)
+            where = (" WHERE " + " AND ".join(cond)) if cond else ""
+            sql = f"SELECT id, criado_em, quando, texto FROM eventos{where} ORDER BY {campo}, id LIMIT ?"
+            args.append(page_size)
+            with self._lock:
+                rows = self._db.execute(sql, args).fetchall()
+            for r in rows:
+                yield _row(r)
+            if len(rows) < page_size:
+                return
+            last = (rows[-1][1] if campo == 'criado_em' else rows[-1][2], rows[-1][0])
+
+    def get_meta(self, chave, padrao=None):
+        with self._lock:
+            row = self._db.execute("SELECT valor FROM meta WHERE chave = ?", (chave,)).fetchone()
+        return padrao if row is None else row[0]
+
+    def set_meta(self, chave, valor):
+        """Guarda um inteiro na tabela meta (ex.: até quando os lembretes já foram dados)."""
+        args = (chave, int(valor))
+        self._escrever(lambda db: db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", args))
+
+    def close(self):
+        if self._compactacao is not None:
+            self._compactacao.join()
+        with self._lock:
+            self._db.close()
+
+
+if __name__ == "__main__":
+    # Manutenção com o assistente parado: python -m joelma.agenda_store [data/agenda.db]
+    import sys
+    caminho = sys.argv[1] if len(sys.argv) > 1 else DB_FILE
+    store = AgendaStore(caminho, legacy_file=None)
+    antes = os.path.getsize(caminho)
+    store.vacuum()
+    store.close()
+    print(f"{caminho}: {antes / 1024:.0f} KiB -> {os.path.getsize(caminho) / 1024:.0f} KiB")
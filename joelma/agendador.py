@@ -0,0 +1,169 @@
+# agendador.py
+# Lembretes da agenda. Os horários ficam numa fila de prioridade (heapq) e uma
+# thread dorme numa Condition até o próximo vencimento, sem consultar a
+# agenda periodicamente. Agendar custa O(log n); cancelar marca a entrada como
+# cancelada em O(1) e ela sai da fila quando chega ao topo, ou numa
+# reconstrução quando os cancelados passam da metade da fila.
+import datetime
+import heapq
+import itertools
+import threading
+import time
+
+from . import metricas
+
+ESPERA_MAX = 300.0  # acorda ao menos a cada 5 min, caso o relógio do sistema seja ajustado
+
+
+class Agendador:
+    """Chama on_due(id, quando, texto) no horário de cada lembrete, na thread do agendador."""
+
+    def __init__(self, on_due, publish=True):
+        self.on_due = on_due
+        self.publish = publish
+        self._heap = []    # [timestamp, seq, id, texto]; id None = cancelado
+        self._itens = {}   # id -> entrada ativa no heap
+        self._cancelados = 0
+        self._limpezas = 0  # limpar() feitos: uma carga lida antes de um deles está velha
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._parar = False
+        self._thread = None
+
+    def __len__(self):
+        with self._cond:
+            return len(self._itens)
+
+    def _entrada(self, ident, quando, texto):
+        return [quando.timestamp(), next(self._seq), ident, texto]
+
+    def _remover(self, ident):
+        entrada = self._itens.pop(ident, None)
+        if entrada is not None:
+            entrada[2] = None
+            self._cancelados += 1
+
+    def _compactar(self):
+        if self._cancelados > 64 and self._cancelados * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
+            self._cancelados = 0
+
+    def _publicar(self):
+        if self.publish:
+            metricas.gauge('lembretes_pendentes', len(self._itens))
+
+    def agendar(self, ident, quando, texto):
+        """Agenda (ou reagenda) o lembrete do evento ident."""
+        with self._cond:
+            self._remover(ident)
+            entrada = self._entrada(ident, quando, texto)
+            self._itens[ident] = entrada
+            heapq.heappush(self._heap, entrada)
+            if self._heap[0] is entrada:
+                self._cond.notify()  # ficou antes do que a thread está esperando
+            self._compactar()
+            self._publicar()
+
+    def carregar(self, lembretes, limpezas=None):
+        """Adiciona vários (id, quando, texto) de uma vez: O(n) em vez de n inserções.
+        limpezas é o valor de self.limpezas quando a leitura começou: se a
+        agenda foi limpa no meio dela, os lembretes lidos são descartados."""
+        with self._cond:
+            if limpezas is not None and limpezas != self._limpezas:
+                return
+            for ident, quando, texto in lembretes:
+                if ident in self._itens:
+                    continue  # agendado depois que a leitura começou: vale o mais novo
+                entrada = self._entrada(ident, quando, texto)
+                self._itens[ident] = entrada
+                self._heap.append(entrada)
+            heapq.heapify(self._heap)
+            self._cond.notify()
+            self._publicar()
+
+    def cancelar(self, ident):
+        with self._cond:
+            existia = ident in self._itens
+            self._remover(ident)
+            self._compactar()
+            self._publicar()
+            return existia
+
+    def limpar(self):
+        """Cancela todos os lembretes (a agenda foi apagada)."""
+        with self._cond:
+            self._heap, self._itens, self._cancelados = [], {}, 0
+            self._limpezas += 1
+            self._publicar()
+
+    @property
+    def limpezas(self):
+        with self._cond:
+            return self._limpezas
+
+    def proximo(self):
+        """(id, quando, texto) do próximo lembrete, ou None."""
+        with self._cond:
+            self._descartar_cancelados()
+            if not self._heap:
+                return None
+            ts, _, ident, texto = self._heap[0]
+            return ident, datetime.datetime.fromtimestamp(ts), texto
+
+    def _descartar_cancelados(self):
+        while self._heap and self._heap[0][2] is None:
+            heapq.heappop(self._heap)
+            self._cancelados -= 1
+
+    def _vencidos(self):
+        # Dorme até o topo da fila vencer (ou algo mudar); None ao parar
+        while not self._parar:
+            self._descartar_cancelados()
+            if not self._heap:
+                self._cond.wait()
+                continue
+            espera = self._heap[0][0] - time.time()
+            if espera > 0:
+                self._cond.wait(min(espera, ESPERA_MAX))
+                continue
+            agora, vencidos = time.time(), []
+            while self._heap and self._heap[0][0] <= agora:
+                ts, _, ident, texto = heapq.heappop(self._heap)
+                if ident is None:
+                    self._cancelados -= 1
+                    continue
+                del self._itens[ident]
+                vencidos.append((ident, datetime.datetime.fromtimestamp(ts), texto))
+            self._publicar()
+            return vencidos
+        return None
+
+    def _loop(self, carregar):
+        if carregar is not None:
+            limpezas = self.limpezas
+            self.carregar(carregar(), limpezas)
+        while True:
+            with self._cond:
+                vencidos = self._vencidos()
+            if vencidos is None:
+                return
+            for ident, quando, texto in vencidos:
+                try:
+                    self.on_due(ident, quando, texto)
+                except Exception as e:
+                    print("Erro no lembrete:", e)
+
+    def iniciar(self, carregar=None):
+        """Inicia a thread; carregar() (opcional) devolve os lembretes salvos
+        e é chamado nela, sem atrasar quem inicia."""
+        self._thread = threading.Thread(target=self._loop, args=(carregar,), name="lembretes", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        with self._cond:
+            self._parar = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
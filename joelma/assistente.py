@@ -0,0 +1,500 @@
+# assistente.py
+# Comandos do assistente e o ponto de entrada (main). Importar este módulo não
+# abre microfone nem carrega bibliotecas de áudio: isso acontece em main().
+import contextvars
+import datetime
+import itertools
+import re
+import threading
+
+from . import (agenda_store, agendador, audio, config, equacoes, horarios, metricas, numeros, offline_tts,
+               pipeline, saida, wakeword)
+from .calculadora import safe_eval
+from .comandos import CommandRegistry
+
+PYTTSX3_AVAILABLE = offline_tts.PYTTSX3_AVAILABLE
+
+fluxo = None  # pipeline da interação, criado em main()
+
+# No modo servidor cada sessão roda os handlers na sua própria thread e se
+# coloca aqui; speak/listen vão para ela em vez do pipeline local
+sessao_atual = contextvars.ContextVar('sessao_atual', default=None)
+
+
+def _destino():
+    return sessao_atual.get() or fluxo
+
+_agenda = None
+_agenda_lock = threading.Lock()
+
+
+def agenda():
+    """Agenda em SQLite com índices; um agenda.txt antigo é migrado automaticamente."""
+    global _agenda
+    with _agenda_lock:
+        if _agenda is None:
+            config.ensure_data_dir()
+            _agenda = agenda_store.AgendaStore(config.AGENDA_DB, legacy_file=config.AGENDA_FILE)
+        return _agenda
+
+
+# --- FUNÇÕES DE FALA E ESCUTA ---
+
+# Função de fala usada pelo código. A síntese é feita pelo backend mais rápido
+# medido na partida (audio.sintetizador). Só enfileira a fala: a síntese e a
+# reprodução acontecem em paralelo com o resto da interação. Com wait=True
+# espera terminar de tocar.
+def speak(text, wait=False, priority=saida.NORMAL, interruptible=True):
+    print("[SPEAK]", text)
+    if interruptible and wakeword.contains_wake_word(text):
+        # O microfone ouve a própria fala: com a palavra de ativação nela
+        # (um evento "sexta-feira ..."), o assistente se cortaria
+        interruptible = False
+    return _destino().say(text, wait=wait, priority=priority, interruptible=interruptible)
+
+
+# Fala direto pelo pyttsx3, fora da fila de saída
+def speak_offline(text, wait=True):
+    if not PYTTSX3_AVAILABLE:
+        print("Biblioteca pyttsx3 não encontrada. Usando gTTS online.")
+        speak(text)
+        return
+    print("[SPEAK OFFLINE]", text)
+    return audio.falante_offline().say(text, wait=wait)
+
+
+# Escuta uma resposta do usuário dentro da interação atual. O perfil
+# (vad.PERFIS) diz quanto esperar e quando a fala acabou, conforme a intenção.
+def listen(perfil='comando'):
+    return _destino().listen(perfil=perfil)
+
+
+# --- FUNÇÕES DE AGENDA ---
+
+_lembretes = None  # agendador.Agendador, iniciado em main()
+
+
+def _texto_lembrete(texto):
+    # O evento fica salvo como foi dito; no lembrete o horário sai da frase
+    return horarios.interpretar(texto)[1] or texto
+
+
+def _lembrar(ident, quando, texto, avisar=None):
+    print(f"[LEMBRETE] {quando:%d/%m/%Y %H:%M} {texto}")
+    agenda().set_meta('lembretes_ate', quando.timestamp())
+    if avisar is None:
+        speak(f"Lembrete: {texto}", priority=saida.URGENTE)
+    else:
+        avisar(f"Lembrete: {texto}")
+
+
+def _lembretes_salvos():
+    # Na abertura: eventos ainda por vir, mais os que venceram há pouco sem
+    # terem sido lembrados (assistente desligado)
+    store = agenda()
+    agora = datetime.datetime.now()
+    desde = max(agora - datetime.timedelta(seconds=config.LEMBRETE_ATRASO_MAX),
+                datetime.datetime.fromtimestamp(store.get_meta('lembretes_ate', 0) + 1))
+    return [(ev.id, ev.quando, _texto_lembrete(ev.texto)) for ev in store.range(desde, campo='quando')]
+
+
+def iniciar_lembretes(avisar=None):
+    """Inicia o agendador de lembretes. avisar(texto) entrega cada lembrete;
+    sem ele, o lembrete é falado (o modo servidor manda para as sessões)."""
+    global _lembretes
+    _lembretes = agendador.Agendador(lambda ident, quando, texto: _lembrar(ident, quando, texto, avisar))
+    _lembretes.iniciar(carregar=_lembretes_salvos)
+    return _lembretes
+
+
+def add_event(text):
+    quando, resto = horarios.interpretar(text)
+    ident = agenda().add(text, quando=quando)
+    if quando is None:
+        speak("Evento cadastrado.")
+        return
+    if _lembretes is not None:
+        _lembretes.agendar(ident, quando, resto or text)
+    speak(f"Evento cadastrado para {horarios.descrever(quando)}.")
+
+
+PAGINA_AGENDA = 5  # eventos lidos antes de perguntar se continua
+# Palavras inteiras da resposta a "Quer ouvir mais?"; recusa vence ("não quero mais")
+_CONTINUAR = {"sim", "mais", "continua", "continue", "continuar", "pode", "próximos", "quero", "claro"}
+_RECUSAR = {"não", "nao", "parar", "pare", "para", "chega", "basta"}
+
+
+def _continuar(resposta):
+    palavras = set(re.findall(r'\w+', (resposta or "").lower()))
+    return not palavras & _RECUSAR and bool(palavras & _CONTINUAR)
+
+
+def _ler_eventos(eventos, total, linha):
+    # Leitura em páginas: a página seguinte só é buscada no banco (e
+    # sintetizada) se a pessoa pedir. Prioridade baixa: "sexta-feira, parar"
+    # corta na hora, e qualquer outra fala passa à frente
+    eventos = iter(eventos)
+    lidos = 0
+    while True:
+        pagina = 0
+        for ev in itertools.islice(eventos, PAGINA_AGENDA):
+            ln = linha(ev)
+            print(ln)
+            speak(ln, priority=saida.BAIXA)
+            _destino().pause(0.3, priority=saida.BAIXA)
+            pagina += 1
+        lidos += pagina
+        if pagina < PAGINA_AGENDA or lidos >= total:
+            return
+        speak("Quer ouvir mais?", priority=saida.BAIXA)
+        resposta = listen('comando')
+        if not _continuar(resposta):
+            return
+
+
+def _linha_quando(ev, com_dia=True):
+    return f"{horarios.descrever(ev.quando, com_dia=com_dia)}: {_texto_lembrete(ev.texto)}"
+
+
+def read_agenda():
+    store = agenda()
+    total = store.count()
+    if not total:
+        speak("Sua agenda está vazia.")
+        return
+    speak(f"Você tem {total} eventos na agenda.")
+    _ler_eventos(store.iter_events(page_size=PAGINA_AGENDA), total, agenda_store.Evento.linha)
+
+
+def consultar_agenda(text):
+    """"o que tenho hoje", "agenda desta semana", "próximos cinco eventos":
+    respondido pelo índice de data do evento, sem percorrer a agenda."""
+    store = agenda()
+    agora = datetime.datetime.now()
+    periodo = horarios.intervalo(text, agora)
+    if periodo is None:
+        # Próximos N eventos (5 se não disser quantos; 1 para "próximo evento")
+        valores = [int(v) for v in numeros.numeros(text) if v == int(v) and v >= 1]
+        n = min(valores[0], 50) if valores else (1 if "próximo evento" in text else PAGINA_AGENDA)
+        eventos = list(itertools.islice(store.iter_events('quando', page_size=n, inicio=agora), n))
+        if not eventos:
+            speak("Você não tem eventos marcados.")
+            return
+        speak("Seu próximo evento:" if len(eventos) == 1 else f"Seus próximos {len(eventos)} eventos:")
+        for ev in eventos:
+            speak(_linha_quando(ev), priority=saida.BAIXA)
+        return
+    inicio, fim, nome = periodo
+    total = store.count(inicio, fim, campo='quando')
+    if not total:
+        speak(f"Você não tem eventos {nome}.")
+        return
+    speak(f"Você tem {total} evento{'s' if total > 1 else ''} {nome}.")
+    um_dia = fim - inicio <= datetime.timedelta(days=1)
+    _ler_eventos(store.iter_events('quando', PAGINA_AGENDA, inicio, fim), total,
+                 lambda ev: _linha_quando(ev, com_dia=not um_dia))
+
+
+def clear_agenda():
+    agenda().clear()
+    if _lembretes is not None:
+        _lembretes.limpar()
+    speak("Agenda limpa.")
+
+
+# --- EQUAÇÕES ---
+
+TENTATIVAS = 3  # pedidos de um mesmo coeficiente antes de desistir
+
+
+def _falar_raizes(coefs):
+    if len(coefs) == 2:
+        x = equacoes.primeiro_grau(*coefs)
+        speak(f"A raiz da equação é x = {x:.2f}")
+        return
+    if len(coefs) == 3:
+        delta, raizes = equacoes.segundo_grau(*coefs)
+        if not raizes:
+            speak(f"A equação não possui raízes reais, pois o delta é negativo, valendo {delta:.2f}.")
+        elif len(raizes) == 1:
+            speak(f"A equação possui uma raiz real: x = {raizes[0]:.2f}")
+        else:
+            x1, x2 = raizes
+            speak(f"A equação possui duas raízes reais. X1 é igual a {x1:.2f}, e X2 é igual a {x2:.2f}")
+        return
+    raizes = equacoes.raizes_reais(coefs)
+    if not raizes:
+        speak("A equação não possui raízes reais.")
+    elif len(raizes) == 1:
+        speak(f"A equação possui uma raiz real: x = {raizes[0]:.2f}")
+    else:
+        valores = [f"{x:.2f}" for x in raizes]
+        speak(f"A equação possui {len(raizes)} raízes reais: {', '.join(valores[:-1])} e {valores[-1]}")
+
+
+_LETRAS = "abcdefghijk"[:equacoes.MAX_GRAU + 1]
+
+
+def _pedido_coeficientes(grau):
+    if grau == 1:
+        return "Entendido. Para a equação de primeiro grau, preciso dos coeficientes A e B."
+    if grau == 2:
+        return "Entendido. Para a equação de segundo grau, preciso dos coeficientes A, B e C."
+    nomes = _LETRAS[:grau + 1].upper()
+    return (f"Entendido. Para a equação de grau {grau}, preciso dos coeficientes "
+            f"{', '.join(nomes[:-1])} e {nomes[-1]}.")
+
+
+def resolver_equacao(text):
+    # Grau e coeficientes podem vir no próprio comando ("segundo grau, a igual
+    # a um, b menos três, c dois") ou numa resposta só; só o que faltar é
+    # perguntado um a um
+    def get_coefficient(name):
+        """Pede e ouve um coeficiente numérico."""
+        speak(f"Qual o valor de {name.upper()}?")
+        for _ in range(TENTATIVAS):
+            coeff_str = listen('numero')
+            if not coeff_str:
+                speak("Não ouvi o número, por favor, repita.")
+                continue
+            try:
+                return numeros.numero(coeff_str)
+            except ValueError:
+                speak("Não entendi. Por favor, diga apenas o número.")
+        return None
+
+    grau, resto = numeros.grau(text)
+    if grau is None:
+        speak("Não entendi o tipo de equação. Diga 'resolver equação de primeiro grau' ou 'segundo grau'.")
+        return
+    if not 1 <= grau <= equacoes.MAX_GRAU:
+        speak("Consigo resolver equações do primeiro ao décimo grau.")
+        return
+    letras = _LETRAS[:grau + 1]
+    coefs = numeros.coeficientes(resto, letras)
+
+    if len(coefs) < len(letras):
+        speak(_pedido_coeficientes(grau))
+        resposta = listen('coeficientes')
+        if resposta:
+            coefs = numeros.coeficientes(resposta, letras, coefs)
+    for letra in letras:
+        if letra not in coefs:
+            valor = get_coefficient(letra)
+            if valor is None:
+                speak("Não consegui entender os coeficientes.")
+                return
+            coefs[letra] = valor
+
+    try:
+        _falar_raizes([coefs[letra] for letra in letras])
+    except ValueError as e:
+        speak(str(e))
+
+
+# --- REGISTRO DE COMANDOS ---
+# Cada comando declara suas frases e uma prioridade explícita; o texto é
+# casado contra todas as frases numa única passada (Aho-Corasick).
+# Em caso de conflito vence a maior prioridade e depois a frase mais longa.
+comandos = CommandRegistry()
+
+
+# CADASTRAR EVENTO
+@comandos.register("cadastrar_evento", ["cadastrar evento", "novo evento", "adicionar evento"], priority=100)
+def cmd_cadastrar_evento(cmd):
+    speak("Ok, qual evento devo cadastrar?")
+    ev = listen('evento')
+    if ev: add_event(ev)
+    else: speak("Não consegui ouvir o evento.")
+
+
+# LIMPAR AGENDA
+@comandos.register("limpar_agenda", ["limpar agenda", "apagar agenda"], priority=100)
+def cmd_limpar_agenda(cmd):
+    clear_agenda()
+
+
+# CONSULTAR AGENDA: por período ou os próximos eventos; vence "ler agenda"
+# em "ler agenda de hoje"
+@comandos.register("consultar_agenda", ["o que tenho", "tenho algum", "agenda de", "agenda da", "agenda do",
+                                        "agenda desta", "agenda deste", "agenda dessa", "agenda para",
+                                        "próximo evento", "próximos", "compromissos"], priority=92)
+def cmd_consultar_agenda(cmd):
+    consultar_agenda(cmd)
+
+
+# LER AGENDA
+@comandos.register("ler_agenda", ["ler agenda", "mostrar agenda", "ver agenda"], priority=90)
+def cmd_ler_agenda(cmd):
+    read_agenda()
+
+
+# PARAR: a palavra de ativação já cortou a fala em andamento; aqui só
+# confirmamos que não há mais nada a fazer
+@comandos.register("parar", ["parar", "pare", "chega", "silêncio"], priority=95)
+def cmd_parar(cmd):
+    print("Saída de áudio interrompida.")
+
+
+# MÉTRICAS: latência de cada etapa, falada e gravada em data/metricas.prom
+@comandos.register("metricas", ["métricas", "desempenho"], priority=85)
+def cmd_metricas(cmd):
+    config.ensure_data_dir()
+    print(f"Métricas salvas em {metricas.dump(config.METRICAS_FILE)}")
+    speak(metricas.spoken_summary())
+
+
+# CALCULAR
+@comandos.register("calcular", ["calcular", "calcule", "quanto é", "quanto dá"], priority=80)
+def cmd_calcular(cmd):
+    expr = cmd
+    for w in ["calcular", "calcule", "quanto é", "quanto dá"]:
+        expr = expr.replace(w, "", 1)
+    expr = expr.strip()
+    if not expr:
+        speak("Diga a conta que eu calculo.")
+        expr = listen('expressao')
+    try:
+        res = safe_eval(expr)
+        speak(f"O resultado é {res}")
+    except (ValueError, SyntaxError):
+        speak("Desculpe, não consegui calcular essa expressão.")
+
+
+# EQUAÇÕES
+@comandos.register("equacao", ["equação", "equações", "resolver"], priority=70)
+def cmd_equacao(cmd):
+    resolver_equacao(cmd)
+
+
+# SAIR
+@comandos.register("sair", ["sair", "encerrar", "desligar"], priority=60)
+def cmd_sair(cmd):
+    speak("Encerrando assistente. Até mais.")
+    return False
+
+
+# HORAS
+@comandos.register("hora", ["que horas", "horas são", "hora", "horas"], priority=50)
+def cmd_hora(cmd):
+    now = datetime.datetime.now().strftime("%H:%M")
+    speak(f"Agora são {now}.")
+
+
+# DATA
+@comandos.register("data", ["que dia", "dia de hoje", "data"], priority=40)
+def cmd_data(cmd):
+    today = datetime.datetime.now().strftime("%d de %B de %Y")
+    speak(f"Hoje é {today}.")
+
+
+# SE NENHUM COMANDO ACIMA, TENTE CALCULAR
+@comandos.set_fallback
+def calcular(cmd):
+    try:
+        res = safe_eval(cmd)
+        speak(f"O resultado é {res}")
+    except (ValueError, SyntaxError):
+        speak("Comando não reconhecido. Tente novamente.")
+
+
+# --- DESPACHO DOS COMANDOS ---
+# Executado pelo pipeline para cada comando reconhecido; retorna False para encerrar
+def despachar(cmd):
+    print("Comando:", cmd)
+    if not cmd:
+        speak("Não ouvi nenhum comando.")
+        return
+    with metricas.timer('intencao'):
+        comando = comandos.match(cmd)
+    with metricas.timer('handler'):
+        if comando is None:
+            return comandos.fallback(cmd)
+        return comando.handler(cmd)
+
+
+# --- AQUECIMENTO ---
+# Falas constantes do assistente, pré-sintetizadas na partida. "Sim?" primeiro:
+# é a fala que a primeira interação espera. Ao criar uma fala fixa, inclua-a aqui
+FRASES_FIXAS = [
+    "Sim?",
+    "Não ouvi nenhum comando.",
+    "Comando não reconhecido. Tente novamente.",
+    "Ok, qual evento devo cadastrar?",
+    "Evento cadastrado.",
+    "Não consegui ouvir o evento.",
+    "Sua agenda está vazia.",
+    "Quer ouvir mais?",
+    "Você não tem eventos marcados.",
+    "Agenda limpa.",
+    "Diga a conta que eu calculo.",
+    "Desculpe, não consegui calcular essa expressão.",
+    "Não entendi o tipo de equação. Diga 'resolver equação de primeiro grau' ou 'segundo grau'.",
+    "Consigo resolver equações do primeiro ao décimo grau.",
+    "Não ouvi o número, por favor, repita.",
+    "Não entendi. Por favor, diga apenas o número.",
+    "Não consegui entender os coeficientes.",
+    "A equação não possui raízes reais.",
+    "Encerrando assistente. Até mais.",
+]
+
+
+def frases_fixas():
+    """FRASES_FIXAS e as perguntas das equações até equacoes.MAX_GRAU."""
+    grau = range(1, equacoes.MAX_GRAU + 1)
+    return (FRASES_FIXAS + [_pedido_coeficientes(g) for g in grau]
+            + [f"Qual o valor de {letra.upper()}?" for letra in _LETRAS])
+
+
+def aquecer():
+    frases = frases_fixas()
+    print(f"Aquecendo {len(frases)} falas fixas em segundo plano.")
+    return audio.aquecer(frases)
+
+
+# --- LOOP PRINCIPAL ---
+
+def main():
+    """Inicia o assistente. Captura, reconhecimento, despacho e saída de áudio
+    rodam em estágios paralelos; fluxo.cancel() interrompe a interação em andamento."""
+    global fluxo
+    config.ensure_data_dir()
+    if config.METRICAS_PORTA:
+        metricas.serve(int(config.METRICAS_PORTA))
+
+    fluxo = pipeline.Pipeline(
+        wait_wake=audio.ouvir_ativacao,
+        capture=audio.capturar,
+        recognize=audio.reconhecer,
+        dispatch=despachar,
+        synthesize=audio.sintetizar,
+        play=audio.tocar,
+        on_wake=lambda: speak("Sim?", priority=saida.URGENTE),
+    )
+    # A saudação é sintetizada enquanto o microfone é aberto.
+    # A saudação contém a própria palavra de ativação: não pode ser cortada por ela
+    speak("Assistente pronta. Diga 'Ok sexta-feira' para ativar.", interruptible=False)
+    # Mede os backends de fala em segundo plano; as falas fixas são
+    # pré-sintetizadas com o escolhido na primeira medição (e de novo se ele
+    # mudar). Só o "Sim?", que a primeira interação espera, não espera a medição
+    if config.AQUECER:
+        audio.aquecer(FRASES_FIXAS[:1])
+    audio.iniciar_avaliacao(ao_trocar=aquecer if config.AQUECER else None)
+    if config.LEMBRETES:
+        iniciar_lembretes()
+
+    try:
+        fluxo.run()
+
+    except KeyboardInterrupt:
+        fluxo.interrupt()
+        speak("Encerrando por interrupção.", wait=True)
+    except Exception as e:
+        print("Erro principal:", e)
+        speak("Ocorreu um erro, veja o console.", wait=True)
+    finally:
+        if _lembretes is not None:
+            _lembretes.parar()
+        fluxo.stop()
+        audio.fechar()
+        metricas.dump(config.METRICAS_FILE)
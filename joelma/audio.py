@@ -0,0 +1,354 @@
+# audio.py
+# Dispositivos e serviços de áudio do assistente: reconhecedor, microfone,
+# detector de ativação, síntese e reprodução. Tudo é criado no primeiro uso,
+# e as bibliotecas pesadas (SpeechRecognition, gTTS, playsound, pyttsx3, vosk)
+# só são importadas nesse momento. Os backends de síntese (e, com
+# JOELMA_STT=auto, os de reconhecimento) são escolhidos pela latência medida.
+import concurrent.futures
+import queue
+import threading
+
+from . import config, metricas, offline_tts, reconhecimento, reproducao, sintese, tts_cache, wakeword
+
+_lock = threading.RLock()
+_recognizer = None
+_microfone = None
+_detector = None
+_detector_checked = False
+_reconhecedor = None
+_sintetizador = None
+_cache_fala = {}  # sufixo do áudio -> TTSCache
+_falante_offline = None
+_avaliacao = None  # Event que para a reavaliação periódica dos backends
+
+TTS_NOMES = ('gtts', 'pyttsx3', 'espeak')  # preferência antes da primeira medição
+STT_NOMES = ('google', 'vosk')
+SONDA_STT = 0.5  # segundos de silêncio usados para medir o reconhecimento
+
+
+def recognizer():
+    global _recognizer
+    with _lock:
+        if _recognizer is None:
+            import speech_recognition as sr
+            _recognizer = sr.Recognizer()
+        return _recognizer
+
+
+def microfone():
+    """Microfone aberto UMA VEZ; uma thread captura o áudio continuamente num
+    buffer circular de onde as falas são recortadas, e o limiar de energia
+    acompanha o ruído ambiente sem pausas para calibração."""
+    global _microfone
+    with _lock:
+        if _microfone is None:
+            from .mic_stream import MicrophoneStream
+            mic = MicrophoneStream(recognizer(), sample_rate=wakeword.SAMPLE_RATE)
+            mic.start()
+            _microfone = mic
+        return _microfone
+
+
+def detector():
+    """Detector local da palavra de ativação, ou None se vosk/modelo faltarem."""
+    global _detector, _detector_checked
+    with _lock:
+        if not _detector_checked:
+            _detector_checked = True
+            if wakeword.is_available():
+                _detector = wakeword.WakeWordDetector(sample_rate=wakeword.SAMPLE_RATE)
+            else:
+                print("Detector local de ativação indisponível (vosk/modelo). Usando reconhecimento online.")
+        return _detector
+
+
+def _nomes(configurados, todos):
+    # 'auto' -> (todos, ordenar pela latência); uma lista -> (ela, ordem fixa)
+    if configurados == ['auto']:
+        return list(todos), True
+    return configurados, False
+
+
+def reconhecedor():
+    """Backends de reconhecimento na ordem de config.STT_BACKENDS, com troca automática."""
+    global _reconhecedor
+    with _lock:
+        if _reconhecedor is None:
+            nomes, auto = _nomes(config.STT_BACKENDS, STT_NOMES)
+            backends = []
+            for nome in nomes:
+                if nome == 'google':
+                    backends.append(reconhecimento.GoogleBackend(recognizer(), config.LANG_STT))
+                elif nome == 'vosk':
+                    backends.append(reconhecimento.VoskBackend(sample_rate=wakeword.SAMPLE_RATE))
+                else:
+                    print(f"Backend de reconhecimento desconhecido: {nome}")
+            _reconhecedor = reconhecimento.Reconhecedor(backends, auto=auto)
+            print("Reconhecimento:", ", ".join(b.name for b in _reconhecedor.backends))
+        return _reconhecedor
+
+
+def sintetizador():
+    """Backends de síntese de config.TTS_BACKENDS; o ativo é o mais rápido medido."""
+    global _sintetizador
+    with _lock:
+        if _sintetizador is None:
+            nomes, auto = _nomes(config.TTS_BACKENDS, TTS_NOMES)
+            backends = []
+            for nome in nomes:
+                if nome == 'gtts':
+                    backends.append(sintese.GttsBackend(config.LANG_TTS))
+                elif nome == 'pyttsx3':
+                    backends.append(sintese.Pyttsx3Backend(falante_offline))
+                elif nome == 'espeak':
+                    backends.append(sintese.EspeakBackend())
+                else:
+                    print(f"Backend de síntese desconhecido: {nome}")
+            _sintetizador = sintese.Seletor(backends, auto=auto)
+            print("Síntese:", ", ".join(b.name for b in _sintetizador.backends))
+        return _sintetizador
+
+
+def cache_fala(suffix=".mp3"):
+    # Cache das falas já sintetizadas: frases repetidas tocam direto do disco.
+    # Um por formato de áudio; a chave inclui o backend que gerou a fala
+    with _lock:
+        if suffix not in _cache_fala:
+            config.ensure_data_dir()
+            _cache_fala[suffix] = tts_cache.TTSCache(config.TTS_CACHE_DIR, suffix=suffix)
+        return _cache_fala[suffix]
+
+
+def falante_offline():
+    # O motor pyttsx3 é criado uma única vez e fica numa thread própria
+    global _falante_offline
+    with _lock:
+        if _falante_offline is None:
+            _falante_offline = offline_tts.OfflineSpeaker(voice_hint="brazil")
+        return _falante_offline
+
+
+# --- FALA ---
+
+def _com_reserva(gerar):
+    # Sintetiza com o backend ativo; se ele falhar ou passar do orçamento, com os de reserva
+    erro = None
+    seletor = sintetizador()
+    for backend in seletor.ordem():
+        try:
+            return gerar(seletor, backend)
+        except Exception as e:
+            print(f"Erro na síntese {backend.name}: {e}")
+            metricas.incr(f"tts_{backend.name}_erro")
+            erro = e
+    if erro is None:
+        raise RuntimeError("Nenhum backend de síntese disponível.")
+    raise erro
+
+
+# Síntese usada pelo estágio de saída do pipeline, pelo backend ativo.
+# Com o miniaudio o áudio fica em memória (bytes) até a saída de som;
+# sem ele, o playsound precisa de um arquivo e usa o do cache em disco.
+def sintetizar(text):
+    if reproducao.MINIAUDIO_AVAILABLE:
+        return sintetizar_bytes(text)
+    with metricas.timer('sintese'):
+        def gerar(seletor, backend):
+            def gravar(path):
+                with open(path, 'wb') as f:
+                    f.write(seletor.sintetizar(backend, text))
+            return cache_fala(backend.suffix).get_or_create(text, config.LANG_TTS, backend.name, gravar)
+        return _com_reserva(gerar)
+
+
+def sintetizar_bytes(text):
+    """O áudio da fala em memória, MP3 ou WAV conforme o backend (também
+    usado pelo modo servidor)."""
+    with metricas.timer('sintese'):
+        def gerar(seletor, backend):
+            return cache_fala(backend.suffix).get_or_create_bytes(
+                text, config.LANG_TTS, backend.name, lambda: seletor.sintetizar(backend, text))
+        return _com_reserva(gerar)
+
+
+def aquecer(frases, workers=config.AQUECIMENTO_THREADS):
+    """Sintetiza as frases em segundo plano, em poucas threads. Quem pedir uma
+    delas antes de ficar pronta recebe o mesmo resultado (ver TTSCache).
+    As threads são daemon: sem rede, sair não espera cada frase estourar o prazo."""
+    fila = queue.Queue()
+    futuros = []
+    for text in frases:
+        futuro = concurrent.futures.Future()
+        fila.put((text, futuro))
+        futuros.append(futuro)
+
+    def trabalhar():
+        while True:
+            try:
+                text, futuro = fila.get_nowait()
+            except queue.Empty:
+                return
+            if not futuro.set_running_or_notify_cancel():
+                continue
+            try:
+                futuro.set_result(sintetizar(text))
+            except Exception as e:
+                print(f"Aquecimento: falha ao sintetizar {text!r}: {e}")
+                futuro.set_result(None)
+
+    # Uma vaga de síntese por backend fica livre para as falas da interação
+    workers = max(1, min(workers, sintese.MAX_CHAMADAS - 1))
+    for i in range(min(workers, len(futuros))):
+        threading.Thread(target=trabalhar, name=f"aquecimento-{i}", daemon=True).start()
+    return futuros
+
+
+def avaliar_backends():
+    """Mede os backends de síntese e, com JOELMA_STT=auto, os de reconhecimento."""
+    sintetizador().avaliar()
+    if config.STT_BACKENDS == ['auto']:
+        silencio = audio_data(bytes(int(SONDA_STT * wakeword.SAMPLE_RATE) * 2), wakeword.SAMPLE_RATE, 2)
+        reconhecedor().avaliar(silencio)
+    return backends()
+
+
+def backends():
+    """Backends em uso e latências medidas: {'sintese': ..., 'reconhecimento': ...}."""
+    out = {'sintese': sintetizador().estado()}
+    if _reconhecedor is not None:
+        out['reconhecimento'] = {'ordem': [b.name for b in _reconhecedor.backends],
+                                 'backends': _reconhecedor.stats()}
+    return out
+
+
+def _resumo(estado):
+    latencias = ", ".join(f"{nome} {dt * 1000:.0f} ms" if dt is not None else f"{nome} falhou"
+                          for nome, dt in estado['latencias'].items())
+    return f"Síntese: {estado['ativo']} ativo ({latencias})"
+
+
+def iniciar_avaliacao(intervalo=None, ao_trocar=None):
+    """Mede os backends numa thread, sem atrasar a partida, e repete a cada
+    intervalo (config.REAVALIAR_BACKENDS). ao_trocar() é chamado depois da
+    primeira medição e sempre que o backend de síntese ativo muda (por
+    exemplo, para pré-sintetizar as falas fixas com o backend escolhido)."""
+    global _avaliacao
+    if intervalo is None:
+        intervalo = config.REAVALIAR_BACKENDS
+    parar = threading.Event()
+
+    def loop():
+        primeira = True
+        while not parar.is_set():
+            antes = sintetizador().ativo
+            try:
+                estado = avaliar_backends()
+            except Exception as e:
+                print("Erro ao medir os backends:", e)
+            else:
+                if primeira:
+                    print(_resumo(estado['sintese']))
+            if ao_trocar is not None and (primeira or sintetizador().ativo is not antes):
+                ao_trocar()
+            primeira = False
+            if intervalo <= 0 or parar.wait(intervalo):
+                return
+
+    with _lock:
+        if _avaliacao is not None:
+            _avaliacao.set()
+        _avaliacao = parar
+    threading.Thread(target=loop, name="avaliacao", daemon=True).start()
+    return parar
+
+
+def tocar(som, parar=None):
+    with metricas.timer('reproducao'):
+        if isinstance(som, bytes):
+            reproducao.play_bytes(som, parar=parar)
+        else:
+            reproducao.play_file(som, parar)
+
+
+# --- ESCUTA ---
+# Dividida em dois estágios do pipeline: captura e reconhecimento
+
+def capturar(perfil=None):
+    """Recorta uma fala; perfil é um dos vad.PERFIS (padrão: 'comando')."""
+    import speech_recognition as sr
+    mic = microfone()
+    try:
+        print("Ouvindo...")
+        return mic.listen(perfil, pre_roll=config.PRE_ROLL)
+    except sr.WaitTimeoutError:
+        print("Timeout: Nenhum áudio detectado.")
+        return None
+
+
+def reconhecer(audio):
+    if audio is None:
+        return ""
+    try:
+        print("Reconhecendo...")
+        with metricas.timer('reconhecimento'):
+            return reconhecedor().recognize(audio)
+    except Exception as e:
+        print(f"Erro na escuta: {e}")
+        return ""
+
+
+class AudioPCM:
+    """Áudio PCM com a interface de sr.AudioData usada pelos backends,
+    para quando o SpeechRecognition não está instalado."""
+
+    def __init__(self, pcm, sample_rate, sample_width):
+        self.frame_data = pcm
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+    def get_raw_data(self, convert_rate=None, convert_width=None):
+        if convert_rate not in (None, self.sample_rate) or convert_width not in (None, self.sample_width):
+            raise ValueError("conversão de formato indisponível sem o SpeechRecognition")
+        return self.frame_data
+
+
+def audio_data(pcm, sample_rate, sample_width):
+    """Áudio recebido de fora do microfone (servidor, lote) pronto para reconhecer()."""
+    try:
+        import speech_recognition as sr
+    except ImportError:
+        return AudioPCM(pcm, sample_rate, sample_width)
+    return sr.AudioData(pcm, sample_rate, sample_width)
+
+
+def ler_wav(path):
+    import wave
+    with wave.open(path, 'rb') as wf:
+        if wf.getnchannels() != 1:
+            raise ValueError(f"{path}: use WAV mono")
+        return audio_data(wf.readframes(wf.getnframes()), wf.getframerate(), wf.getsampwidth())
+
+
+# Espera a palavra de ativação; com o detector local, nada é enviado ao Google
+def ouvir_ativacao(stop=None):
+    mic = microfone()
+    det = detector()
+    print("\nAguardando wake word...")
+    if det is None:
+        wake = reconhecer(capturar('ativacao'))
+        return wakeword.contains_wake_word(wake)
+    return det.wait(mic.cursor().read, stop)
+
+
+def fechar():
+    global _microfone, _reconhecedor, _avaliacao
+    with _lock:
+        if _avaliacao is not None:
+            _avaliacao.set()
+            _avaliacao = None
+        if _microfone is not None:
+            _microfone.stop()
+            _microfone = None
+        if _reconhecedor is not None:
+            _reconhecedor.close()
+            _reconhecedor = None
@@ -0,0 +1,107 @@
+# calculadora.py
+# Avaliação segura de expressões ditas por voz ("2 mais 3 vezes 4", "dois
+# vírgula cinco vezes quatro").
+# A tabela de operadores falados é compilada uma única vez, e a normalização
+# e as expressões já normalizadas ficam em caches LRU, então repetir uma conta
+# não passa de novo pelo parser. Potências têm custo limitado: "9 ^ 9 ^ 9" é
+# recusado em vez de travar o assistente.
+import ast
+import functools
+import math
+import operator
+import re
+
+from . import numeros
+
+# Operadores falados -> símbolos; as alternativas mais longas vêm primeiro
+OPERADORES_FALADOS = {
+    'dividido por': '/',
+    'dividido': '/',
+    'vezes': '*',
+    'mais': '+',
+    'menos': '-',
+    'por': '/',
+    'x': '*',
+}
+_RE_OPERADORES = re.compile(r'\b(' + '|'.join(map(re.escape, OPERADORES_FALADOS)) + r')\b')
+_RE_INVALIDOS = re.compile(r'[^0-9+\-*/().^sqrt ]')
+
+MAX_EXPOENTE = 10000  # maior expoente aceito
+MAX_BITS = 100000     # tamanho máximo (em bits) de um resultado inteiro de potência
+
+CACHE_SIZE = 1024
+
+
+def _pow(base, exp):
+    if abs(exp) > MAX_EXPOENTE:
+        raise ValueError("Expoente grande demais")
+    if isinstance(base, int) and isinstance(exp, int) and abs(base) > 1:
+        if exp * math.log2(abs(base)) > MAX_BITS:
+            raise ValueError("Resultado grande demais")
+    try:
+        result = operator.pow(base, exp)
+    except OverflowError:
+        raise ValueError("Resultado grande demais")
+    if isinstance(result, complex):
+        raise ValueError("Resultado não é real")
+    return result
+
+
+OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: _pow,
+}
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def normalize(expr):
+    """Troca números por extenso e operadores falados por símbolos e remove o resto."""
+    expr = numeros.para_algarismos(expr)
+    expr = _RE_OPERADORES.sub(lambda m: OPERADORES_FALADOS[m.group(1)], expr.lower())
+    expr = expr.replace(',', '.')
+    expr = _RE_INVALIDOS.sub('', expr)
+    return expr.replace("^", "**")
+
+
+def _eval(n):
+    if isinstance(n, ast.BinOp):
+        op = OPS.get(type(n.op))
+        if op is None:
+            raise ValueError("Operador não permitido")
+        return op(_eval(n.left), _eval(n.right))
+    if isinstance(n, ast.UnaryOp) and isinstance(n.op, ast.USub):
+        return -_eval(n.operand)
+    if isinstance(n, ast.Constant) and isinstance(n.value, (int, float)):
+        return n.value
+    raise ValueError("Expressão inválida")
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _evaluate_normalized(expr):
+    # A expressão só tem constantes, então o resultado depende apenas do texto
+    if "sqrt" in expr:
+        try:
+            num = float(expr.replace("sqrt", "").strip("() "))
+            return math.sqrt(num)
+        except ValueError:
+            raise ValueError("Expressão de raiz inválida")
+    if not any(c in expr for c in "+-*/"):  # Se for só um número, não calcule
+        raise ValueError("Expressão incompleta")
+    # Erros de aritmética viram ValueError: quem chama trata um tipo só
+    try:
+        return _eval(ast.parse(expr, mode='eval').body)
+    except ZeroDivisionError:
+        raise ValueError("Divisão por zero")
+    except OverflowError:
+        raise ValueError("Resultado grande demais")
+
+
+def safe_eval(expr):
+    return _evaluate_normalized(normalize(expr))
+
+
+def cache_info():
+    return _evaluate_normalized.cache_info()
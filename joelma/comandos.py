@@ -0,0 +1,121 @@
+# comandos.py
+# Registro de comandos de voz. Cada handler declara suas frases de ativação e
+# uma prioridade; todas as frases são compiladas num único autômato
+# Aho-Corasick, então o reconhecimento do comando é uma só passada pelo texto,
+# não importa quantos comandos estejam registrados.
+import collections
+
+
+class Command:
+    def __init__(self, name, phrases, priority, handler):
+        self.name = name
+        self.phrases = [p.lower() for p in phrases]
+        self.priority = priority
+        self.handler = handler
+
+    def __repr__(self):
+        return f"Command({self.name!r}, priority={self.priority})"
+
+
+class Automaton:
+    """Autômato Aho-Corasick sobre caracteres."""
+
+    def __init__(self, patterns):
+        # patterns: lista de (texto, valor)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for text, value in patterns:
+            state = 0
+            for ch in text:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._out[state].append((len(text), value))
+        # Links de falha em largura; as saídas do sufixo são herdadas
+        fila = collections.deque(self._goto[0].values())
+        while fila:
+            state = fila.popleft()
+            for ch, nxt in self._goto[state].items():
+                fila.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def finditer(self, text):
+        """Gera (início, fim, valor) para cada ocorrência de padrão no texto."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                yield i + 1 - length, i + 1, value
+
+
+def _boundary(text, start, end):
+    # Só aceita a frase como palavra(s) inteira(s): "data" não casa com "validade"
+    return ((start == 0 or not text[start - 1].isalnum()) and
+            (end == len(text) or not text[end].isalnum()))
+
+
+class CommandRegistry:
+    def __init__(self):
+        self._commands = []
+        self._automaton = None
+        self.fallback = None
+
+    def register(self, name, phrases, priority=0):
+        """Decorador: registra o handler com suas frases e prioridade."""
+        def decorator(handler):
+            self._commands.append(Command(name, phrases, priority, handler))
+            self._automaton = None  # recompila na próxima busca
+            return handler
+        return decorator
+
+    def set_fallback(self, handler):
+        """Handler chamado quando nenhuma frase casa com o comando."""
+        self.fallback = handler
+        return handler
+
+    @property
+    def commands(self):
+        return list(self._commands)
+
+    def compile(self):
+        patterns = [(p, c) for c in self._commands for p in c.phrases]
+        self._automaton = Automaton(patterns)
+        return self._automaton
+
+    def match(self, text):
+        """Retorna o comando de maior prioridade presente no texto, ou None.
+
+        Empates são decididos pela frase mais longa e depois pela que aparece primeiro.
+        """
+        automaton = self._automaton or self.compile()
+        text = text.lower()
+        best, best_key = None, None
+        for start, end, command in automaton.finditer(text):
+            if not _boundary(text, start, end):
+                continue
+            key = (command.priority, end - start, -start)
+            if best_key is None or key > best_key:
+                best, best_key = command, key
+        return best
+
+    def dispatch(self, text):
+        command = self.match(text)
+        if command is not None:
+            return command.handler(text)
+        if self.fallback is not None:
+            return self.fallback(text)
+        return None
@@ -0,0 +1,43 @@
+# config.py
+# Caminhos e opções do assistente. Nada é criado no disco na importação.
+import os
+
+DATA_DIR = os.environ.get('JOELMA_DATA', 'data')
+AGENDA_FILE = os.path.join(DATA_DIR, 'agenda.txt')  # formato antigo, migrado para o banco
+AGENDA_DB = os.path.join(DATA_DIR, 'agenda.db')
+TTS_CACHE_DIR = os.path.join(DATA_DIR, 'tts_cache')
+METRICAS_FILE = os.path.join(DATA_DIR, 'metricas.prom')
+METRICAS_PORTA = os.environ.get('JOELMA_METRICAS_PORTA')
+# Modelo Vosk (ativação e reconhecimento local); JOELMA_VOSK_MODEL vale mesmo com outra pasta de dados
+VOSK_MODEL = os.environ.get('JOELMA_VOSK_MODEL') or os.path.join(DATA_DIR, 'vosk-model-small-pt')
+
+LANG_TTS = 'pt'
+LANG_STT = 'pt-BR'
+# Backends de reconhecimento em ordem de preferência (google, vosk), ou 'auto'
+# para ordenar pela latência medida na partida
+STT_BACKENDS = [b.strip() for b in os.environ.get('JOELMA_STT', 'google,vosk').split(',') if b.strip()]
+# Backends de síntese: 'auto' mede todos (gtts, pyttsx3, espeak) e usa o mais
+# rápido; uma lista fixa a ordem de preferência (os demais ficam de reserva)
+TTS_BACKENDS = [b.strip() for b in os.environ.get('JOELMA_TTS', 'auto').split(',') if b.strip()]
+REAVALIAR_BACKENDS = float(os.environ.get('JOELMA_REAVALIAR', 600))  # segundos; 0 = só na partida
+PRE_ROLL = 0.5    # segundos de áudio incluídos antes do início da fala
+AQUECER = os.environ.get('JOELMA_AQUECER', '1') != '0'  # pré-síntese das falas fixas
+AQUECIMENTO_THREADS = 3
+LEMBRETES = os.environ.get('JOELMA_LEMBRETES', '1') != '0'  # falar os eventos da agenda na hora marcada
+LEMBRETE_ATRASO_MAX = 30 * 60  # segundos: lembretes vencidos com o assistente desligado ainda são dados
+
+
+def set_data_dir(path):
+    """Troca a pasta de dados (e os caminhos dentro dela) antes do primeiro uso."""
+    global DATA_DIR, AGENDA_FILE, AGENDA_DB, TTS_CACHE_DIR, METRICAS_FILE, VOSK_MODEL
+    DATA_DIR = path
+    AGENDA_FILE = os.path.join(DATA_DIR, 'agenda.txt')
+    AGENDA_DB = os.path.join(DATA_DIR, 'agenda.db')
+    TTS_CACHE_DIR = os.path.join(DATA_DIR, 'tts_cache')
+    METRICAS_FILE = os.path.join(DATA_DIR, 'metricas.prom')
+    VOSK_MODEL = os.environ.get('JOELMA_VOSK_MODEL') or os.path.join(DATA_DIR, 'vosk-model-small-pt')
+
+
+def ensure_data_dir():
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return DATA_DIR
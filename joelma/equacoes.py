@@ -0,0 +1,95 @@
+# equacoes.py
+# Raízes de equações polinomiais, sem dependências de áudio. Primeiro e segundo
+# grau por fórmula; grau maior com numpy.roots (autovalores da matriz
+# companheira) se o numpy estiver instalado, senão Durand-Kerner, que também
+# refina todas as raízes ao mesmo tempo.
+import importlib.util
+import math
+
+NUMPY_AVAILABLE = importlib.util.find_spec('numpy') is not None
+
+MAX_GRAU = 10  # maior grau aceito pelo assistente (coeficientes A a K)
+TOLERANCIA_REAL = 1e-7  # parte imaginária (relativa) abaixo disso é erro numérico
+
+
+def primeiro_grau(a, b):
+    """Raiz de a*x + b = 0."""
+    if a == 0:
+        raise ValueError("O coeficiente 'a' não pode ser zero em uma equação de primeiro grau.")
+    return -b / a
+
+
+def segundo_grau(a, b, c):
+    """Retorna (delta, raízes reais) de a*x² + b*x + c = 0."""
+    if a == 0:
+        raise ValueError("O coeficiente 'a' não pode ser zero em uma equação de segundo grau.")
+    delta = (b**2) - (4*a*c)
+    if delta < 0:
+        return delta, []
+    if delta == 0:
+        return delta, [-b / (2*a)]
+    return delta, [(-b + math.sqrt(delta)) / (2*a), (-b - math.sqrt(delta)) / (2*a)]
+
+
+def _horner(coefs, x):
+    p = 0
+    for c in coefs:
+        p = p * x + c
+    return p
+
+
+def _durand_kerner(coefs, iteracoes=500, tol=1e-14):
+    c = [x / coefs[0] for x in coefs]  # mônico
+    n = len(c) - 1
+    raio = 1 + max(abs(x) for x in c[1:])  # todas as raízes estão dentro deste círculo
+    z = [raio * (0.4 + 0.9j) ** k / abs(0.4 + 0.9j) ** k for k in range(n)]
+    for _ in range(iteracoes):
+        maior = 0.0
+        for i in range(n):
+            den = 1
+            for j in range(n):
+                if j != i:
+                    den *= z[i] - z[j]
+            passo = _horner(c, z[i]) / (den or 1e-300)
+            z[i] -= passo
+            maior = max(maior, abs(passo))
+        if maior <= tol * raio:
+            break
+    return z
+
+
+def polinomio(coefs):
+    """Raízes (complexas) de coefs[0]*x^n + ... + coefs[n] = 0, com n >= 1."""
+    coefs = [float(c) for c in coefs]
+    if len(coefs) < 2:
+        raise ValueError("A equação precisa ter grau pelo menos um.")
+    if coefs[0] == 0:
+        raise ValueError("O coeficiente 'a' não pode ser zero.")
+    if NUMPY_AVAILABLE:
+        import numpy
+        return [complex(r) for r in numpy.roots(coefs)]
+    return _durand_kerner(coefs)
+
+
+def raizes_reais(coefs, raizes=None):
+    """Raízes reais distintas de coefs, em ordem crescente. Raízes múltiplas
+    saem do cálculo numérico com uma pequena parte imaginária e espalhadas em
+    volta do valor certo: são conferidas no polinômio e agrupadas."""
+    if raizes is None:
+        raizes = polinomio(coefs)
+    candidatas = []
+    for r in raizes:
+        escala = max(1.0, abs(r))
+        if abs(r.imag) <= TOLERANCIA_REAL * escala:
+            candidatas.append(r.real)
+        elif abs(r.imag) <= 1e-3 * escala:
+            tamanho = sum(abs(c) * abs(r.real) ** k for k, c in enumerate(reversed(coefs)))
+            if abs(_horner(coefs, r.real)) <= 1e-9 * tamanho:
+                candidatas.append(r.real)
+    grupos = []
+    for x in sorted(candidatas):
+        if grupos and abs(x - grupos[-1][-1]) <= 1e-3 * max(1.0, abs(x)):
+            grupos[-1].append(x)
+        else:
+            grupos.append([x])
+    return [sum(g) / len(g) + 0.0 for g in grupos]
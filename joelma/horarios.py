@@ -0,0 +1,335 @@
+# horarios.py
+# Quando um evento acontece, a partir da frase dita: "amanhã às 15h", "sexta
+# às 9 e meia", "dia 25 de dezembro às 10", "daqui a 20 minutos", "hoje à
+# noite". Só texto, sem rede: devolve a data/hora e a frase sem o horário.
+import datetime
+
+from . import numeros
+
+DIAS_SEMANA = {'segunda': 0, 'terca': 1, 'quarta': 2, 'quinta': 3, 'sexta': 4, 'sabado': 5, 'domingo': 6}
+# Nomes falados pelo assistente. Sem "feira": "sexta-feira" é a palavra de
+# ativação, e o assistente se interromperia ao falar de um evento na sexta
+NOMES_DIAS = ['segunda', 'terça', 'quarta', 'quinta', 'sexta', 'sábado', 'domingo']
+MESES = {
+    'janeiro': 1, 'fevereiro': 2, 'marco': 3, 'abril': 4, 'maio': 5, 'junho': 6,
+    'julho': 7, 'agosto': 8, 'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+}
+NOMES_MESES = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho',
+               'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+PERIODOS = {'madrugada': 3, 'manha': 9, 'tarde': 15, 'noite': 20}  # hora usada quando só o período é dito
+HORA_PADRAO = 9  # só a data ("amanhã"): lembra às 9h
+DURACOES = {
+    'minuto': 'minutes', 'minutos': 'minutes', 'hora': 'hours', 'horas': 'hours',
+    'dia': 'days', 'dias': 'days', 'semana': 'weeks', 'semanas': 'weeks',
+}
+# "na sexta", "próxima quarta": sem "feira", o dia da semana só vale com uma
+# dessas palavras antes ou um horário depois ("segunda reunião" não é data)
+_ANTES_DO_DIA = {'na', 'no', 'nesta', 'neste', 'nessa', 'nesse', 'esta', 'este', 'essa', 'esse', 'proxima', 'proximo'}
+_DEPOIS_DO_DIA = {'as', 'a', 'de', 'pela', 'ao'}
+_UNIDADE_HORA = {'h', 'hora', 'horas'}
+
+
+def _int(chaves, j, minimo, maximo):
+    lido = numeros.inteiro(chaves, j)
+    if lido is None or not isinstance(lido[0], int) or not minimo <= lido[0] <= maximo:
+        return None
+    return lido
+
+
+def _relativo(c, o, i, achado):
+    # "daqui a 20 minutos", "em duas horas", "daqui a uma hora e meia", "em meia hora"
+    if c[i] not in ('daqui', 'em') or 'relativo' in achado:
+        return None
+    j = i + 1
+    if c[i] == 'daqui' and c[j:j + 1] == ['a']:
+        j += 1
+    if c[j:j + 2] == ['meia', 'hora']:
+        achado['relativo'] = datetime.timedelta(minutes=30)
+        return j + 2
+    lido = _int(c, j, 1, 10000)
+    if lido is None or lido[1] >= len(c) or c[lido[1]] not in DURACOES:
+        return None
+    n, k = lido
+    delta = datetime.timedelta(**{DURACOES[c[k]]: n})
+    k += 1
+    if c[k - 1] in ('hora', 'horas') and c[k:k + 2] == ['e', 'meia']:
+        delta += datetime.timedelta(minutes=30)
+        k += 2
+    achado['relativo'] = delta
+    return k
+
+
+def _dia_relativo(c, o, i, achado):
+    if 'dia' in achado:
+        return None
+    if c[i] == 'hoje':
+        achado['dia'] = ('offset', 0)
+        return i + 1
+    if c[i] == 'amanha':
+        achado['dia'] = ('offset', 1)
+        return i + 1
+    if c[i:i + 3] == ['depois', 'de', 'amanha']:
+        achado['dia'] = ('offset', 2)
+        return i + 3
+    return None
+
+
+def _dia_semana(c, o, i, achado):
+    if 'dia' in achado:
+        return None
+    j = i + (c[i] in _ANTES_DO_DIA)
+    if j >= len(c) or c[j] not in DIAS_SEMANA:
+        return None
+    k = j + 1
+    if c[k:k + 2] == ['-', 'feira']:
+        k += 2
+    elif c[k:k + 1] == ['feira']:
+        k += 1
+    elif j == i and (k >= len(c) or c[k] not in _DEPOIS_DO_DIA):
+        return None
+    achado['dia'] = ('semana', DIAS_SEMANA[c[j]])
+    return k
+
+
+def _data(c, o, i, achado):
+    # "dia 25", "no dia 3 de março", "25 de dezembro de 2026", "25/12", "25/12/2026"
+    if 'dia' in achado:
+        return None
+    j = i
+    if c[j:j + 2] == ['no', 'dia']:
+        j += 1
+    com_dia = c[j] == 'dia'
+    j += com_dia
+    lido = _int(c, j, 1, 31)
+    if lido is None:
+        return None
+    dia, k = lido
+    mes = ano = None
+    if c[k:k + 1] == ['/']:
+        lido = _int(c, k + 1, 1, 12)
+        if lido is None:
+            return None
+        mes, k = lido
+        if c[k:k + 1] == ['/'] and _int(c, k + 1, 0, 9999):
+            ano, k = _int(c, k + 1, 0, 9999)
+            ano += 2000 if ano < 100 else 0
+    elif c[k:k + 1] == ['de'] and k + 1 < len(c) and c[k + 1] in MESES:
+        mes, k = MESES[c[k + 1]], k + 2
+        if c[k:k + 1] == ['de'] and _int(c, k + 1, 1000, 9999):
+            ano, k = _int(c, k + 1, 1000, 9999)
+    elif not com_dia:
+        return None
+    achado['dia'] = ('data', dia, mes, ano)
+    return k
+
+
+def _hora(c, o, i, achado):
+    # "às 15h", "às 15:30", "às 9 e meia", "15 horas", "ao meio-dia", "à meia-noite",
+    # com período opcional: "às 3 da tarde"
+    if 'hora' in achado:
+        return None
+    j = i + (c[i] in ('ao', 'a', 'as'))
+    for palavras, hora in ((['meio', 'dia'], 12), (['meia', 'noite'], 24)):
+        k = j
+        if c[k:k + 1] == [palavras[0]]:
+            k += 1 + (c[k + 1:k + 2] == ['-'])
+            if c[k:k + 1] == [palavras[1]]:
+                achado['hora'] = (hora, 0)
+                return k + 1
+    # "às" tem acento; "as" sem acento é artigo ("as 3 tarefas") e precisa de "h"
+    # depois ou dos minutos colados com ":" ("reunião 15:30")
+    if o[i] == 'lá' and c[i + 1:i + 2] == ['pelas']:
+        marcador, j = True, i + 2
+    else:
+        marcador = o[i] in ('às', 'pelas')
+        j = i + (marcador or c[i] in ('as', 'a'))
+    lido = _int(c, j, 0, 24)
+    if lido is None:
+        return None
+    hora, k = lido
+    unidade = c[k:k + 1] and c[k] in _UNIDADE_HORA
+    if unidade:
+        k += 1
+    elif not marcador and not (o[k:k + 1] and o[k].startswith(':')):
+        return None
+    minuto = 0
+    if c[k:k + 2] == ['e', 'meia']:
+        minuto, k = 30, k + 2
+    elif c[k:k + 1] == ['e'] and _int(c, k + 1, 1, 59):
+        minuto, k = _int(c, k + 1, 1, 59)
+        k += c[k:k + 1] in (['min'], ['minuto'], ['minutos'])
+    elif c[k:k + 1] and c[k].isdigit() and len(c[k]) == 2 and int(c[k]) < 60:
+        minuto, k = int(c[k]), k + 1  # "15:30" e "15h30" chegam como "15", "30"
+    if c[k:k + 1] in (['da'], ['de']) and k + 1 < len(c) and c[k + 1] in PERIODOS:
+        achado['periodo'] = c[k + 1]
+        k += 2
+    achado['hora'] = (hora, minuto)
+    return k
+
+
+def _periodo(c, o, i, achado):
+    # "de manhã", "à tarde", "pela manhã", "hoje à noite"
+    if 'periodo' in achado or c[i] not in ('de', 'a', 'pela', 'na') or i + 1 >= len(c):
+        return None
+    if c[i + 1] not in PERIODOS:
+        return None
+    achado['periodo'] = c[i + 1]
+    return i + 2
+
+
+_REGRAS = (_relativo, _dia_relativo, _dia_semana, _hora, _data, _periodo)
+
+
+def _dia(achado, hoje):
+    tipo, *args = achado.get('dia', ('livre',))
+    if tipo == 'offset':
+        return hoje + datetime.timedelta(days=args[0])
+    if tipo == 'semana':
+        return hoje + datetime.timedelta(days=(args[0] - hoje.weekday()) % 7)
+    if tipo == 'data':
+        dia, mes, ano = args
+        data = datetime.date(ano or hoje.year, mes or hoje.month, dia)
+        if data < hoje and ano is None:
+            # Já passou: "dia 3" é no mês que vem, "3 de março" no ano que vem
+            if mes is None:
+                proximo = datetime.date(hoje.year + hoje.month // 12, hoje.month % 12 + 1, 1)
+                data = proximo.replace(day=dia)
+            else:
+                data = data.replace(year=hoje.year + 1)
+        return data
+    return hoje
+
+
+def _resolver(achado, agora):
+    if 'relativo' in achado:
+        delta = achado['relativo']
+        # "daqui a 2 dias às 10": os dias vêm do relativo, a hora é a dita
+        if not (delta.seconds == 0 and ('hora' in achado or 'periodo' in achado)):
+            return (agora + delta).replace(microsecond=0)
+        achado['dia'] = ('offset', delta.days)
+    agora = agora.replace(second=0, microsecond=0)
+    dia = _dia(achado, agora.date())
+    periodo = achado.get('periodo')
+    hora, minuto = achado.get('hora') or (PERIODOS.get(periodo, HORA_PADRAO), 0)
+    if 'hora' in achado and periodo in ('tarde', 'noite') and hora < 12:
+        hora += 12
+    quando = datetime.datetime.combine(dia, datetime.time(0, minuto)) + datetime.timedelta(hours=hora)
+    if quando <= agora:
+        tipo = achado.get('dia', ('livre',))[0]
+        tarde = quando + datetime.timedelta(hours=12)
+        if 'hora' in achado and periodo is None and hora < 12 and tipo in ('livre', 'offset') and \
+                tarde.date() == dia and tarde > agora:
+            quando = tarde  # "hoje às 3", dito às 10h: 15h
+        elif tipo == 'livre':
+            quando += datetime.timedelta(days=1)
+        elif tipo == 'semana':
+            quando += datetime.timedelta(days=7)
+    return quando
+
+
+def interpretar(texto, agora=None):
+    """(quando, texto sem a parte do horário); (None, texto) se não houver data nem hora."""
+    agora = agora or datetime.datetime.now()
+    toks = numeros.tokens_posicoes(texto)
+    c = [t[0] for t in toks]
+    o = [texto[ini:fim].lower() for _, ini, fim in toks]
+    for k in range(1, len(toks)):
+        if texto[toks[k - 1][2]:toks[k][1]] == ':':
+            o[k] = ':' + o[k]  # minutos de "15:30": o ":" sumiu dos tokens
+    achado, usados, i = {}, [], 0
+    while i < len(c):
+        for regra in _REGRAS:
+            fim = regra(c, o, i, achado)
+            if fim is not None:
+                usados.append((toks[i][1], toks[fim - 1][2]))
+                i = fim
+                break
+        else:
+            i += 1
+    if not usados:
+        return None, texto
+    try:
+        quando = _resolver(achado, agora)
+    except ValueError:  # "31 de fevereiro"
+        return None, texto
+    partes, pos = [], 0
+    for ini, fim in usados:
+        partes.append(texto[pos:ini])
+        pos = fim
+    partes.append(texto[pos:])
+    resto = ' '.join(''.join(partes).split()).strip(' ,.-')
+    return quando, resto.replace(' ,', ',')
+
+
+def nome_dia(data, agora=None):
+    """"hoje", "amanhã", o dia da semana nos próximos 7 dias, ou "dia 25 de dezembro"."""
+    agora = agora or datetime.datetime.now()
+    dias = (data - agora.date()).days
+    if dias == 0:
+        return "hoje"
+    if dias == 1:
+        return "amanhã"
+    if 1 < dias < 7:
+        return NOMES_DIAS[data.weekday()]
+    nome = f"dia {data.day} de {NOMES_MESES[data.month - 1]}"
+    if data.year != agora.year:
+        nome += f" de {data.year}"
+    return nome
+
+
+def descrever(quando, agora=None, com_dia=True):
+    """Data e hora para falar: "hoje às 15:00", "amanhã ao meio-dia", "sexta às 9:30"."""
+    if (quando.hour, quando.minute) == (12, 0):
+        hora = "ao meio-dia"
+    elif (quando.hour, quando.minute) == (0, 0):
+        hora = "à meia-noite"
+    else:
+        hora = f"{'à' if quando.hour == 1 else 'às'} {quando.hour}:{quando.minute:02d}"
+    return f"{nome_dia(quando.date(), agora)} {hora}" if com_dia else hora
+
+
+def _segunda(data):
+    return data - datetime.timedelta(days=data.weekday())
+
+
+def intervalo(texto, agora=None):
+    """Período de uma consulta à agenda: (início, fim, descrição) ou None.
+
+    "hoje", "amanhã", "sexta", "dia 25" -> o dia inteiro; "esta semana", "semana
+    que vem", "fim de semana", "este mês", "mês que vem".
+    """
+    agora = agora or datetime.datetime.now()
+    hoje = agora.date()
+    c = numeros.tokens(texto)
+    meia_noite = datetime.datetime.combine(hoje, datetime.time())
+    proxima = any(p in c for p in ('proxima', 'proximo')) or 'que vem' in ' '.join(c)
+    if 'fim' in c and 'semana' in c:
+        sabado = hoje + datetime.timedelta(days=(5 - hoje.weekday()) % 7)
+        if hoje.weekday() == 6 and not proxima:
+            sabado = hoje - datetime.timedelta(days=1)
+        elif proxima and hoje.weekday() >= 5:
+            sabado += datetime.timedelta(days=7)
+        inicio = datetime.datetime.combine(sabado, datetime.time())
+        return max(inicio, meia_noite), inicio + datetime.timedelta(days=2), "no fim de semana"
+    if 'semana' in c:
+        segunda = datetime.datetime.combine(_segunda(hoje), datetime.time())
+        if proxima:
+            return segunda + datetime.timedelta(days=7), segunda + datetime.timedelta(days=14), "na semana que vem"
+        return meia_noite, segunda + datetime.timedelta(days=7), "nesta semana"
+    if 'mes' in c:
+        primeiro = datetime.datetime(hoje.year + hoje.month // 12, hoje.month % 12 + 1, 1)
+        if proxima:
+            seguinte = datetime.datetime(primeiro.year + primeiro.month // 12, primeiro.month % 12 + 1, 1)
+            return primeiro, seguinte, "no mês que vem"
+        return meia_noite, primeiro, "neste mês"
+    quando, _ = interpretar(texto, agora)
+    if quando is not None:
+        data = quando.date()
+    else:
+        # "o que tenho sexta": aqui o dia da semana sozinho já basta
+        dias = [DIAS_SEMANA[t] for t in c if t in DIAS_SEMANA]
+        if not dias:
+            return None
+        data = hoje + datetime.timedelta(days=(dias[0] - hoje.weekday()) % 7)
+    inicio = datetime.datetime.combine(data, datetime.time())
+    return inicio, inicio + datetime.timedelta(days=1), nome_dia(data, agora)
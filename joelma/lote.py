@@ -0,0 +1,210 @@
+# lote.py
+# Modo lote: roda o fluxo de comandos (palavra de ativação, escolha do comando,
+# handler) sobre falas gravadas ou transcrições, sem microfone e sem tocar
+# nada, distribuindo os itens num pool de processos. O resultado sai em JSONL,
+# uma linha por item, na ordem em que ficam prontos, com os tempos de cada etapa.
+#
+#   python -m joelma.lote gravacoes/              # todos os .wav e .txt da pasta
+#   python -m joelma.lote manifesto.jsonl -o resultado.jsonl --processos 8
+#   python -m joelma.lote frases.txt              # uma transcrição por linha
+#
+# Manifesto JSONL: {"id": "...", "wav": "cmd.wav"} ou {"id": "...", "texto": "..."},
+# com "respostas" opcionais (textos ou {"wav": ...}) para as perguntas que o
+# handler fizer, como os coeficientes de uma equação. Caminhos relativos são
+# relativos ao manifesto. Itens que não casam com nenhum comando saem com
+# "comando": "fallback" (a conta livre ou "Comando não reconhecido").
+#
+# Os handlers escrevem na agenda: por padrão numa pasta de dados temporária;
+# use --dados data para aplicar os comandos à agenda de verdade.
+import argparse
+import collections
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from . import assistente, audio, config, pipeline, wakeword
+
+_FEITO = threading.Event()
+_FEITO.set()
+
+
+class _Coletor:
+    """Destino das falas de um item: guarda o que seria dito e responde às
+    perguntas do handler com as respostas do roteiro."""
+
+    def __init__(self, respostas):
+        self.falas = []
+        self.respostas = collections.deque(respostas)
+        self.incompleto = False
+        self.reconhecimento = 0.0
+
+    def say(self, text, wait=False, priority=None, interruptible=True):
+        self.falas.append(text)
+        return _FEITO
+
+    def pause(self, seconds, wait=False, priority=None):
+        return _FEITO
+
+    def listen(self, perfil=None):
+        if not self.respostas:
+            # Sem resposta gravada o handler perguntaria para sempre: encerra o item
+            self.incompleto = True
+            raise pipeline.Cancelled()
+        texto, segundos = _transcrever(self.respostas.popleft())
+        self.reconhecimento += segundos
+        return texto
+
+
+def _transcrever(entrada):
+    """(texto, segundos gastos no reconhecimento) de uma fala gravada ou transcrita."""
+    if isinstance(entrada, str):
+        return entrada.strip().lower(), 0.0
+    if entrada.get('texto') is not None:
+        return entrada['texto'].strip().lower(), 0.0
+    t0 = time.perf_counter()
+    texto = audio.reconhecer(audio.ler_wav(entrada['wav']))
+    return texto, time.perf_counter() - t0
+
+
+def _iniciar(dados, verbose):
+    # Em cada processo do pool: mesma pasta de dados e sem o console dos handlers
+    config.set_data_dir(dados)
+    config.ensure_data_dir()
+    if not verbose:
+        sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+
+
+def processar(item, exigir_ativacao=False):
+    """Executa um item e retorna o registro de resultado (dict)."""
+    inicio = time.perf_counter()
+    saida = {'indice': item['indice'], 'id': item.get('id')}
+    try:
+        texto, t_rec = _transcrever(item)
+        saida['transcricao'] = texto
+        comando = wakeword.strip_wake_word(texto)
+        saida['ativacao'] = comando is not None
+        if comando is None:
+            if exigir_ativacao:
+                saida['comando'] = None
+                saida['respostas'] = []
+                return _fechar(saida, inicio, t_rec, 0.0)
+            comando = texto
+        encontrado = assistente.comandos.match(comando)
+        saida['comando'] = encontrado.name if encontrado else 'fallback'
+        coletor = _Coletor(item.get('respostas', []))
+        token = assistente.sessao_atual.set(coletor)
+        t0 = time.perf_counter()
+        try:
+            resultado = assistente.despachar(comando)
+        except pipeline.Cancelled:
+            resultado = None
+        finally:
+            assistente.sessao_atual.reset(token)
+        t_desp = time.perf_counter() - t0 - coletor.reconhecimento
+        saida['respostas'] = coletor.falas
+        saida['encerrar'] = resultado is False
+        saida['incompleto'] = coletor.incompleto
+        return _fechar(saida, inicio, t_rec + coletor.reconhecimento, t_desp)
+    except Exception as e:
+        saida['erro'] = f"{type(e).__name__}: {e}"
+        return _fechar(saida, inicio, None, None)
+
+
+def _fechar(saida, inicio, t_rec, t_desp):
+    ms = lambda s: None if s is None else round(s * 1000, 3)  # noqa: E731
+    saida['tempos'] = {'reconhecimento': ms(t_rec), 'despacho': ms(t_desp),
+                       'total': ms(time.perf_counter() - inicio)}
+    return saida
+
+
+def _processar_args(args):
+    return processar(*args)
+
+
+def _resolver(base, entrada):
+    if isinstance(entrada, dict) and entrada.get('wav'):
+        return dict(entrada, wav=os.path.join(base, entrada['wav']))
+    return entrada
+
+
+def itens(caminho):
+    """Gera os itens da entrada (pasta, manifesto .jsonl ou .txt), sem ler tudo antes."""
+    indice = 0
+    if os.path.isdir(caminho):
+        for nome in sorted(os.listdir(caminho)):
+            path = os.path.join(caminho, nome)
+            if nome.lower().endswith('.wav'):
+                yield {'indice': indice, 'id': nome, 'wav': path}
+            elif nome.lower().endswith('.txt'):
+                with open(path, encoding='utf-8') as f:
+                    yield {'indice': indice, 'id': nome, 'texto': f.read()}
+            else:
+                continue
+            indice += 1
+        return
+    base = os.path.dirname(os.path.abspath(caminho))
+    with open(caminho, encoding='utf-8') as f:
+        for numero, linha in enumerate(f, 1):
+            linha = linha.strip()
+            if not linha:
+                continue
+            if caminho.lower().endswith('.jsonl'):
+                item = _resolver(base, json.loads(linha))
+                item['respostas'] = [_resolver(base, r) for r in item.get('respostas', [])]
+                item.setdefault('id', str(numero))
+            else:
+                item = {'id': str(numero), 'texto': linha}
+            item['indice'] = indice
+            indice += 1
+            yield item
+
+
+def percentil(valores, q):
+    ordenados = sorted(valores)
+    return ordenados[min(int(q * len(ordenados)), len(ordenados) - 1)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Processa comandos gravados ou transcritos em lote.")
+    parser.add_argument('entrada', help="pasta com .wav/.txt, manifesto .jsonl ou .txt (uma frase por linha)")
+    parser.add_argument('-o', '--saida', default='-', help="arquivo JSONL de saída (padrão: stdout)")
+    parser.add_argument('--processos', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--dados', help="pasta de dados usada pelos handlers (padrão: temporária)")
+    parser.add_argument('--exigir-ativacao', action='store_true',
+                        help="ignora itens sem a palavra de ativação")
+    parser.add_argument('--verbose', action='store_true', help="mostra o console dos handlers")
+    args = parser.parse_args(argv)
+
+    dados = args.dados or tempfile.mkdtemp(prefix="joelma_lote_")
+    saida = sys.stdout if args.saida == '-' else open(args.saida, 'w', encoding='utf-8')
+    tempos = collections.defaultdict(list)
+    n = erros = 0
+    inicio = time.perf_counter()
+    tarefas = ((item, args.exigir_ativacao) for item in itens(args.entrada))
+    try:
+        with multiprocessing.Pool(args.processos, initializer=_iniciar, initargs=(dados, args.verbose)) as pool:
+            for resultado in pool.imap_unordered(_processar_args, tarefas, chunksize=8):
+                saida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                n += 1
+                erros += 'erro' in resultado
+                for etapa, ms in resultado['tempos'].items():
+                    if ms is not None:
+                        tempos[etapa].append(ms)
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+    total = time.perf_counter() - inicio
+    print(f"{n} itens em {total:.2f}s ({n / total if total else 0:.0f}/s), {erros} com erro; dados em {dados}",
+          file=sys.stderr)
+    for etapa, valores in tempos.items():
+        print(f"  {etapa:15s} p50 {percentil(valores, 0.5):8.2f}ms  p95 {percentil(valores, 0.95):8.2f}ms",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# metricas.py
+# Medição de latência por etapa da interação (espera pela fala, captura,
+# reconhecimento, intenção, handler, síntese e reprodução), com histogramas
+# em memória exportados no formato texto do Prometheus, em arquivo ou via HTTP
+# local, além de contadores de eventos (erros e trocas de backend, por exemplo).
+# Desligado (JOELMA_METRICAS=0), cada medição custa só um teste de flag.
+import bisect
+import collections
+import math
+import os
+import threading
+import time
+
+ENABLED = os.environ.get('JOELMA_METRICAS', '1') != '0'
+PREFIXO = 'joelma_etapa_segundos'
+CONTADOR = 'joelma_eventos_total'
+VALOR = 'joelma_valor'
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+JANELA = 500  # amostras recentes usadas nos percentis
+QUANTIS = (0.5, 0.95, 0.99)
+
+ETAPAS = {
+    'espera_fala': "espera até o início da fala",
+    'captura': "fala do usuário, do início ao fim",
+    'silencio_final': "silêncio esperado depois da fala até fechá-la",
+    'reconhecimento': "transcrição da fala",
+    'intencao': "escolha do comando",
+    'handler': "execução do comando",
+    'sintese': "síntese de uma fala",
+    'reproducao': "reprodução de uma fala",
+    'primeiro_audio': "do pedido de uma fala até o início do som",
+}
+
+
+class Histogram:
+    """Histograma acumulado (para o Prometheus) + janela das amostras recentes."""
+
+    def __init__(self, buckets=BUCKETS, window=JANELA):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # o último é +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.recent = collections.deque(maxlen=window)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def quantile(self, q):
+        if not self.recent:
+            return float('nan')
+        ordered = sorted(self.recent)
+        return ordered[max(int(math.ceil(q * len(ordered))) - 1, 0)]
+
+
+class _Timer:
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullTimer()
+
+
+class Registry:
+    def __init__(self, enabled=ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._hists = collections.OrderedDict()
+        self._counters = collections.OrderedDict()
+        self._gauges = collections.OrderedDict()
+        self._server = None
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._hists.get(stage)
+            if hist is None:
+                hist = self._hists[stage] = Histogram()
+            hist.observe(seconds)
+
+    def incr(self, evento, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[evento] = self._counters.get(evento, 0) + n
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def gauge(self, nome, valor):
+        """Valor instantâneo (gauge), como o limiar de energia atual."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[nome] = valor
+
+    def gauges(self):
+        with self._lock:
+            return dict(self._gauges)
+
+    def timer(self, stage):
+        """Context manager que mede o bloco na etapa indicada."""
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, stage)
+
+    def summary(self):
+        """{etapa: {'n':..., 'p50':..., 'p95':..., 'p99':...}} das amostras recentes."""
+        with self._lock:
+            return {stage: {'n': h.count, **{f"p{int(q * 100)}": h.quantile(q) for q in QUANTIS}}
+                    for stage, h in self._hists.items()}
+
+    def render_prometheus(self):
+        lines = [f"# HELP {PREFIXO} Latência de cada etapa da interação.",
+                 f"# TYPE {PREFIXO} histogram"]
+        recentes = []
+        contadores = []
+        valores = []
+        with self._lock:
+            for stage, h in self._hists.items():
+                acumulado = 0
+                for limite, n in zip(h.buckets + (float('inf'),), h.counts):
+                    acumulado += n
+                    le = "+Inf" if limite == float('inf') else repr(limite)
+                    lines.append(f'{PREFIXO}_bucket{{etapa="{stage}",le="{le}"}} {acumulado}')
+                lines.append(f'{PREFIXO}_sum{{etapa="{stage}"}} {h.sum}')
+                lines.append(f'{PREFIXO}_count{{etapa="{stage}"}} {h.count}')
+                for q in QUANTIS:
+                    recentes.append(f'{PREFIXO}_recente{{etapa="{stage}",quantile="{q}"}} {h.quantile(q)}')
+            for evento, n in self._counters.items():
+                contadores.append(f'{CONTADOR}{{evento="{evento}"}} {n}')
+            for nome, v in self._gauges.items():
+                valores.append(f'{VALOR}{{nome="{nome}"}} {v}')
+        if recentes:
+            lines.append(f"# HELP {PREFIXO}_recente Quantis das últimas {JANELA} amostras.")
+            lines.append(f"# TYPE {PREFIXO}_recente gauge")
+            lines.extend(recentes)
+        if contadores:
+            lines.append(f"# HELP {CONTADOR} Eventos contados (erros, tempos estourados, trocas).")
+            lines.append(f"# TYPE {CONTADOR} counter")
+            lines.extend(contadores)
+        if valores:
+            lines.append(f"# HELP {VALOR} Valores atuais (limiar de energia, ruído ambiente).")
+            lines.append(f"# TYPE {VALOR} gauge")
+            lines.extend(valores)
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp, path)
+        return path
+
+    def serve(self, port, host='127.0.0.1'):
+        """Expõe /metrics num servidor HTTP local, numa thread de fundo."""
+        import http.server
+        registry = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="metricas-http", daemon=True).start()
+        return self._server
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+# Registro padrão usado pelos módulos do assistente
+REGISTRO = Registry()
+observe = REGISTRO.observe
+incr = REGISTRO.incr
+counters = REGISTRO.counters
+gauge = REGISTRO.gauge
+gauges = REGISTRO.gauges
+timer = REGISTRO.timer
+summary = REGISTRO.summary
+render_prometheus = REGISTRO.render_prometheus
+dump = REGISTRO.dump
+serve = REGISTRO.serve
+
+
+def spoken_summary():
+    """Resumo curto para ser falado pelo assistente."""
+    partes = []
+    for stage, d in summary().items():
+        if d['n']:
+            partes.append(f"{stage.replace('_', ' ')}: mediana {d['p50'] * 1000:.0f} milissegundos, "
+                          f"p95 {d['p95'] * 1000:.0f}")
+    if not partes:
+        return "Ainda não há medições."
+    return ". ".join(partes) + "."
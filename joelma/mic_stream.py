@@ -0,0 +1,168 @@
+# mic_stream.py
+# Microfone aberto uma única vez, capturado continuamente por uma thread
+# num buffer circular limitado. O listen() recorta as falas desse buffer,
+# incluindo um trecho anterior ao início da fala (pre-roll), para não cortar
+# as primeiras sílabas. O fim da fala é decidido pelo VAD (ver vad.py) e o
+# limiar de energia acompanha o ruído ambiente continuamente (ver ruido.py).
+import collections
+import itertools
+import math
+import threading
+import time
+
+from . import metricas, ruido, vad
+from .vad import rms
+
+
+class MicrophoneStream:
+    """Captura contínua do microfone num buffer circular de blocos."""
+
+    def __init__(self, recognizer, sample_rate=16000, chunk_size=1024,
+                 buffer_seconds=30, device_index=None):
+        import speech_recognition as sr
+        self.recognizer = recognizer
+        self.source = sr.Microphone(device_index=device_index,
+                                    sample_rate=sample_rate, chunk_size=chunk_size)
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.sample_width = None
+        self.seconds_per_chunk = chunk_size / sample_rate
+        maxlen = int(math.ceil(buffer_seconds / self.seconds_per_chunk))
+        self._chunks = collections.deque(maxlen=maxlen)
+        self._next = 0  # número de sequência do próximo bloco a chegar
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self.vad = None
+        self.ruido = ruido.NoiseFloor(self.seconds_per_chunk, initial=recognizer.energy_threshold,
+                                      on_change=self._set_threshold)
+
+    # --- captura ---
+
+    def start(self):
+        # Sem calibração bloqueante: o limiar se ajusta sozinho nos primeiros
+        # blocos capturados e continua acompanhando o ruído depois
+        self.source.__enter__()
+        self.sample_width = self.source.SAMPLE_WIDTH
+        self.vad = vad.criar(lambda: self.ruido.threshold, self.sample_rate, self.sample_width)
+        self._running = True
+        self._thread = threading.Thread(target=self._capture, name="microfone", daemon=True)
+        self._thread.start()
+        return self
+
+    def _capture(self):
+        while self._running:
+            try:
+                chunk = self.source.stream.read(self.chunk_size)
+            except Exception as e:
+                print(f"Erro na captura do microfone: {e}")
+                time.sleep(0.1)
+                continue
+            with self._cond:
+                self._chunks.append(chunk)
+                self._next += 1
+                self._cond.notify_all()
+            self.ruido.update(rms(chunk, self.sample_width))
+
+    def _set_threshold(self, limiar):
+        # Mantém o Recognizer coerente para quem ainda consulta o limiar nele
+        self.recognizer.energy_threshold = limiar
+
+    @property
+    def threshold(self):
+        return self.ruido.threshold
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        self.source.__exit__(None, None, None)
+
+    # --- leitura ---
+
+    @property
+    def position(self):
+        with self._cond:
+            return self._next
+
+    def read(self, pos, timeout=None):
+        """Retorna (bloco, próxima_posição) a partir da posição absoluta pos.
+
+        Se pos já saiu do buffer, avança para o bloco mais antigo disponível.
+        Retorna (None, pos) se o timeout estourar.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: pos < self._next or not self._running, timeout):
+                return None, pos
+            if pos >= self._next:
+                return None, pos
+            oldest = self._next - len(self._chunks)
+            pos = max(pos, oldest)
+            return self._chunks[pos - oldest], pos + 1
+
+    def cursor(self, start=None):
+        return Cursor(self, self.position if start is None else start)
+
+    def listen(self, perfil=None, pre_roll=0.5):
+        """Recorta a próxima fala do buffer, como o Recognizer.listen().
+
+        perfil (nome ou vad.Perfil) define quanto esperar pelo início da fala,
+        o silêncio final e a duração máxima. O início da fala só é procurado
+        a partir do momento da chamada: antes dele o microfone ainda pode
+        estar ouvindo a própria voz do assistente (o "Sim?"). Os pre_roll
+        segundos anteriores entram só como histórico, antes do início achado.
+        Levanta sr.WaitTimeoutError se ninguém falar dentro do timeout do perfil.
+        """
+        import speech_recognition as sr
+        perfil = vad.perfil(perfil)
+        spc = self.seconds_per_chunk
+        pre_chunks = int(math.ceil(pre_roll / spc))
+        history = collections.deque(maxlen=max(pre_chunks, 1))
+        with self._cond:
+            pos = self._next
+            if pre_chunks:
+                history.extend(itertools.islice(self._chunks, max(len(self._chunks) - pre_chunks, 0), None))
+        started = time.monotonic()
+        deadline = started + perfil.timeout
+
+        # Espera o início da fala
+        while True:
+            chunk, pos = self.read(pos, timeout=max(deadline - time.monotonic(), 0))
+            if chunk is None:
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            if self.vad.is_speech(chunk):
+                break
+            if pre_chunks:
+                history.append(chunk)
+        onset = time.monotonic()
+        metricas.observe('espera_fala', onset - started)
+
+        # Acumula até o fim da fala decidido pelo endpointer
+        frames = list(history) if pre_chunks else []
+        frames.append(chunk)
+        fim = vad.Endpointer(perfil, spc)
+        fim.push(True)
+        while True:
+            chunk, pos = self.read(pos, timeout=1.0)
+            if chunk is None:
+                if not self._running:
+                    break
+                continue
+            frames.append(chunk)
+            if fim.push(self.vad.is_speech(chunk)):
+                break
+        metricas.observe('captura', time.monotonic() - onset)
+        metricas.observe('silencio_final', fim.silencio)
+        return sr.AudioData(b"".join(frames), self.sample_rate, self.sample_width)
+
+
+class Cursor:
+    """Leitor sequencial independente sobre o buffer do microfone."""
+
+    def __init__(self, stream, position):
+        self.stream = stream
+        self.position = position
+
+    def read(self, timeout=None):
+        chunk, self.position = self.stream.read(self.position, timeout=timeout)
+        return chunk
@@ -0,0 +1,281 @@
+# numeros.py
+# Números falados em português, lidos localmente: "menos três", "dois vírgula
+# cinco", "três quartos", "um e meio", "cento e vinte", "2 mil", "1/2", "vinte
+# por cento" (0.2: porcentagem vale como fração). Também
+# separa o grau e os coeficientes de uma equação ditos numa frase só
+# ("segundo grau, a igual a um, b menos três, c dois"). Só texto, sem rede.
+import re
+
+UNIDADES = {
+    'zero': 0, 'um': 1, 'uma': 1, 'dois': 2, 'duas': 2, 'tres': 3, 'quatro': 4,
+    'cinco': 5, 'seis': 6, 'sete': 7, 'oito': 8, 'nove': 9,
+}
+DEZ_A_DEZENOVE = {
+    'dez': 10, 'onze': 11, 'doze': 12, 'treze': 13, 'catorze': 14, 'quatorze': 14,
+    'quinze': 15, 'dezesseis': 16, 'dezasseis': 16, 'dezessete': 17, 'dezassete': 17,
+    'dezoito': 18, 'dezenove': 19, 'dezanove': 19,
+}
+DEZENAS = {
+    'vinte': 20, 'trinta': 30, 'quarenta': 40, 'cinquenta': 50,
+    'sessenta': 60, 'setenta': 70, 'oitenta': 80, 'noventa': 90,
+}
+CENTENAS = {'cem': 100, 'cento': 100}
+for _nome, _valor in [('duzent', 200), ('trezent', 300), ('quatrocent', 400), ('quinhent', 500),
+                      ('seiscent', 600), ('setecent', 700), ('oitocent', 800), ('novecent', 900)]:
+    CENTENAS[_nome + 'os'] = CENTENAS[_nome + 'as'] = _valor
+MULTIPLICADORES = {'mil': 1000, 'milhao': 10**6, 'milhoes': 10**6, 'bilhao': 10**9, 'bilhoes': 10**9}
+
+# Palavra -> (valor, ordem); uma palavra só soma a outra de ordem maior
+# ("cento e vinte e cinco"), então "dois três" são dois números
+_PALAVRAS = {}
+for _tabela, _ordem in [(UNIDADES, 1), (DEZ_A_DEZENOVE, 2), (DEZENAS, 2), (CENTENAS, 3)]:
+    for _nome, _valor in _tabela.items():
+        _PALAVRAS[_nome] = (_valor, _ordem)
+# Depois destas nada mais se soma: "dezoito", "cem", "zero"
+_FECHAM = set(DEZ_A_DEZENOVE) | {'cem', 'zero'}
+
+SINAIS = {'menos': -1, 'negativo': -1, '-': -1, 'mais': 1, 'positivo': 1, '+': 1}
+DECIMAL = {'virgula', 'ponto'}
+# "três quartos", "um terço", "meio"
+DENOMINADORES = {'meio': 2, 'meios': 2, 'centesimo': 100, 'centesimos': 100, 'milesimo': 1000, 'milesimos': 1000}
+for _nome, _valor in [('terco', 3), ('quarto', 4), ('quinto', 5), ('sexto', 6), ('setimo', 7),
+                      ('oitavo', 8), ('nono', 9), ('decimo', 10)]:
+    DENOMINADORES[_nome] = DENOMINADORES[_nome + 's'] = _valor
+
+ORDINAIS = {
+    'primeiro': 1, 'segundo': 2, 'terceiro': 3, 'quarto': 4, 'quinto': 5,
+    'sexto': 6, 'setimo': 7, 'oitavo': 8, 'nono': 9, 'decimo': 10,
+}
+
+# Como o reconhecedor costuma escrever as letras dos coeficientes
+LETRAS_FALADAS = {'be': 'b', 'ce': 'c', 'se': 'c', 'de': 'd'}
+CONECTIVOS = {'igual', 'a', '=', 'e', 'vale'}  # "a igual a um", "b é três" ("é" vira "e")
+
+_RE_TOKENS = re.compile(r'\d+(?:[.,]\d+)?|[a-z]+|[-+/=]')
+_RE_DIGITOS = re.compile(r'\d+(?:[.,]\d+)?')
+_ACENTOS = str.maketrans('áàâãéêíóôõúüçºª−', 'aaaaeeiooouucoa-')
+_PONTUACAO = '.,;:!?"\'()'
+# Palavras que indicam número por extenso, também com acento, para o teste rápido
+_POR_EXTENSO = frozenset(list(_PALAVRAS) + list(MULTIPLICADORES) + ['três', 'milhão', 'milhões', 'bilhão', 'bilhões'])
+
+
+def _sem_acentos(texto):
+    return texto.lower().translate(_ACENTOS)
+
+
+def tokens(texto):
+    """Texto -> lista de palavras, números e sinais, em minúsculas e sem acentos."""
+    return _RE_TOKENS.findall(_sem_acentos(texto))
+
+
+def tokens_posicoes(texto):
+    """Como tokens(), mas com (token, início, fim) de cada um no texto original."""
+    return [(m.group(), m.start(), m.end()) for m in _RE_TOKENS.finditer(_sem_acentos(texto))]
+
+
+def inteiro(chaves, j):
+    """Lê um inteiro (algarismos ou por extenso) a partir de chaves[j], com
+    chaves vindas de tokens(): (valor, próximo índice) ou None."""
+    n = len(chaves)
+    if j < n and _RE_DIGITOS.fullmatch(chaves[j]):
+        c = chaves[j]
+        valor = int(c) if c.isdigit() else float(c.replace(',', '.'))
+        j += 1
+        if j < n and chaves[j] in MULTIPLICADORES:  # "2 mil", "1,5 milhão"
+            valor *= MULTIPLICADORES[chaves[j]]
+            j += 1
+        return valor, j
+    total = grupo = 0
+    ordem, teto, lido = 4, None, False
+    while j < n:
+        c = chaves[j]
+        if c == 'e' and lido and j + 1 < n and _PALAVRAS.get(chaves[j + 1], (0, 9))[1] < ordem:
+            j += 1  # "vinte e cinco"
+            continue
+        if c in MULTIPLICADORES:
+            m = MULTIPLICADORES[c]
+            if (teto is not None and m >= teto) or (not lido and c != 'mil'):
+                break
+            total += (grupo or 1) * m
+            grupo, ordem, teto, lido = 0, 4, m, True
+            j += 1
+            continue
+        valor, o = _PALAVRAS.get(c, (None, 9))
+        if valor is None or o >= ordem:
+            break
+        grupo += valor
+        ordem = 1 if c in _FECHAM else o
+        lido = True
+        j += 1
+    if not lido:
+        return None
+    return total + grupo, j
+
+
+def _decimais(chaves, j):
+    """Dígitos depois de "vírgula": "cinco" -> "5", "zero cinco" -> "05", "vinte e cinco" -> "25"."""
+    if j >= len(chaves):
+        return None
+    if chaves[j].isdigit():
+        return chaves[j], j + 1
+    k = j
+    while k < len(chaves) and chaves[k] in UNIDADES:
+        k += 1
+    if k - j > 1 or (k > j and chaves[j] == 'zero'):
+        return ''.join(str(UNIDADES[c]) for c in chaves[j:k]), k
+    lido = inteiro(chaves, j)
+    if lido is None or not isinstance(lido[0], int):
+        return None
+    return str(lido[0]), lido[1]
+
+
+def _ler(chaves, i, operadores=True):
+    """Lê um número a partir de i: (valor, próximo índice) ou None.
+
+    Com operadores=False sinais e "sobre"/"dividido por" ficam de fora, para
+    a calculadora tratar como operações.
+    """
+    n = len(chaves)
+    j, sinal = i, 1
+    if operadores and j < n and chaves[j] in SINAIS:
+        sinal = SINAIS[chaves[j]]
+        j += 1
+    lido = inteiro(chaves, j)
+    if lido is None:
+        if j < n and chaves[j] in ('meio', 'meios'):  # "menos meio"
+            return sinal * 0.5, j + 1
+        return None
+    valor, j = lido
+    if isinstance(valor, int) and j + 1 < n and chaves[j] in DECIMAL:
+        dec = _decimais(chaves, j + 1)
+        if dec is not None:
+            valor = float(f"{valor}.{dec[0]}")
+            j = dec[1]
+    if j < n and chaves[j] in DENOMINADORES:
+        valor /= DENOMINADORES[chaves[j]]  # "três quartos", "um meio"
+        j += 1
+    elif j + 1 < n and chaves[j] == 'e' and chaves[j + 1] in ('meio', 'meia'):
+        valor += MULTIPLICADORES.get(chaves[j - 1], 1) / 2  # "um e meio", "um milhão e meio"
+        j += 2
+    elif operadores and j < n and chaves[j] in ('sobre', '/', 'dividido'):
+        k = j + 2 if chaves[j] == 'dividido' and j + 1 < n and chaves[j + 1] == 'por' else j + 1
+        divisor = inteiro(chaves, k)
+        if divisor is not None and divisor[0] != 0:
+            valor /= divisor[0]
+            j = divisor[1]
+    if chaves[j:j + 2] == ['por', 'cento']:
+        valor /= 100  # "cem por cento" -> 1
+        j += 2
+    return sinal * valor, j
+
+
+def _todos(chaves):
+    valores, i = [], 0
+    while i < len(chaves):
+        lido = _ler(chaves, i)
+        if lido is None:
+            i += 1
+            continue
+        valores.append(lido[0])
+        i = lido[1]
+    return valores
+
+
+def numeros(texto):
+    """Todos os números ditos no texto, em ordem (float)."""
+    return [float(v) for v in _todos(tokens(texto))]
+
+
+def numero(texto):
+    """O único número dito no texto; ValueError se não houver exatamente um."""
+    valores = numeros(texto)
+    if len(valores) != 1:
+        raise ValueError(f"esperava um número em {texto!r}")
+    return valores[0]
+
+
+def para_algarismos(texto):
+    """Troca números por extenso por algarismos e mantém o resto ("dois mais
+    três quartos" -> "2 mais 0.75"); sinais e operações ficam como estão."""
+    if _POR_EXTENSO.isdisjoint(texto.lower().split()):
+        return texto  # caminho comum: o reconhecedor já escreveu os números em algarismos
+    palavras = texto.split()
+    chaves = [_sem_acentos(p).strip(_PONTUACAO) for p in palavras]
+    saida, i = [], 0
+    while i < len(palavras):
+        # Algarismos sozinhos ficam como foram escritos; "2 mil" vira 2000 e "20 por cento", 0.2
+        lido = None
+        if (not _RE_DIGITOS.fullmatch(chaves[i]) or chaves[i + 1:i + 2] and chaves[i + 1] in MULTIPLICADORES
+                or chaves[i + 1:i + 3] == ['por', 'cento']):
+            lido = _ler(chaves, i, operadores=False)
+        if lido is None:
+            saida.append(palavras[i])
+            i += 1
+            continue
+        valor, i = lido
+        saida.append(str(int(valor)) if valor == int(valor) else repr(valor))
+        if chaves[i - 1] == 'cento' and chaves[i:i + 1] in (['de'], ['do'], ['da']):
+            saida.append('vezes')  # "vinte por cento de 150" -> "0.2 vezes 150"
+            i += 1
+    return ' '.join(saida)
+
+
+def grau(texto):
+    """Grau da equação dito no texto ("segundo grau", "2º grau", "grau 3")
+    e o texto que vem depois; (None, texto) se não houver."""
+    chaves = tokens(texto)
+    for i, c in enumerate(chaves):
+        if c != 'grau':
+            continue
+        antes = chaves[max(i - 2, 0):i]
+        if antes and antes[-1] in ORDINAIS:
+            return ORDINAIS[antes[-1]], ' '.join(chaves[i + 1:])
+        if antes and antes[-1] == 'o' and len(antes) == 2 and antes[0].isdigit():
+            return int(antes[0]), ' '.join(chaves[i + 1:])  # "2º" vira "2o"
+        if antes and antes[-1].isdigit():
+            return int(antes[-1]), ' '.join(chaves[i + 1:])
+        lido = inteiro(chaves, i + 1)
+        if lido is not None and isinstance(lido[0], int):
+            return lido[0], ' '.join(chaves[lido[1]:])
+    return None, texto
+
+
+def coeficientes(texto, letras, conhecidos=None):
+    """Coeficientes ditos no texto, {letra: valor}, somados aos já conhecidos.
+
+    Aceita rótulos ("a igual a um, b menos três") e números em sequência, que
+    preenchem as letras que faltam em ordem ("um, menos três, dois"). A letra
+    "e" só vale como rótulo com "igual" ou "=" depois, para não confundir com
+    a conjunção.
+    """
+    letras = list(letras)
+    valores = dict(conhecidos or {})
+    chaves = tokens(texto)
+
+    def proxima(k):
+        while k < len(letras) and letras[k] in valores:
+            k += 1
+        return k
+
+    cursor, i = proxima(0), 0
+    while i < len(chaves):
+        letra = LETRAS_FALADAS.get(chaves[i], chaves[i])
+        if letra in letras:
+            j = i + 1
+            while j < len(chaves) and chaves[j] in CONECTIVOS and _ler(chaves, j) is None:
+                j += 1
+            explicito = any(c in ('igual', '=') for c in chaves[i + 1:j])
+            lido = _ler(chaves, j) if letra != 'e' or explicito else None
+            if lido is not None:
+                valores[letra] = float(lido[0])
+                cursor, i = proxima(letras.index(letra) + 1), lido[1]
+                continue
+        lido = _ler(chaves, i)
+        if lido is None:
+            i += 1
+            continue
+        if cursor < len(letras):
+            valores[letras[cursor]] = float(lido[0])
+            cursor = proxima(cursor + 1)
+        i = lido[1]
+    return valores
@@ -0,0 +1,141 @@
+# offline_tts.py
+# Fala offline com um único motor pyttsx3, criado uma vez e mantido por uma
+# thread dedicada que consome uma fila de textos. Além de falar direto, o
+# motor grava a fala num WAV, para ser usado como backend de síntese.
+import importlib.util
+import os
+import queue
+import tempfile
+import threading
+
+# O pyttsx3 só é importado pela thread de fala, quando ela é criada
+PYTTSX3_AVAILABLE = importlib.util.find_spec('pyttsx3') is not None
+
+
+class _Gravacao:
+    # Pedido de synthesize(); abandonada=True quando quem pediu desistiu de
+    # esperar, e então a thread do motor apaga o arquivo ao terminar
+    __slots__ = ('path', 'erro', 'abandonada')
+
+    def __init__(self, path):
+        self.path = path
+        self.erro = None
+        self.abandonada = False
+
+
+class OfflineSpeaker:
+    """Thread de fala dona do motor pyttsx3.
+
+    O pyttsx3 só funciona de forma confiável na thread que criou o motor,
+    por isso init(), escolha de voz e runAndWait() ficam todos aqui dentro.
+    """
+
+    def __init__(self, voice_hint="brazil", rate=150):
+        if not PYTTSX3_AVAILABLE:
+            raise RuntimeError("Biblioteca pyttsx3 não encontrada.")
+        self.voice_hint = voice_hint
+        self.rate = rate
+        self.voice_id = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="fala-offline", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def _setup(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty('rate', self.rate)
+        # Procura a voz uma única vez, na inicialização
+        for voice in engine.getProperty('voices'):
+            if self.voice_hint in voice.name.lower():
+                engine.setProperty('voice', voice.id)
+                self.voice_id = voice.id
+                break
+        return engine
+
+    def _run(self):
+        try:
+            engine = self._setup()
+        except Exception as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            text, done, gravacao = item
+            try:
+                if gravacao is not None:
+                    engine.save_to_file(text, gravacao.path)
+                    engine.runAndWait()
+                elif text:
+                    engine.say(text)
+                    engine.runAndWait()
+            except Exception as e:
+                if gravacao is None:
+                    print(f"Erro na fala offline: {e}")
+                else:
+                    gravacao.erro = e
+            finally:
+                with self._lock:
+                    done.set()
+                    if gravacao is not None and gravacao.abandonada:
+                        _apagar(gravacao.path)
+        engine.stop()
+
+    def say(self, text, wait=False):
+        """Enfileira o texto; com wait=True bloqueia até terminar de falar.
+
+        Retorna um threading.Event que é sinalizado ao fim da fala.
+        """
+        done = threading.Event()
+        self._queue.put((text, done, None))
+        if wait:
+            done.wait()
+        return done
+
+    def synthesize(self, text, timeout=None):
+        """Grava a fala num WAV (na thread do motor) e devolve os bytes.
+        Levanta TimeoutError se o motor não terminar em timeout segundos."""
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        gravacao = _Gravacao(path)
+        done = threading.Event()
+        self._queue.put((text, done, gravacao))
+        if not done.wait(timeout):
+            with self._lock:
+                if not done.is_set():
+                    gravacao.abandonada = True  # o motor apaga o arquivo quando terminar
+                    raise TimeoutError(f"o pyttsx3 passou de {timeout:.1f}s")
+        try:
+            if gravacao.erro is not None:
+                raise gravacao.erro
+            with open(path, 'rb') as f:
+                data = f.read()
+            if not data:
+                raise RuntimeError("o pyttsx3 não gravou o áudio")
+            return data
+        finally:
+            _apagar(path)
+
+    def wait_idle(self):
+        """Bloqueia até a fila de fala esvaziar."""
+        self.say("", wait=True)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+def _apagar(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,267 @@
+# pipeline.py
+# Pipeline de interação em estágios: captura, reconhecimento, despacho do
+# comando e saída de áudio (síntese + reprodução), cada um na sua thread e
+# ligados por filas. Enquanto uma resposta ainda está sendo sintetizada ou
+# tocada, a captura já voltou a ouvir a próxima fala, e a síntese da frase
+# seguinte acontece durante a reprodução da atual (ver saida.py).
+# A palavra de ativação continua sendo ouvida enquanto o assistente fala:
+# detectada no meio de uma resposta, ela corta a fala e descarta a fila.
+import itertools
+import queue
+import threading
+import time
+
+from .saida import BAIXA, NORMAL, URGENTE, Fala, SaidaAudio, dividir  # noqa: F401
+
+
+class Cancelled(Exception):
+    """Levantada dentro de um handler quando a interação atual é cancelada."""
+
+
+class Turn:
+    """Uma interação: da palavra de ativação até o fim do handler."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self):
+        self.id = next(self._ids)
+        self.started = time.monotonic()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+
+class _Request:
+    # Pedido de escuta feito por um handler no meio da interação;
+    # kwargs=None marca o fim da interação
+    def __init__(self, turn, kwargs):
+        self.turn = turn
+        self.kwargs = kwargs
+        self.text = ""
+        self.done = threading.Event()
+
+
+class Pipeline:
+    """Liga os estágios da interação.
+
+    wait_wake(stop) -> bool       espera a palavra de ativação
+    capture(**kw) -> áudio|None   recorta uma fala do microfone
+    recognize(áudio) -> str       transcreve a fala
+    dispatch(texto) -> bool|None  executa o comando; False encerra o pipeline
+    synthesize(texto) -> áudio    gera o áudio de uma fala
+    play(áudio, parar)            reproduz o áudio; retorna cedo se parar for sinalizado
+    """
+
+    def __init__(self, wait_wake, capture, recognize, dispatch, synthesize, play,
+                 on_wake=None, max_ready=4):
+        self._wait_wake = wait_wake
+        self._capture = capture
+        self._recognize = recognize
+        self._dispatch = dispatch
+        self._on_wake = on_wake
+        self._audio_q = queue.Queue()
+        self._text_q = queue.Queue()
+        self._requests = queue.Queue()
+        self._stop = threading.Event()
+        self._local = threading.local()
+        self._falha = None  # exceção de um estágio que morreu; run() a relança
+        self.turn = None
+        # A saída de áudio já funciona antes do run(), para a saudação inicial
+        self.saida = SaidaAudio(synthesize, play, max_ready=max_ready)
+
+    def _start(self, target, name):
+        t = threading.Thread(target=self._estagio, args=(target, name), name=name, daemon=True)
+        t.start()
+        return t
+
+    def _estagio(self, target, name):
+        # Um estágio que morre (microfone sumiu, por exemplo) para o pipeline
+        # inteiro: run() relança o erro em vez de ficar esperando para sempre
+        try:
+            target()
+        except BaseException as e:
+            print(f"Estágio {name} falhou: {e!r}")
+            self._falha = e
+            self.stop()
+
+    def _verificar_estagios(self):
+        if self._falha is not None:
+            raise self._falha
+
+    # --- API usada pelos handlers ---
+
+    @property
+    def current_turn(self):
+        return getattr(self._local, 'turn', None)
+
+    def _check(self, turn):
+        if turn is not None and turn.cancelled:
+            raise Cancelled()
+
+    def _enqueue(self, item, wait):
+        self._check(item.turn)
+        self.saida.put(item)
+        if wait:
+            item.done.wait()
+            self._check(item.turn)
+        return item.done
+
+    def say(self, text, wait=False, priority=NORMAL, interruptible=True):
+        """Enfileira uma fala; retorna um Event sinalizado quando ela termina de tocar.
+        Textos longos viram vários trechos, sintetizados em paralelo e tocados em ordem.
+        Falas com interruptible=False não são cortadas pela palavra de ativação."""
+        turn = self.current_turn
+        self._check(turn)
+        falas = [Fala(t, priority=priority, turn=turn, interruptible=interruptible)
+                 for t in dividir(text)]
+        if not falas:
+            falas = [Fala(text, priority=priority, turn=turn, interruptible=interruptible)]
+        for fala in falas[1:]:
+            fala.primeira = False
+        for fala in falas[:-1]:
+            self.saida.put(fala)
+        return self._enqueue(falas[-1], wait)
+
+    def pause(self, seconds, wait=False, priority=NORMAL):
+        """Silêncio entre falas, respeitando a ordem da fila de saída."""
+        return self._enqueue(Fala(pause=seconds, priority=priority, turn=self.current_turn), wait)
+
+    def listen(self, **kwargs):
+        """Pede uma resposta ao usuário dentro da interação atual."""
+        turn = self.current_turn
+        self._check(turn)
+        req = _Request(turn, kwargs)
+        self._requests.put(req)
+        while not req.done.wait(0.1):
+            self._check(turn)
+            self._verificar_estagios()
+        self._check(turn)
+        return req.text
+
+    def wait_idle(self, timeout=None):
+        """Bloqueia até todas as falas enfileiradas terminarem de tocar."""
+        return self.saida.wait_idle(timeout)
+
+    def cancel(self):
+        """Cancela a interação em andamento: falas pendentes são descartadas,
+        escutas pendentes são abortadas e o handler recebe Cancelled."""
+        turn = self.turn
+        if turn is not None:
+            turn.cancel()
+            self._requests.put(_Request(turn, None))
+
+    def interrupt(self):
+        """Barge-in: cancela a interação em andamento e cala a saída de áudio.
+        Retorna True se o assistente estava falando ou tinha falas na fila."""
+        self.cancel()
+        return self.saida.interrupt()
+
+    # --- estágios ---
+
+    def _capture_loop(self):
+        acordou = False  # ativação ouvida enquanto um handler falava
+        while not self._stop.is_set():
+            if not acordou:
+                if not self._wait_wake(self._stop):
+                    continue
+                tocando = self.saida.playing()
+                if tocando is not None and not tocando.interruptible:
+                    continue  # provavelmente o próprio assistente dizendo a palavra de ativação
+            # Ativação no meio de uma resposta corta a fala; a confirmação é o
+            # próprio silêncio, e a captura começa já (com o pre-roll do buffer)
+            interrompeu = self.interrupt() or acordou
+            if interrompeu:
+                print("Fala interrompida.")
+            acordou = False
+            turn = Turn()
+            self.turn = turn
+            if self._on_wake is not None and not interrompeu:
+                self._on_wake()
+            self.wait_idle()  # não grava a própria fala do assistente
+            self._audio_q.put((turn, None, self._capture()))
+            # A interação fica aberta até o despacho terminar; enquanto isso só
+            # capturamos as respostas pedidas pelo handler
+            while not self._stop.is_set():
+                req = self._requests.get()
+                if req.kwargs is None:
+                    if req.turn is turn or req.turn is None:
+                        break
+                    continue  # fim de uma interação antiga
+                if req.turn is not None and req.turn.cancelled:
+                    req.done.set()
+                    continue
+                if self._ativacao_durante_fala():
+                    # "sexta-feira, parar" durante "Quer ouvir mais?": corta a
+                    # leitura, cancela a interação e já abre a próxima
+                    self.interrupt()
+                    req.done.set()
+                    acordou = True
+                    break
+                self._audio_q.put((req.turn, req, self._capture(**req.kwargs)))
+
+    def _ativacao_durante_fala(self):
+        # Espera as falas do handler terminarem de tocar sem deixar de ouvir a
+        # palavra de ativação; True se ela foi dita antes disso
+        calou = threading.Event()
+
+        def vigiar():
+            while not self.saida.wait_idle(0.05) and not self._stop.is_set():
+                pass
+            calou.set()
+        threading.Thread(target=vigiar, name="vigia-saida", daemon=True).start()
+        while not calou.is_set():
+            if not self._wait_wake(calou):
+                continue
+            tocando = self.saida.playing()
+            if tocando is None or tocando.interruptible:
+                return True
+        return False
+
+    def _recognize_loop(self):
+        while not self._stop.is_set():
+            turn, req, audio = self._audio_q.get()
+            text = ""
+            if audio is not None and not turn.cancelled:
+                text = self._recognize(audio)
+            if req is not None:
+                req.text = text
+                req.done.set()
+            else:
+                self._text_q.put((turn, text))
+
+    def run(self):
+        """Executa o despacho na thread atual até um handler retornar False."""
+        self._start(self._capture_loop, "captura")
+        self._start(self._recognize_loop, "reconhecimento")
+        try:
+            while not self._stop.is_set():
+                try:
+                    turn, text = self._text_q.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if turn.cancelled:
+                    self._requests.put(_Request(turn, None))
+                    continue
+                self._local.turn = turn
+                try:
+                    keep = self._dispatch(text)
+                except Cancelled:
+                    print("Interação cancelada.")
+                    keep = True
+                finally:
+                    self._local.turn = None
+                    self._requests.put(_Request(turn, None))  # a captura volta a esperar a ativação
+                if keep is False:
+                    break
+            self._verificar_estagios()
+        finally:
+            self.wait_idle()
+
+    def stop(self):
+        self._stop.set()
+        self._requests.put(_Request(None, None))
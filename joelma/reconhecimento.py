@@ -0,0 +1,236 @@
+# reconhecimento.py
+# Backends de reconhecimento de fala atrás de uma interface comum: o Google
+# (online) e o Vosk (local, modelo em disco). Cada backend tem um orçamento de
+# latência; se o ativo estoura o orçamento ou dá erro, a mesma fala é passada
+# ao próximo, e depois de falhas seguidas ele fica suspenso por um tempo.
+# Com auto=True a ordem de preferência vem da latência medida em avaliar().
+import concurrent.futures
+import json
+import threading
+import time
+
+from . import metricas, wakeword
+
+GOOGLE_ORCAMENTO = 3.0  # segundos
+VOSK_ORCAMENTO = 2.0
+FALHAS_PARA_TROCAR = 2   # falhas seguidas até suspender o backend
+SUSPENSAO = 60.0         # segundos até tentar de novo um backend suspenso
+
+
+class SemFala(Exception):
+    """O backend respondeu, mas não havia fala inteligível no áudio."""
+
+
+class Backend:
+    """Interface de um backend: recognize(audio) retorna o texto em minúsculas,
+    levanta SemFala quando não entende nada e qualquer outra exceção em caso de erro."""
+
+    name = None
+
+    def __init__(self, budget):
+        self.budget = budget
+
+    def available(self):
+        return True
+
+    def recognize(self, audio):
+        raise NotImplementedError
+
+
+class GoogleBackend(Backend):
+    name = 'google'
+
+    def __init__(self, recognizer, language='pt-BR', budget=GOOGLE_ORCAMENTO):
+        super().__init__(budget)
+        self.recognizer = recognizer
+        self.language = language
+        # Uma chamada que estourou o orçamento não fica presa para sempre
+        if getattr(recognizer, 'operation_timeout', None) is None:
+            recognizer.operation_timeout = budget * 3
+
+    def recognize(self, audio):
+        import speech_recognition as sr
+        try:
+            return self.recognizer.recognize_google(audio, language=self.language).lower()
+        except sr.UnknownValueError:
+            raise SemFala()
+
+
+class VoskBackend(Backend):
+    """Reconhecimento local com o vocabulário completo do modelo Vosk.
+    O modelo é o mesmo da palavra de ativação e é carregado uma vez só."""
+
+    name = 'vosk'
+
+    def __init__(self, model_path=None, sample_rate=wakeword.SAMPLE_RATE, budget=VOSK_ORCAMENTO):
+        super().__init__(budget)
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+
+    def available(self):
+        return wakeword.is_available(self.model_path)
+
+    def recognize(self, audio):
+        import vosk
+        rec = vosk.KaldiRecognizer(wakeword.load_model(self.model_path), self.sample_rate)
+        rec.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(rec.FinalResult()).get('text', '')
+        if not text:
+            raise SemFala()
+        return text.lower()
+
+
+class _Estado:
+    __slots__ = ('chamadas', 'ok', 'sem_fala', 'erros', 'lentos', 'falhas_seguidas',
+                 'suspenso_ate', 'tempo_total')
+
+    def __init__(self):
+        self.chamadas = self.ok = self.sem_fala = self.erros = self.lentos = 0
+        self.falhas_seguidas = 0
+        self.suspenso_ate = 0.0
+        self.tempo_total = 0.0
+
+
+class Reconhecedor:
+    """Escolhe o backend de cada fala e troca de backend automaticamente."""
+
+    def __init__(self, backends, failures_to_switch=FALHAS_PARA_TROCAR, retry_after=SUSPENSAO, auto=False):
+        self.backends = [b for b in backends if b.available()]
+        if not self.backends:
+            raise RuntimeError("Nenhum backend de reconhecimento disponível.")
+        self.failures_to_switch = failures_to_switch
+        self.retry_after = retry_after
+        self.auto = auto
+        self._estado = {b.name: _Estado() for b in self.backends}
+        self._latencias = {}  # nome -> segundos na última avaliação (None = falhou)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._ativo = self.backends[0].name
+
+    def _ordem(self):
+        # Preferidos não suspensos primeiro; os suspensos ficam como último recurso
+        agora = time.monotonic()
+        with self._lock:
+            livres = [b for b in self.backends if self._estado[b.name].suspenso_ate <= agora]
+            suspensos = [b for b in self.backends if self._estado[b.name].suspenso_ate > agora]
+        return livres + suspensos
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="stt")
+            return self._pool
+
+    def _falhou(self, backend, motivo):
+        st = self._estado[backend.name]
+        with self._lock:
+            st.falhas_seguidas += 1
+            if motivo == 'lento':
+                st.lentos += 1
+            else:
+                st.erros += 1
+            if st.falhas_seguidas >= self.failures_to_switch and len(self.backends) > 1:
+                st.suspenso_ate = time.monotonic() + self.retry_after
+                st.falhas_seguidas = 0
+                metricas.incr(f"stt_{backend.name}_suspenso")
+                print(f"Reconhecimento: {backend.name} suspenso por {self.retry_after:.0f}s.")
+        metricas.incr(f"stt_{backend.name}_{motivo}")
+
+    def _respondeu(self, backend, dt, resultado):
+        st = self._estado[backend.name]
+        with self._lock:
+            st.falhas_seguidas = 0
+            st.suspenso_ate = 0.0
+            st.tempo_total += dt
+            if resultado == 'ok':
+                st.ok += 1
+            else:
+                st.sem_fala += 1
+            if self._ativo != backend.name:
+                print(f"Reconhecimento: usando {backend.name}.")
+                self._ativo = backend.name
+        metricas.observe(f"reconhecimento_{backend.name}", dt)
+        metricas.incr(f"stt_{backend.name}_{resultado}")
+
+    def recognize(self, audio):
+        """Transcreve o áudio; retorna "" se nenhum backend entendeu."""
+        ordem = self._ordem()
+        for i, backend in enumerate(ordem):
+            with self._lock:
+                self._estado[backend.name].chamadas += 1
+            t0 = time.perf_counter()
+            try:
+                if i == len(ordem) - 1:
+                    # Último candidato: não há para quem passar, então espera o que levar
+                    texto = backend.recognize(audio)
+                else:
+                    futuro = self._executor().submit(backend.recognize, audio)
+                    texto = futuro.result(timeout=backend.budget)
+            except SemFala:
+                self._respondeu(backend, time.perf_counter() - t0, 'sem_fala')
+                print("Não foi possível entender o áudio.")
+                return ""
+            except concurrent.futures.TimeoutError:
+                # A chamada lenta segue em segundo plano e o resultado é descartado
+                print(f"Reconhecimento: {backend.name} passou de {backend.budget:.1f}s.")
+                self._falhou(backend, 'lento')
+                continue
+            except Exception as e:
+                print(f"Erro no serviço de reconhecimento {backend.name}; {e}")
+                self._falhou(backend, 'erro')
+                continue
+            self._respondeu(backend, time.perf_counter() - t0, 'ok')
+            return texto
+        return ""
+
+    def avaliar(self, audio):
+        """Mede cada backend com o mesmo áudio curto (silêncio serve: responder
+        SemFala conta como saudável) e, com auto, reordena pelo mais rápido.
+        Quem passa do orçamento ou dá erro fica por último."""
+        medidas = {}
+        with self._lock:
+            backends = list(self.backends)
+        for backend in backends:
+            t0 = time.perf_counter()
+            try:
+                self._executor().submit(backend.recognize, audio).result(timeout=backend.budget)
+            except SemFala:
+                pass
+            except Exception:
+                medidas[backend.name] = None
+                continue
+            medidas[backend.name] = time.perf_counter() - t0
+            metricas.gauge(f"stt_{backend.name}_latencia", round(medidas[backend.name], 4))
+        with self._lock:
+            self._latencias = medidas
+            if self.auto:
+                self.backends.sort(key=lambda b: (medidas.get(b.name) is None, medidas.get(b.name) or 0.0))
+            preferido = self.backends[0].name
+        for backend in self.backends:
+            metricas.gauge(f"stt_{backend.name}_preferido", int(backend.name == preferido))
+        return medidas
+
+    def stats(self):
+        """{backend: {'chamadas', 'ok', 'sem_fala', 'erros', 'lentos', 'media', 'latencia', 'suspenso'}}"""
+        agora = time.monotonic()
+        with self._lock:
+            out = {}
+            for name, st in self._estado.items():
+                respostas = st.ok + st.sem_fala
+                out[name] = {
+                    'chamadas': st.chamadas,
+                    'ok': st.ok,
+                    'sem_fala': st.sem_fala,
+                    'erros': st.erros,
+                    'lentos': st.lentos,
+                    'media': st.tempo_total / respostas if respostas else None,
+                    'latencia': self._latencias.get(name),
+                    'suspenso': st.suspenso_ate > agora,
+                }
+            return out
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
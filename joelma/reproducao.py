@@ -0,0 +1,92 @@
+# reproducao.py
+# Reprodução de áudio direto da memória. Com o miniaudio o MP3 do gTTS é
+# decodificado e tocado a partir do buffer, sem criar, ler e apagar arquivos.
+# A reprodução pode ser cortada no meio por um threading.Event (parar).
+import importlib.util
+import os
+import tempfile
+import threading
+
+# O miniaudio só é importado na primeira reprodução
+MINIAUDIO_AVAILABLE = importlib.util.find_spec('miniaudio') is not None
+
+BUFFER_MS = 200  # buffer do dispositivo de saída
+
+
+def _frames(samples, nchannels, fim, parar=None):
+    # Gerador no formato do miniaudio: recebe quantos quadros o dispositivo
+    # quer e devolve o próximo trecho das amostras já decodificadas
+    pos = 0
+    pedidos = yield b""
+    while pos < len(samples) and not (parar is not None and parar.is_set()):
+        n = pedidos * nchannels
+        pedidos = yield samples[pos:pos + n]
+        pos += n
+    fim.set()
+
+
+def _play_miniaudio(data, parar=None):
+    import miniaudio
+    som = miniaudio.decode(data, output_format=miniaudio.SampleFormat.SIGNED16)
+    duracao = len(som.samples) / som.nchannels / som.sample_rate
+    fim = threading.Event()
+    gerador = _frames(som.samples, som.nchannels, fim, parar)
+    next(gerador)
+    device = miniaudio.PlaybackDevice(output_format=miniaudio.SampleFormat.SIGNED16,
+                                      nchannels=som.nchannels, sample_rate=som.sample_rate,
+                                      buffersize_msec=BUFFER_MS)
+    try:
+        device.start(gerador)
+        fim.wait(duracao + 1.0)
+        # O último trecho entregue ainda está no buffer do dispositivo
+        if parar is None:
+            parar = threading.Event()
+        parar.wait(BUFFER_MS / 1000)
+    finally:
+        device.close()
+
+
+def play_file(path, parar=None, depois=None):
+    """Toca um arquivo com o playsound, que não tem como ser interrompido:
+    com parar, ele roda numa thread e a chamada retorna assim que parar for
+    sinalizado (em algumas plataformas o som ainda vai até o fim)."""
+    from playsound import playsound
+
+    def tocar():
+        try:
+            playsound(path)
+        finally:
+            if depois is not None:
+                depois()
+
+    if parar is None:
+        tocar()
+        return
+    t = threading.Thread(target=tocar, name="playsound", daemon=True)
+    t.start()
+    while t.is_alive() and not parar.wait(0.02):
+        pass
+
+
+def _play_arquivo(data, suffix, parar=None):
+    # Sem miniaudio o playsound precisa de um arquivo: usa o diretório
+    # temporário do sistema, nunca a pasta de dados, com nome único por fala
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+
+    def apagar():
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    play_file(path, parar, depois=apagar)
+
+
+def play_bytes(data, suffix=".mp3", parar=None):
+    """Toca um áudio (MP3/WAV/FLAC/OGG) que está em memória e espera terminar,
+    ou até o Event parar ser sinalizado."""
+    if MINIAUDIO_AVAILABLE:
+        _play_miniaudio(data, parar)
+    else:
+        _play_arquivo(data, suffix, parar)
@@ -0,0 +1,72 @@
+# ruido.py
+# Estimativa contínua do ruído ambiente a partir do próprio fluxo do microfone,
+# sem janelas de calibração que bloqueiam a escuta. O piso de ruído é um
+# percentil baixo da energia dos últimos segundos (a fala é intermitente, então
+# os blocos mais silenciosos são ruído), e o limiar de fala acompanha o piso
+# com suavização. O histórico fica disponível para ver como o ambiente muda
+# ao longo do dia.
+import collections
+import threading
+import time
+
+from . import metricas
+
+JANELA = 8.0          # segundos de energia considerados
+PERCENTIL = 0.2       # os 20% blocos mais silenciosos definem o piso
+RAZAO = 2.0           # limiar = piso x RAZAO
+LIMIAR_MIN = 60       # abaixo disso qualquer estalo vira "fala"
+SUAVIZACAO = 0.15     # fração do caminho até o novo alvo a cada atualização
+ATUALIZAR_A_CADA = 4  # blocos
+AMOSTRAS_MIN = 8      # blocos antes da primeira estimativa (~0,5 s)
+HISTORICO_INTERVALO = 10.0  # segundos entre pontos do histórico
+HISTORICO_MAX = 8640        # 24 h com um ponto a cada 10 s
+
+
+class NoiseFloor:
+    """Piso de ruído e limiar de energia atualizados bloco a bloco.
+
+    on_change(limiar) é chamado a cada atualização do limiar. Com publish=False
+    os valores não vão para as métricas (ex.: uma estimativa por sessão no servidor).
+    """
+
+    def __init__(self, seconds_per_chunk, initial=300, on_change=None, publish=True):
+        self._energias = collections.deque(maxlen=max(int(JANELA / seconds_per_chunk), AMOSTRAS_MIN))
+        self._historico = collections.deque(maxlen=HISTORICO_MAX)
+        self._lock = threading.Lock()
+        self._n = 0
+        self._ultimo_ponto = 0.0
+        self.on_change = on_change
+        self.publish = publish
+        self.floor = None
+        self.threshold = initial
+
+    def update(self, energia):
+        """Registra a energia (RMS) de um bloco; chamado pela thread de captura."""
+        self._energias.append(energia)
+        self._n += 1
+        if self._n < AMOSTRAS_MIN or self._n % ATUALIZAR_A_CADA:
+            return
+        ordenadas = sorted(self._energias)
+        piso = ordenadas[int(PERCENTIL * (len(ordenadas) - 1))]
+        alvo = max(LIMIAR_MIN, piso * RAZAO)
+        with self._lock:
+            if self.floor is None:
+                limiar = alvo  # primeira estimativa: sem suavização
+            else:
+                limiar = self.threshold + SUAVIZACAO * (alvo - self.threshold)
+            self.floor = piso
+            self.threshold = limiar
+            agora = time.time()
+            if agora - self._ultimo_ponto >= HISTORICO_INTERVALO:
+                self._ultimo_ponto = agora
+                self._historico.append((agora, piso, limiar))
+        if self.publish:
+            metricas.gauge('ruido_ambiente', round(piso, 1))
+            metricas.gauge('limiar_energia', round(limiar, 1))
+        if self.on_change is not None:
+            self.on_change(limiar)
+
+    def historico(self):
+        """[(timestamp, piso, limiar)], um ponto a cada HISTORICO_INTERVALO segundos."""
+        with self._lock:
+            return list(self._historico)
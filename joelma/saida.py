@@ -0,0 +1,172 @@
+# saida.py
+# Saída de áudio do assistente: fila de falas com prioridade, síntese adiantada
+# num pool pequeno e reprodução interrompível numa thread. interrupt() descarta
+# tudo o que está na fila e corta a fala que está tocando (barge-in).
+# Textos longos são divididos em frases: o primeiro trecho começa a tocar assim
+# que fica pronto, enquanto os seguintes são sintetizados em paralelo.
+import concurrent.futures
+import itertools
+import queue
+import re
+import threading
+import time
+
+from . import metricas
+
+# Prioridades: número menor toca primeiro; dentro da mesma prioridade, por ordem de chegada
+URGENTE = 0   # respostas imediatas ("Sim?")
+NORMAL = 1
+BAIXA = 2     # leituras longas (agenda), que qualquer outra fala pode passar à frente
+
+TRECHO_MAX = 100  # caracteres; frases maiores são divididas nas vírgulas
+_RE_FRASE = re.compile(r'(?<=[.!?;])\s+')
+_RE_ORACAO = re.compile(r'(?<=[,:])\s+')
+
+
+def dividir(text, max_chars=TRECHO_MAX):
+    """Divide o texto em trechos para síntese: sempre no fim das frases e, nas
+    frases longas, também nas vírgulas (juntando pedaços até max_chars).
+    Números como 2.50 ou 1,5 não são quebrados: a divisão exige um espaço."""
+    trechos = []
+    for frase in _RE_FRASE.split(text.strip()):
+        if len(frase) <= max_chars:
+            if frase:
+                trechos.append(frase)
+            continue
+        atual = ""
+        for parte in _RE_ORACAO.split(frase):
+            if atual and len(atual) + 1 + len(parte) > max_chars:
+                trechos.append(atual)
+                atual = parte
+            else:
+                atual = f"{atual} {parte}" if atual else parte
+        if atual:
+            trechos.append(atual)
+    return trechos
+
+
+class Fala:
+    """Uma fala (ou pausa) na fila de saída."""
+
+    def __init__(self, text=None, pause=0.0, priority=NORMAL, turn=None, interruptible=True):
+        self.text = text
+        self.pause = pause
+        self.priority = priority
+        self.turn = turn
+        self.interruptible = interruptible
+        self.audio = None
+        self.geracao = 0
+        self.pedida = time.perf_counter()
+        self.primeira = True  # primeiro trecho de um texto: mede o tempo até o som
+        self.done = threading.Event()
+        self.parar = threading.Event()  # corta a reprodução desta fala
+
+    @property
+    def cancelled(self):
+        return self.parar.is_set() or (self.turn is not None and self.turn.cancelled)
+
+
+class SaidaAudio:
+    """Fila de saída de áudio.
+
+    synthesize(texto) -> áudio     gera o áudio de uma fala
+    play(áudio, parar)             reproduz e retorna cedo se o Event parar for sinalizado
+    """
+
+    def __init__(self, synthesize, play, max_ready=4, workers=3):
+        self._synthesize = synthesize
+        self._play = play
+        self._seq = itertools.count()
+        self._synth_q = queue.PriorityQueue()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sintese")
+        # Limita quantas falas ficam sintetizadas (ou em síntese) à frente da reprodução
+        self._play_q = queue.PriorityQueue(maxsize=max_ready)
+        self._idle = threading.Condition()
+        self._pending = 0
+        self._geracao = 0
+        self._tocando = None
+        for target, name in ((self._synth_loop, "sintese-fila"), (self._play_loop, "reproducao")):
+            threading.Thread(target=target, name=name, daemon=True).start()
+
+    def put(self, fala):
+        """Enfileira a fala; retorna o Event sinalizado quando ela termina (ou é descartada)."""
+        with self._idle:
+            self._pending += 1
+            fala.geracao = self._geracao
+        self._synth_q.put((fala.priority, next(self._seq), fala))
+        return fala.done
+
+    def _stale(self, fala):
+        return fala.cancelled or fala.geracao < self._geracao
+
+    def interrupt(self):
+        """Descarta as falas enfileiradas e corta a que está tocando.
+        Retorna True se havia algo tocando ou na fila."""
+        with self._idle:
+            ativo = self._pending > 0
+            self._geracao += 1
+            if self._tocando is not None:
+                self._tocando.parar.set()
+        return ativo
+
+    def playing(self):
+        """A fala que está tocando agora, ou None."""
+        return self._tocando
+
+    def busy(self):
+        with self._idle:
+            return self._pending > 0
+
+    def wait_idle(self, timeout=None):
+        """Bloqueia até todas as falas enfileiradas terminarem de tocar."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def _synth_loop(self):
+        # Dispara a síntese no pool e passa a fala adiante já na ordem certa;
+        # a reprodução espera o resultado de cada uma quando chegar a vez dela
+        while True:
+            _, seq, fala = self._synth_q.get()
+            if fala.text and not self._stale(fala):
+                fala.audio = self._pool.submit(self._synthesize, fala.text)
+            self._play_q.put((fala.priority, seq, fala))
+
+    def _audio(self, fala):
+        # Espera a síntese, mas desiste se a fala for cortada enquanto isso
+        while True:
+            try:
+                return fala.audio.result(timeout=0.05)
+            except concurrent.futures.TimeoutError:
+                if self._stale(fala):
+                    return None
+
+    def _play_loop(self):
+        while True:
+            _, _, fala = self._play_q.get()
+            with self._idle:
+                if self._stale(fala):
+                    fala.parar.set()
+                else:
+                    self._tocando = fala
+            try:
+                if not fala.parar.is_set():
+                    if fala.text:
+                        audio = self._audio(fala)
+                        if audio is not None and not fala.parar.is_set():
+                            if fala.primeira:
+                                metricas.observe('primeiro_audio', time.perf_counter() - fala.pedida)
+                            self._play(audio, fala.parar)
+                    elif fala.pause:
+                        fala.parar.wait(fala.pause)
+            except Exception as e:
+                print(f"Erro na síntese ou reprodução de fala: {e}")
+            finally:
+                self._finish(fala)
+
+    def _finish(self, fala):
+        with self._idle:
+            if self._tocando is fala:
+                self._tocando = None
+            self._pending -= 1
+            self._idle.notify_all()
+        fala.done.set()
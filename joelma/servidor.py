@@ -0,0 +1,472 @@
+# servidor.py
+# Modo servidor: um processo atende vários dispositivos ao mesmo tempo por um
+# socket TCP local. Cada conexão é uma sessão com o próprio estado de diálogo
+# (inclusive os fluxos de várias perguntas, como resolver_equacao e o
+# cadastro de evento); reconhecimento, cache de falas, agenda e calculadora
+# são compartilhados. Reconhecimento e síntese rodam em pools de threads, com
+# limites por sessão: um cliente lento ou apressado só atrasa a si mesmo.
+#
+#   python -m joelma.servidor [--host 127.0.0.1] [--porta 8765]
+#
+# Protocolo: quadros "tipo (1 byte) + tamanho (4 bytes, big-endian) + dados".
+#   cliente -> servidor
+#     H  JSON {"audio": true} pede o MP3 de cada resposta (padrão: só texto)
+#     A  áudio PCM 16 bits mono 16 kHz, em blocos de qualquer tamanho
+#     T  uma fala já transcrita (UTF-8), sem passar pelo reconhecimento
+#     W  o dispositivo detectou a palavra de ativação localmente
+#     Q  encerra a sessão
+#   servidor -> cliente
+#     R  JSON {"texto": ...} uma fala do assistente
+#     S  MP3 da fala anterior (só se pedido no H)
+#     F  JSON {"turno": n, "fim": bool} fim de uma interação; fim=true encerra
+#     L  JSON {"texto": ...} lembrete de um evento da agenda, a qualquer momento
+# Uma fala (A ou T) só é atendida se tiver a palavra de ativação ou vier depois
+# de um W; a resposta a uma pergunta do assistente ("Qual o valor de A?") não precisa.
+# Uma fala ignorada (sem a palavra de ativação) recebe só um F com "ignorada": true.
+# Se um comando falhar, o servidor manda um R com o aviso e um F com fim=true.
+import argparse
+import collections
+import concurrent.futures
+import itertools
+import json
+import queue
+import socket
+import socketserver
+import struct
+import threading
+
+from . import assistente, audio, config, metricas, pipeline, ruido, saida, vad, wakeword
+
+HOST = '127.0.0.1'
+PORTA = 8765
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+BLOCO = 1024                 # amostras por bloco do VAD
+MAX_FALAS_PENDENTES = 4      # falas recebidas esperando o diálogo (depois o socket para de ser lido)
+MAX_RESPOSTAS_PENDENTES = 8  # respostas esperando o cliente (depois o handler espera)
+MAX_STT_POR_SESSAO = 2       # reconhecimentos simultâneos de uma mesma sessão
+MAX_TTS_POR_SESSAO = 2       # sínteses simultâneas de uma mesma sessão
+
+_CABECALHO = struct.Struct('!cI')
+_ATIVACAO = object()  # marcador de W na fila de falas
+
+
+# --- QUADROS ---
+
+def _sem_atraso(sock):
+    # Quadros pequenos (texto, fim de turno) não esperam o algoritmo de Nagle
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+
+
+def enviar(sock, tipo, dados=b""):
+    sock.sendall(_CABECALHO.pack(tipo, len(dados)) + dados)
+
+
+def _ler(arquivo, n):
+    dados = arquivo.read(n)
+    if dados is None or len(dados) < n:
+        return None
+    return dados
+
+
+def receber(arquivo):
+    """Lê um quadro; retorna (tipo, dados) ou (None, None) se a conexão fechou."""
+    cabecalho = _ler(arquivo, _CABECALHO.size)
+    if cabecalho is None:
+        return None, None
+    tipo, n = _CABECALHO.unpack(cabecalho)
+    dados = _ler(arquivo, n) if n else b""
+    if dados is None:
+        return None, None
+    return tipo, dados
+
+
+class Segmentador:
+    """Recorta falas de um fluxo de áudio contínuo com o VAD, como o microfone local."""
+
+    def __init__(self, perfil, pre_roll=0.3):
+        self.spc = BLOCO / SAMPLE_RATE
+        self.ruido = ruido.NoiseFloor(self.spc, publish=False)
+        self.vad = vad.EnergyVAD(lambda: self.ruido.threshold, SAMPLE_WIDTH)
+        self.perfil = perfil  # função: o perfil da escuta em andamento
+        self._buf = bytearray()
+        self._antes = collections.deque(maxlen=max(int(pre_roll / self.spc), 1))
+        self._frames = []
+        self._fim = None
+
+    def push(self, dados):
+        """Recebe mais áudio; retorna a lista de falas completas (PCM)."""
+        falas = []
+        self._buf += dados
+        n = BLOCO * SAMPLE_WIDTH
+        while len(self._buf) >= n:
+            bloco = bytes(self._buf[:n])
+            del self._buf[:n]
+            self.ruido.update(vad.rms(bloco, SAMPLE_WIDTH))
+            fala = self.vad.is_speech(bloco)
+            if self._fim is None:
+                if fala:
+                    self._fim = vad.Endpointer(self.perfil(), self.spc)
+                    self._fim.push(True)
+                    self._frames = list(self._antes) + [bloco]
+                else:
+                    self._antes.append(bloco)
+                continue
+            self._frames.append(bloco)
+            if self._fim.push(fala):
+                falas.append(b"".join(self._frames))
+                self._fim = None
+                self._frames = []
+                self._antes.clear()
+        return falas
+
+
+class _Resposta:
+    __slots__ = ('tipo', 'dados', 'audio', 'done')
+
+    def __init__(self, tipo, dados, audio=None):
+        self.tipo = tipo
+        self.dados = dados
+        self.audio = audio  # Future com o MP3, se o cliente pediu áudio
+        self.done = threading.Event()
+
+
+class Sessao:
+    """Um cliente conectado. Oferece aos handlers a mesma interface do
+    Pipeline (say, pause, listen), ligada ao socket da sessão."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, servidor, sock):
+        self.id = next(self._ids)
+        self.servidor = servidor
+        self.sock = sock
+        _sem_atraso(sock)
+        self.audio = False
+        self.perfil = vad.perfil(None)
+        self.turnos = 0
+        self._falas = queue.Queue(maxsize=MAX_FALAS_PENDENTES)
+        self._respostas = queue.Queue(maxsize=MAX_RESPOSTAS_PENDENTES)
+        self._stt = threading.BoundedSemaphore(MAX_STT_POR_SESSAO)
+        self._tts = threading.BoundedSemaphore(MAX_TTS_POR_SESSAO)
+        self._fechada = threading.Event()
+        self._segmentador = Segmentador(lambda: self.perfil)
+
+    # --- interface usada pelos handlers ---
+
+    def _check(self):
+        if self._fechada.is_set():
+            raise pipeline.Cancelled()
+
+    def _responder(self, item):
+        # Fila limitada: se o cliente não consome, o handler espera aqui
+        while True:
+            self._check()
+            try:
+                self._respostas.put(item, timeout=0.1)
+                return item.done
+            except queue.Full:
+                continue
+
+    def say(self, text, wait=False, priority=saida.NORMAL, interruptible=True):
+        item = _Resposta(b'R', {"texto": text})
+        if self.audio and text:
+            item.audio = self._submeter(self.servidor.tts_pool, self._tts, audio.sintetizar_bytes, text)
+        done = self._responder(item)
+        if wait:
+            while not done.wait(0.1):
+                self._check()
+        return done
+
+    def pause(self, seconds, wait=False, priority=saida.NORMAL):
+        # O ritmo da reprodução é do cliente
+        done = threading.Event()
+        done.set()
+        return done
+
+    def listen(self, perfil=None):
+        self.perfil = vad.perfil(perfil)
+        limite = self.perfil.timeout + self.perfil.max_fala
+        while True:
+            self._check()
+            try:
+                item = self._falas.get(timeout=limite)
+            except queue.Empty:
+                return ""
+            if item is None:
+                raise pipeline.Cancelled()
+            if item is _ATIVACAO:
+                continue
+            return item.result()
+
+    def avisar(self, texto):
+        """Lembrete fora do diálogo (thread do agendador): não espera o cliente;
+        com a fila de respostas cheia, o lembrete desta sessão se perde."""
+        try:
+            self._respostas.put_nowait(_Resposta(b'L', {"texto": texto}))
+        except queue.Full:
+            print(f"Sessão {self.id}: lembrete descartado (cliente não está lendo).")
+
+    # --- internos ---
+
+    def _submeter(self, pool, limite, fn, *args):
+        limite.acquire()  # limite por sessão: o pool compartilhado não fica tomado por um cliente
+        try:
+            futuro = pool.submit(fn, *args)
+        except BaseException:
+            limite.release()
+            raise
+        futuro.add_done_callback(lambda _: limite.release())
+        return futuro
+
+    def _nova_fala(self, item):
+        while not self._fechada.is_set():
+            try:
+                self._falas.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _texto(self, texto):
+        futuro = concurrent.futures.Future()
+        futuro.set_result(texto.strip().lower())
+        return futuro
+
+    def _reconhecer(self, pcm):
+        return self._submeter(self.servidor.stt_pool, self._stt, audio.reconhecer,
+                              audio.audio_data(pcm, SAMPLE_RATE, SAMPLE_WIDTH))
+
+    def _dialogo(self):
+        # Thread da sessão: os handlers rodam aqui, com speak/listen apontando para ela
+        assistente.sessao_atual.set(self)
+        try:
+            while not self._fechada.is_set():
+                item = self._falas.get()
+                if item is None:
+                    break
+                if item is _ATIVACAO:
+                    comando = ""
+                else:
+                    comando = wakeword.strip_wake_word(item.result())
+                    if comando is None:
+                        # Conversa sem a palavra de ativação: o cliente ainda espera o fim do turno
+                        self._responder(_Resposta(b'F', {"turno": self.turnos, "fim": False, "ignorada": True}))
+                        continue
+                self.turnos += 1
+                if not comando:
+                    self.say("Sim?", priority=saida.URGENTE)
+                    comando = self.listen('comando')
+                keep = assistente.despachar(comando)
+                self._responder(_Resposta(b'F', {"turno": self.turnos, "fim": keep is False}))
+                if keep is False:
+                    break
+        except pipeline.Cancelled:
+            pass
+        except Exception as e:
+            print(f"Sessão {self.id}: erro no diálogo: {e}")
+            # Como no modo local: avisa e encerra (o envio do F com fim fecha a sessão)
+            try:
+                self._responder(_Resposta(b'R', {"texto": "Ocorreu um erro, a sessão será encerrada."}))
+                self._responder(_Resposta(b'F', {"turno": self.turnos, "fim": True}))
+            except pipeline.Cancelled:
+                pass
+        finally:
+            self._respostas.put(None)
+
+    def _saida(self):
+        while True:
+            item = self._respostas.get()
+            if item is None:
+                break
+            try:
+                if not self._fechada.is_set():
+                    enviar(self.sock, item.tipo, json.dumps(item.dados, ensure_ascii=False).encode('utf-8'))
+                    if item.audio is not None:
+                        enviar(self.sock, b'S', item.audio.result())
+                    if item.tipo == b'F' and item.dados["fim"]:
+                        self.fechar()
+            except Exception as e:
+                if not self._fechada.is_set():
+                    print(f"Sessão {self.id}: erro ao enviar: {e}")
+                self.fechar()
+            finally:
+                item.done.set()
+
+    def fechar(self):
+        if not self._fechada.is_set():
+            self._fechada.set()
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def run(self):
+        """Lê os quadros do cliente até a conexão fechar."""
+        dialogo = threading.Thread(target=self._dialogo, name=f"sessao-{self.id}", daemon=True)
+        envio = threading.Thread(target=self._saida, name=f"sessao-{self.id}-envio", daemon=True)
+        dialogo.start()
+        envio.start()
+        arquivo = self.sock.makefile('rb')
+        try:
+            while not self._fechada.is_set():
+                try:
+                    tipo, dados = receber(arquivo)
+                except OSError:
+                    break
+                if tipo is None or tipo == b'Q':
+                    break
+                if tipo == b'H':
+                    self.audio = bool(json.loads(dados or b"{}").get("audio"))
+                elif tipo == b'T':
+                    self._nova_fala(self._texto(dados.decode('utf-8')))
+                elif tipo == b'W':
+                    self._nova_fala(_ATIVACAO)
+                elif tipo == b'A':
+                    for pcm in self._segmentador.push(dados):
+                        self._nova_fala(self._reconhecer(pcm))
+        finally:
+            self.fechar()
+            # Destrava o diálogo, que pode estar esperando uma fala
+            try:
+                self._falas.put_nowait(None)
+            except queue.Full:
+                pass
+            dialogo.join()
+            envio.join()
+            arquivo.close()
+
+
+class _Conexao(socketserver.BaseRequestHandler):
+    def handle(self):
+        sessao = Sessao(self.server, self.request)
+        self.server._abrir(sessao)
+        try:
+            sessao.run()
+        finally:
+            self.server._fechar(sessao)
+
+
+class Servidor(socketserver.ThreadingTCPServer):
+    """Servidor de sessões; os pools de reconhecimento e síntese são compartilhados."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, endereco=(HOST, PORTA), stt_workers=4, tts_workers=4):
+        super().__init__(endereco, _Conexao)
+        self.stt_pool = concurrent.futures.ThreadPoolExecutor(stt_workers, thread_name_prefix="stt-servidor")
+        self.tts_pool = concurrent.futures.ThreadPoolExecutor(tts_workers, thread_name_prefix="tts-servidor")
+        self.sessoes = {}
+        self._lock = threading.Lock()
+
+    def _abrir(self, sessao):
+        with self._lock:
+            self.sessoes[sessao.id] = sessao
+        metricas.incr('sessoes_abertas')
+        metricas.gauge('sessoes_ativas', len(self.sessoes))
+
+    def _fechar(self, sessao):
+        with self._lock:
+            self.sessoes.pop(sessao.id, None)
+        metricas.gauge('sessoes_ativas', len(self.sessoes))
+
+    def avisar(self, texto):
+        """Entrega um lembrete a todas as sessões abertas."""
+        with self._lock:
+            sessoes = list(self.sessoes.values())
+        for sessao in sessoes:
+            sessao.avisar(texto)
+
+    def server_close(self):
+        super().server_close()
+        with self._lock:
+            sessoes = list(self.sessoes.values())
+        for sessao in sessoes:
+            sessao.fechar()
+        self.stt_pool.shutdown(wait=False)
+        self.tts_pool.shutdown(wait=False)
+
+
+class Cliente:
+    """Cliente simples do protocolo, para testes e dispositivos de exemplo."""
+
+    def __init__(self, host=HOST, porta=PORTA, audio=False, timeout=30):
+        self.sock = socket.create_connection((host, porta), timeout=timeout)
+        _sem_atraso(self.sock)
+        self._arquivo = self.sock.makefile('rb')
+        self.lembretes = []  # quadros L recebidos
+        if audio:
+            enviar(self.sock, b'H', json.dumps({"audio": True}).encode('utf-8'))
+
+    def falar(self, texto):
+        enviar(self.sock, b'T', texto.encode('utf-8'))
+
+    def enviar_audio(self, pcm):
+        enviar(self.sock, b'A', pcm)
+
+    def ativar(self):
+        enviar(self.sock, b'W')
+
+    def respostas(self):
+        """Lê até o fim da interação; retorna (falas, mp3s, fim)."""
+        falas, mp3s = [], []
+        while True:
+            tipo, dados = receber(self._arquivo)
+            if tipo is None:
+                return falas, mp3s, True
+            if tipo == b'R':
+                falas.append(json.loads(dados)["texto"])
+            elif tipo == b'S':
+                mp3s.append(dados)
+            elif tipo == b'L':
+                self.lembretes.append(json.loads(dados)["texto"])
+            elif tipo == b'F':
+                return falas, mp3s, json.loads(dados)["fim"]
+
+    def turno(self, *falas):
+        """Envia as falas de uma interação (comando e respostas) e lê as respostas."""
+        for texto in falas:
+            self.falar(texto)
+        return self.respostas()
+
+    def fechar(self):
+        try:
+            enviar(self.sock, b'Q')
+        except OSError:
+            pass
+        self._arquivo.close()
+        self.sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Assistente em modo servidor (várias sessões).")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--porta', type=int, default=PORTA)
+    parser.add_argument('--stt-workers', type=int, default=4)
+    parser.add_argument('--tts-workers', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    config.ensure_data_dir()
+    if config.METRICAS_PORTA:
+        metricas.serve(int(config.METRICAS_PORTA))
+    audio.iniciar_avaliacao()
+    servidor = Servidor((args.host, args.porta), args.stt_workers, args.tts_workers)
+    lembretes = assistente.iniciar_lembretes(avisar=servidor.avisar) if config.LEMBRETES else None
+    print(f"Servidor ouvindo em {args.host}:{args.porta}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if lembretes is not None:
+            lembretes.parar()
+        servidor.server_close()
+        audio.fechar()
+        metricas.dump(config.METRICAS_FILE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# sintese.py
+# Backends de síntese de fala atrás de uma interface comum: gTTS (online, MP3),
+# pyttsx3 (local, WAV) e espeak-ng (local, WAV). Na partida cada backend
+# disponível sintetiza uma frase curta; o mais rápido que respondeu passa a ser
+# usado, e a medição é repetida de tempos em tempos em segundo plano, porque o
+# melhor backend muda de máquina para máquina (e com a rede). Cada backend tem
+# um orçamento de latência: quem passa dele conta como falha, e a fala vai
+# para o próximo.
+import concurrent.futures
+import importlib.util
+import io
+import shutil
+import subprocess
+import threading
+import time
+
+from . import metricas, offline_tts
+
+GTTS_AVAILABLE = importlib.util.find_spec('gtts') is not None
+
+SONDA = "Teste de voz."  # frase da medição
+RODADAS = 2              # vale a mais rápida: a primeira paga conexão e carga do motor
+GTTS_ORCAMENTO = 5.0     # segundos por trecho (até saida.TRECHO_MAX caracteres)
+LOCAL_ORCAMENTO = 3.0    # pyttsx3 e espeak
+MAX_CHAMADAS = 2         # sínteses simultâneas por backend (chamadas presas não se acumulam)
+
+
+class Backend:
+    """Interface de um backend: synthesize(texto) retorna os bytes do áudio,
+    no formato indicado por suffix, e levanta exceção em caso de erro."""
+
+    name = None
+    suffix = ".wav"
+    budget = LOCAL_ORCAMENTO
+
+    def available(self):
+        return True
+
+    def synthesize(self, text):
+        raise NotImplementedError
+
+
+class GttsBackend(Backend):
+    name = 'gtts'
+    suffix = ".mp3"
+
+    def __init__(self, language='pt', budget=GTTS_ORCAMENTO):
+        self.language = language
+        self.budget = budget
+
+    def available(self):
+        return GTTS_AVAILABLE
+
+    def synthesize(self, text):
+        from gtts import gTTS
+        buf = io.BytesIO()
+        gTTS(text=text, lang=self.language).write_to_fp(buf)
+        return buf.getvalue()
+
+
+class Pyttsx3Backend(Backend):
+    """Fala local pelo motor pyttsx3 compartilhado; falante() devolve o
+    OfflineSpeaker, criado só no primeiro uso."""
+
+    name = 'pyttsx3'
+
+    def __init__(self, falante, budget=LOCAL_ORCAMENTO):
+        self.falante = falante
+        self.budget = budget
+
+    def available(self):
+        return offline_tts.PYTTSX3_AVAILABLE
+
+    def synthesize(self, text):
+        return self.falante().synthesize(text, timeout=self.budget)
+
+
+class EspeakBackend(Backend):
+    name = 'espeak'
+
+    def __init__(self, voice='pt-br', rate=160, budget=LOCAL_ORCAMENTO):
+        self.voice = voice
+        self.rate = rate
+        self.budget = budget
+        self.executavel = shutil.which('espeak-ng') or shutil.which('espeak')
+
+    def available(self):
+        return self.executavel is not None
+
+    def synthesize(self, text):
+        cmd = [self.executavel, '-v', self.voice, '-s', str(self.rate), '--stdout', text]
+        return subprocess.run(cmd, capture_output=True, check=True, timeout=self.budget).stdout
+
+
+class Seletor:
+    """Escolhe o backend de síntese pela latência medida.
+
+    Com auto=False a ordem dada é mantida (o primeiro é o preferido) e as
+    medições só são informativas. Antes da primeira medição vale a ordem dada.
+    """
+
+    def __init__(self, backends, auto=True):
+        self.backends = [b for b in backends if b.available()]
+        if not self.backends:
+            raise RuntimeError("Nenhum backend de síntese disponível.")
+        self.auto = auto
+        self._lock = threading.Lock()
+        self._latencias = {}  # nome -> segundos na última medição (None = falhou)
+        self._erros = {}      # nome -> mensagem da última falha
+        self._ativo = self.backends[0]
+        self._avaliado_em = None
+        self._chamadas = {b.name: threading.BoundedSemaphore(MAX_CHAMADAS) for b in self.backends}
+
+    @property
+    def ativo(self):
+        with self._lock:
+            return self._ativo
+
+    def sintetizar(self, backend, text, medir=False):
+        """backend.synthesize(text) dentro do orçamento do backend. Se passar
+        dele, levanta TimeoutError; a chamada lenta segue numa thread daemon
+        e o resultado é descartado. Com medir=True retorna (áudio, segundos),
+        contados só depois de conseguir uma vaga: a espera por outras
+        sínteses (o aquecimento, por exemplo) não é latência do backend."""
+        limite = self._chamadas[backend.name]
+        prazo = time.monotonic() + backend.budget
+        if not limite.acquire(timeout=backend.budget):
+            metricas.incr(f"tts_{backend.name}_lento")
+            raise TimeoutError(f"{backend.name}: {MAX_CHAMADAS} sínteses presas")
+        t0 = time.perf_counter()
+        futuro = concurrent.futures.Future()
+
+        def rodar():
+            try:
+                futuro.set_result(backend.synthesize(text))
+            except BaseException as e:
+                futuro.set_exception(e)
+            finally:
+                limite.release()
+        threading.Thread(target=rodar, name=f"tts-{backend.name}", daemon=True).start()
+        try:
+            data = futuro.result(timeout=max(0.0, prazo - time.monotonic()))
+        except concurrent.futures.TimeoutError:
+            metricas.incr(f"tts_{backend.name}_lento")
+            raise TimeoutError(f"{backend.name} passou de {backend.budget:.1f}s")
+        return (data, time.perf_counter() - t0) if medir else data
+
+    def _medir(self, backend, texto, rodadas):
+        melhor = None
+        for _ in range(rodadas):
+            data, dt = self.sintetizar(backend, texto, medir=True)
+            if not data:
+                raise RuntimeError("áudio vazio")
+            melhor = dt if melhor is None else min(melhor, dt)
+        return melhor
+
+    def avaliar(self, texto=SONDA, rodadas=RODADAS):
+        """Mede todos os backends (sem cache) e escolhe o ativo; retorna estado()."""
+        medidas, erros = {}, {}
+        for backend in self.backends:
+            try:
+                medidas[backend.name] = self._medir(backend, texto, rodadas)
+            except Exception as e:
+                medidas[backend.name] = None
+                erros[backend.name] = str(e) or type(e).__name__
+                metricas.incr(f"tts_{backend.name}_erro")
+        saudaveis = [b for b in self.backends if medidas[b.name] is not None]
+        with self._lock:
+            self._latencias, self._erros = medidas, erros
+            self._avaliado_em = time.time()
+            anterior = self._ativo
+            if saudaveis:
+                self._ativo = min(saudaveis, key=lambda b: medidas[b.name]) if self.auto else saudaveis[0]
+            ativo = self._ativo
+        for backend in self.backends:
+            if medidas[backend.name] is not None:
+                metricas.gauge(f"tts_{backend.name}_latencia", round(medidas[backend.name], 4))
+            metricas.gauge(f"tts_{backend.name}_ativo", int(backend is ativo))
+        if ativo is not anterior:
+            metricas.incr('tts_troca')
+            print(f"Síntese: usando {ativo.name}.")
+        return self.estado()
+
+    def ordem(self):
+        """O ativo primeiro; os outros como reserva, os que responderam antes."""
+        with self._lock:
+            ativo, latencias = self._ativo, dict(self._latencias)
+        resto = [b for b in self.backends if b is not ativo]
+        resto.sort(key=lambda b: latencias.get(b.name) is None)
+        return [ativo] + resto
+
+    def estado(self):
+        """{'ativo', 'auto', 'latencias': {nome: s}, 'erros': {nome: msg}, 'avaliado_em'}"""
+        with self._lock:
+            return {
+                'ativo': self._ativo.name,
+                'auto': self.auto,
+                'latencias': dict(self._latencias),
+                'erros': dict(self._erros),
+                'avaliado_em': self._avaliado_em,
+            }
@@ -0,0 +1,294 @@
+# tts_cache.py
+# Cache em disco das falas sintetizadas, indexado por (texto, idioma, backend).
+# As frases fixas do assistente ("Sim?", "Evento cadastrado." ...) passam a
+# tocar direto do disco, sem nova ida ao serviço de síntese. As mais usadas
+# ficam também em memória, para tocar sem nenhuma leitura de arquivo.
+# Falas novas sintetizadas em memória são gravadas no disco por uma thread
+# própria: a síntese não espera a pasta de dados (que pode ser lenta).
+import concurrent.futures
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_DIR = os.path.join('data', 'tts_cache')
+MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+MEMORY_BYTES = 8 * 1024 * 1024  # 8 MB de falas mantidas em memória
+TMP_ORFAO = 10 * 60  # segundos: um .tmp mais velho que isso sobrou de um processo que morreu
+
+
+class TTSCache:
+    """Cache LRU de arquivos de áudio com limite de tamanho em bytes."""
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES, suffix=".mp3", memory_bytes=MEMORY_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # chave -> tamanho; o primeiro é o menos usado
+        self._total = 0
+        self._memory = OrderedDict()  # chave -> bytes do áudio, também em LRU
+        self._memory_total = 0
+        self._inflight = {}  # chave -> Future da síntese em andamento
+        self._pendentes = {}  # chave -> bytes ainda não gravados no disco
+        self._pendentes_total = 0
+        self._gravacoes = queue.Queue()
+        self._gravador = None
+        self._limpezas = 0  # clear() feitos; uma gravação que pegou um clear no meio é desfeita
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self):
+        # Reconstrói a ordem LRU a partir do mtime (atualizado a cada acerto)
+        # e apaga os temporários de gravações interrompidas; os recentes podem
+        # ser de outro cache gravando agora na mesma pasta
+        files = []
+        agora = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith((self.suffix, ".tmp")):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+                if name.endswith(".tmp"):
+                    if agora - st.st_mtime > TMP_ORFAO:
+                        os.remove(path)
+                    continue
+            except OSError:
+                continue
+            files.append((st.st_mtime, name[:-len(self.suffix)], st.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total += size
+        self._evict()
+
+    @staticmethod
+    def key(text, lang, backend):
+        raw = f"{backend}\0{lang}\0{text}".encode('utf-8')
+        return hashlib.sha256(raw).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, text, lang, backend):
+        """Retorna o caminho do áudio em cache, ou None."""
+        key = self.key(text, lang, backend)
+        path = self.path_for(key)
+        with self._lock:
+            if key in self._entries and os.path.exists(path):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+            if key in self._entries:
+                # Arquivo apagado por fora do cache
+                self._total -= self._entries.pop(key)
+            self.misses += 1
+            return None
+
+    def put(self, text, lang, backend, synthesize):
+        """Gera o áudio com synthesize(caminho) e guarda no cache."""
+        return self._put_key(self.key(text, lang, backend), synthesize)
+
+    def _put_key(self, key, synthesize):
+        path = self.path_for(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            synthesize(tmp)
+            os.replace(tmp, path)  # troca atômica: nunca fica um arquivo pela metade
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        size = os.path.getsize(path)
+        with self._lock:
+            self._total -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total += size
+            self._evict(keep=key)
+        return path
+
+    def _single_flight(self, key, fn):
+        # Só uma síntese por chave de cada vez: quem chega enquanto ela está em
+        # andamento espera o mesmo resultado em vez de sintetizar de novo
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = concurrent.futures.Future()
+        if not owner:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def get_or_create(self, text, lang, backend, synthesize):
+        def create():
+            path = self.get(text, lang, backend)
+            if path is None:
+                path = self.put(text, lang, backend, synthesize)
+            return path
+        return self._single_flight(('path', self.key(text, lang, backend)), create)
+
+    # --- Acesso em memória: o áudio volta como bytes, sem caminho de arquivo ---
+
+    def _remember(self, key, data):
+        # Chamado com self._lock adquirido
+        self._memory_total -= len(self._memory.pop(key, b""))
+        if len(data) > self.memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_total += len(data)
+        while self._memory_total > self.memory_bytes:
+            _, old = self._memory.popitem(last=False)
+            self._memory_total -= len(old)
+
+    def get_bytes(self, text, lang, backend):
+        """Retorna o áudio em cache como bytes, ou None."""
+        key = self.key(text, lang, backend)
+        with self._lock:
+            data = self._memory.get(key) or self._pendentes.get(key)
+            no_disco = key in self._entries
+            if data is not None:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                if no_disco:
+                    self._entries.move_to_end(key)
+                self.hits += 1
+        if data is not None:
+            if no_disco:
+                # O mtime é a ordem LRU do disco na próxima abertura: as falas
+                # mais tocadas (sempre da memória) não podem parecer as mais velhas
+                try:
+                    os.utime(self.path_for(key))
+                except OSError:
+                    pass
+            return data
+        path = self.get(text, lang, backend)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            self._remember(key, data)
+        return data
+
+    def put_bytes(self, text, lang, backend, data):
+        """Guarda o áudio em memória e agenda a gravação no disco, que a
+        thread gravadora faz depois (troca atômica). Se o disco estiver tão
+        lento que as pendentes passem de memory_bytes, a fala fica só em memória."""
+        key = self.key(text, lang, backend)
+        with self._lock:
+            self._remember(key, data)
+            if key in self._pendentes or self._pendentes_total + len(data) > self.memory_bytes:
+                return data
+            self._pendentes[key] = data
+            self._pendentes_total += len(data)
+            if self._gravador is None:
+                self._gravador = threading.Thread(target=self._gravar_pendentes, name="tts-cache-gravador",
+                                                  daemon=True)
+                self._gravador.start()
+        self._gravacoes.put(key)
+        return data
+
+    def _gravar_pendentes(self):
+        while True:
+            key = self._gravacoes.get()
+            data = None
+            try:
+                with self._lock:
+                    data = self._pendentes.get(key)
+                    limpezas = self._limpezas
+
+                def gravar(tmp):
+                    with open(tmp, 'wb') as f:
+                        f.write(data)
+                if data is not None:
+                    path = self._put_key(key, gravar)
+                    with self._lock:
+                        if self._limpezas != limpezas and key not in self._pendentes:
+                            self._total -= self._entries.pop(key, 0)
+                            os.remove(path)
+            except OSError as e:
+                print(f"Cache de falas: não foi possível gravar no disco: {e}")
+            finally:
+                with self._lock:
+                    # Depois de um clear() a chave pode já ser outra pendente, com gravação própria
+                    if data is not None and self._pendentes.get(key) is data:
+                        self._pendentes_total -= len(self._pendentes.pop(key))
+                self._gravacoes.task_done()
+
+    def flush(self):
+        """Espera as falas pendentes serem gravadas no disco."""
+        self._gravacoes.join()
+
+    def get_or_create_bytes(self, text, lang, backend, synthesize):
+        """Como get_or_create, mas synthesize() devolve os bytes do áudio."""
+        def create():
+            data = self.get_bytes(text, lang, backend)
+            if data is None:
+                data = self.put_bytes(text, lang, backend, synthesize())
+            return data
+        return self._single_flight(('bytes', self.key(text, lang, backend)), create)
+
+    def _evict(self, keep=None):
+        while self._total > self.max_bytes and self._entries:
+            key, size = next(iter(self._entries.items()))
+            if key == keep:
+                break
+            del self._entries[key]
+            self._total -= size
+            self._memory_total -= len(self._memory.pop(key, b""))
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._total,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_total,
+                'pendentes': len(self._pendentes),
+            }
+
+    def clear(self):
+        with self._lock:
+            # As pendentes saem junto: não são mais servidas nem gravadas
+            self._limpezas += 1
+            self._pendentes.clear()
+            self._pendentes_total = 0
+            for key in self._entries:
+                try:
+                    os.remove(self.path_for(key))
+                except OSError:
+                    pass
+            self._entries.clear()
+            self._total = 0
+            self._memory.clear()
+            self._memory_total = 0
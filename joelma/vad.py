@@ -0,0 +1,120 @@
+# vad.py
+# Detecção de voz (VAD) e fim de fala. Cada bloco do microfone é classificado
+# como fala ou silêncio (webrtcvad se instalado, senão energia) e o Endpointer
+# fecha a fala assim que o silêncio final passa do necessário. O silêncio
+# exigido se adapta às pausas que a própria pessoa fez durante a fala.
+# Os limites de cada tipo de escuta ficam em perfis (PERFIS), por intenção.
+import array
+import collections
+import importlib.util
+import math
+
+try:
+    import audioop
+except ImportError:  # removido no Python 3.13
+    audioop = None
+
+WEBRTCVAD_AVAILABLE = importlib.util.find_spec('webrtcvad') is not None
+
+FATOR_PAUSA = 1.5  # silêncio final exigido = 1,5x a maior pausa interna da fala
+
+
+def rms(chunk, sample_width=2):
+    if audioop is not None:
+        return audioop.rms(chunk, sample_width)
+    samples = array.array('h', chunk)
+    if not samples:
+        return 0
+    return int(math.sqrt(sum(s * s for s in samples) / len(samples)))
+
+
+Perfil = collections.namedtuple('Perfil', 'nome timeout min_silencio max_silencio max_fala')
+Perfil.__doc__ = """Limites de uma escuta, em segundos: espera pelo início da fala (timeout),
+silêncio final mínimo e máximo para encerrar, e duração máxima da fala."""
+
+PERFIS = {
+    # nome             timeout  silêncio mín/máx   fala máx
+    'ativacao':     Perfil('ativacao', 10, 0.30, 0.60, 4),
+    'comando':      Perfil('comando', 5, 0.35, 0.80, 8),
+    'numero':       Perfil('numero', 6, 0.30, 0.70, 5),
+    'expressao':    Perfil('expressao', 6, 0.45, 1.00, 12),
+    'coeficientes': Perfil('coeficientes', 6, 0.50, 1.20, 15),  # vários números numa fala
+    'evento':       Perfil('evento', 8, 0.60, 1.40, 30),
+}
+PADRAO = 'comando'
+
+
+def perfil(p=None):
+    """Aceita um Perfil, o nome de um perfil ou None (perfil padrão)."""
+    if isinstance(p, Perfil):
+        return p
+    return PERFIS[p or PADRAO]
+
+
+class EnergyVAD:
+    """Fala = energia do bloco acima do limiar atual do reconhecedor."""
+
+    def __init__(self, threshold, sample_width=2):
+        self.threshold = threshold  # função: o limiar muda com o ruído ambiente
+        self.sample_width = sample_width
+
+    def is_speech(self, chunk):
+        return rms(chunk, self.sample_width) > self.threshold()
+
+
+class WebRtcVAD(EnergyVAD):
+    """webrtcvad em quadros de 20 ms; o bloco é fala se a maioria dos quadros
+    for fala e a energia passar do limiar (o webrtcvad sozinho confunde ruído
+    constante com voz)."""
+
+    FRAME_MS = 20
+
+    def __init__(self, threshold, sample_rate=16000, sample_width=2, aggressiveness=2):
+        super().__init__(threshold, sample_width)
+        import webrtcvad
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self.sample_rate = sample_rate
+        self._frame_bytes = sample_rate * self.FRAME_MS // 1000 * sample_width
+
+    def is_speech(self, chunk):
+        if not super().is_speech(chunk):
+            return False
+        n = self._frame_bytes
+        frames = [chunk[i:i + n] for i in range(0, len(chunk) - n + 1, n)]
+        if not frames:
+            return True
+        voz = sum(self._vad.is_speech(f, self.sample_rate) for f in frames)
+        return voz * 2 >= len(frames)
+
+
+def criar(threshold, sample_rate=16000, sample_width=2):
+    if WEBRTCVAD_AVAILABLE and sample_rate in (8000, 16000, 32000, 48000) and sample_width == 2:
+        return WebRtcVAD(threshold, sample_rate, sample_width)
+    return EnergyVAD(threshold, sample_width)
+
+
+class Endpointer:
+    """Recebe, bloco a bloco, se houve fala; push() retorna True quando a fala acabou."""
+
+    def __init__(self, perfil, seconds_per_chunk):
+        self.perfil = perfil
+        self.spc = seconds_per_chunk
+        self.duracao = 0.0       # desde o início da fala
+        self.silencio = 0.0      # silêncio corrente
+        self.maior_pausa = 0.0   # maior pausa interna já vista
+
+    def necessario(self):
+        """Silêncio final exigido agora."""
+        p = self.perfil
+        return min(max(p.min_silencio, FATOR_PAUSA * self.maior_pausa), p.max_silencio)
+
+    def push(self, fala):
+        self.duracao += self.spc
+        if fala:
+            self.maior_pausa = max(self.maior_pausa, self.silencio)
+            self.silencio = 0.0
+        else:
+            self.silencio += self.spc
+            if self.silencio >= self.necessario():
+                return True
+        return self.duracao >= self.perfil.max_fala
@@ -0,0 +1,160 @@
+# wakeword.py
+# Detecção local (offline) da palavra de ativação "ok sexta-feira".
+# Usa o Vosk com uma gramática mínima, processando o áudio do microfone em
+# blocos contínuos; só depois do disparo o áudio vai para o reconhecimento completo.
+#
+# Avaliação num conjunto gravado:
+#   python -m joelma.wakeword data/wakeword_teste
+# onde o diretório tem as subpastas positivos/ e negativos/ com arquivos WAV
+# (mono, 16 bits).
+import glob
+import importlib.util
+import json
+import os
+import sys
+import threading
+import wave
+
+from . import config
+
+# O vosk só é importado quando um modelo é carregado
+VOSK_AVAILABLE = importlib.util.find_spec('vosk') is not None
+
+WAKE_PHRASES = ["ok sexta-feira", "ok sexta feira", "sexta-feira", "sexta feira"]
+SAMPLE_RATE = 16000
+
+_modelos = {}
+_modelos_lock = threading.Lock()  # servidor e pipeline podem pedir o modelo ao mesmo tempo
+
+
+def model_dir(model_path=None):
+    """O caminho dado ou o de config.VOSK_MODEL, lido na hora (set_data_dir vale)."""
+    return model_path or config.VOSK_MODEL
+
+
+def load_model(model_path=None):
+    # O modelo é grande: carrega uma vez por caminho e reaproveita
+    model_path = model_dir(model_path)
+    with _modelos_lock:
+        if model_path not in _modelos:
+            if not VOSK_AVAILABLE:
+                raise RuntimeError("Biblioteca vosk não encontrada.")
+            if not os.path.isdir(model_path):
+                raise RuntimeError(f"Modelo Vosk não encontrado em {model_path}.")
+            import vosk
+            vosk.SetLogLevel(-1)
+            _modelos[model_path] = vosk.Model(model_path)
+        return _modelos[model_path]
+
+
+def is_available(model_path=None):
+    return VOSK_AVAILABLE and os.path.isdir(model_dir(model_path))
+
+
+def contains_wake_word(text):
+    text = text.lower().replace('-', ' ')
+    return any(w.replace('-', ' ') in text for w in WAKE_PHRASES)
+
+
+def strip_wake_word(text):
+    """Retorna o que vem depois da palavra de ativação ("" se nada), ou None
+    se ela não aparece. "ok sexta-feira que horas são" -> "que horas são"."""
+    norm = text.lower().replace('-', ' ')
+    achados = [(norm.find(w.replace('-', ' ')), len(w)) for w in WAKE_PHRASES]
+    achados = [(i, n) for i, n in achados if i >= 0]
+    if not achados:
+        return None
+    # A ocorrência mais cedo e, empatando, a frase mais longa ("ok sexta feira")
+    i, n = min(achados, key=lambda a: (a[0], -a[1]))
+    return text[i + n:].strip(" ,.!?")
+
+
+class WakeWordDetector:
+    """Spotter de palavra de ativação sobre um fluxo de áudio PCM 16 bits."""
+
+    def __init__(self, model_path=None, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        # Gramática restrita: o decodificador só escolhe entre a frase e "[unk]",
+        # o que é bem mais rápido e mais preciso que o vocabulário completo
+        import vosk
+        grammar = sorted({w.replace('-', ' ') for w in WAKE_PHRASES}) + ["[unk]"]
+        self._rec = vosk.KaldiRecognizer(load_model(model_path), sample_rate, json.dumps(grammar))
+
+    def accept(self, chunk):
+        """Processa um bloco de áudio; retorna True quando a frase é detectada."""
+        if self._rec.AcceptWaveform(chunk):
+            text = json.loads(self._rec.Result()).get('text', '')
+        else:
+            text = json.loads(self._rec.PartialResult()).get('partial', '')
+        if text and contains_wake_word(text):
+            self.reset()
+            return True
+        return False
+
+    def reset(self):
+        self._rec.Reset()
+
+    def wait(self, read_chunk, stop=None):
+        """Lê blocos com read_chunk() até detectar a frase (ou stop ser sinalizado)."""
+        self.reset()
+        while stop is None or not stop.is_set():
+            chunk = read_chunk()
+            if chunk is None:  # fluxo encerrado
+                return False
+            if self.accept(chunk):
+                return True
+        return False
+
+
+# --- AVALIAÇÃO ---
+
+def _detect_in_file(path, model_path, chunk_frames=1024):
+    with wave.open(path, 'rb') as wf:
+        if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: use WAV mono de 16 bits")
+        detector = WakeWordDetector(model_path, wf.getframerate())
+        seconds = wf.getnframes() / wf.getframerate()
+        while True:
+            chunk = wf.readframes(chunk_frames)
+            if not chunk:
+                return False, seconds
+            if detector.accept(chunk):
+                return True, seconds
+
+
+def evaluate(test_dir, model_path=None):
+    """Mede as taxas de falsa aceitação e falsa rejeição num conjunto gravado."""
+    positives = sorted(glob.glob(os.path.join(test_dir, 'positivos', '*.wav')))
+    negatives = sorted(glob.glob(os.path.join(test_dir, 'negativos', '*.wav')))
+    rejected = [p for p in positives if not _detect_in_file(p, model_path)[0]]
+    accepted = []
+    negative_seconds = 0.0
+    for p in negatives:
+        fired, seconds = _detect_in_file(p, model_path)
+        negative_seconds += seconds
+        if fired:
+            accepted.append(p)
+    return {
+        'positivos': len(positives),
+        'negativos': len(negatives),
+        'falsa_rejeicao': len(rejected) / len(positives) if positives else 0.0,
+        'falsa_aceitacao': len(accepted) / len(negatives) if negatives else 0.0,
+        'falsas_aceitacoes_por_hora': len(accepted) / (negative_seconds / 3600) if negative_seconds else 0.0,
+        'rejeitados': rejected,
+        'aceitos_indevidamente': accepted,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m joelma.wakeword <diretorio_de_teste> [modelo_vosk]")
+        sys.exit(1)
+    result = evaluate(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"Positivos: {result['positivos']}  Negativos: {result['negativos']}")
+    print(f"Falsa rejeição: {result['falsa_rejeicao']:.1%}")
+    print(f"Falsa aceitação: {result['falsa_aceitacao']:.1%} "
+          f"({result['falsas_aceitacoes_por_hora']:.2f} por hora de áudio)")
+    for p in result['rejeitados']:
+        print("  rejeitado:", p)
+    for p in result['aceitos_indevidamente']:
+        print("  aceito indevidamente:", p)
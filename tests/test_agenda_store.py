@@ -0,0 +1,98 @@
+import datetime
+import sqlite3
+import threading
+
+import pytest
+
+from joelma import agenda_store
+
+
+def test_migracao_le_a_data_do_evento(tmp_path):
+    legado = tmp_path / "agenda.txt"
+    legado.write_text("[14/10/2026 10:00] Evento: dentista amanhã às 15h\n"
+                      "[14/10/2026 10:05] Evento: comprar pão\n", encoding='utf-8')
+    store = agenda_store.AgendaStore(str(tmp_path / "agenda.db"), legacy_file=str(legado))
+    dentista, pao = store.range()
+    assert dentista.quando == datetime.datetime(2026, 10, 15, 15, 0)
+    assert pao.quando is None
+    assert store.range(campo='quando') == [dentista]
+    assert not legado.exists()
+    store.close()
+
+
+def test_compactacao_em_passos(tmp_path, monkeypatch):
+    monkeypatch.setattr(agenda_store, 'PASSO_VACUUM', 8)
+    store = agenda_store.AgendaStore(str(tmp_path / "agenda.db"), legacy_file=None)
+    store.add_many([("x" * 500, None)] * 2000)
+    store._escrever(lambda db: db.execute("DELETE FROM eventos WHERE id > 100"))
+
+    def paginas():
+        return store._db.execute("PRAGMA page_count").fetchone()[0]
+    antes = paginas()
+    devolvidas = store.compactar()
+    assert devolvidas > 8
+    assert paginas() == antes - devolvidas
+    assert store.count() == 100
+    store.close()
+
+
+def test_group_commit_com_varias_threads(tmp_path, monkeypatch):
+    store = agenda_store.AgendaStore(str(tmp_path / "agenda.db"), legacy_file=None)
+    gravar = store._gravar
+    primeira = threading.Event()
+
+    def devagar(grupo):
+        primeira.wait(5)  # segura a primeira transação enquanto as outras chegam
+        gravar(grupo)
+    monkeypatch.setattr(store, '_gravar', devagar)
+
+    def cadastrar(t):
+        for i in range(25):
+            store.add(f"thread {t} evento {i}")
+    ths = [threading.Thread(target=cadastrar, args=(t,)) for t in range(8)]
+    for th in ths:
+        th.start()
+    primeira.set()
+    for th in ths:
+        th.join()
+    assert store.count() == 200 == len(store.range())
+    assert store.escritas == 200
+    assert store.transacoes < store.escritas  # escritas dividiram transações
+    store.close()
+
+
+def test_erro_numa_escrita_nao_desfaz_o_grupo(tmp_path):
+    store = agenda_store.AgendaStore(str(tmp_path / "agenda.db"), legacy_file=None)
+
+    def falha(db):
+        db.execute("INSERT INTO eventos (criado_em, texto) VALUES ('x', 'meio feito')")
+        raise sqlite3.IntegrityError("falhou")
+    escritas = [agenda_store._Escrita(lambda db: db.execute(
+        "INSERT INTO eventos (criado_em, texto) VALUES ('2026-01-01 00:00:00', 'ok')").lastrowid),
+        agenda_store._Escrita(falha)]
+    store._gravar(escritas)
+    assert escritas[0].erro is None and isinstance(escritas[1].erro, sqlite3.IntegrityError)
+    assert [ev.texto for ev in store.range()] == ["ok"]
+    store.close()
+
+
+def test_contador_por_trigger(tmp_path):
+    path = str(tmp_path / "agenda.db")
+    store = agenda_store.AgendaStore(path, legacy_file=None)
+    ids = store.add_many([(f"evento {i}", None) for i in range(10)])
+    store.delete(ids[0])
+    assert store.count() == 9
+    outro = agenda_store.AgendaStore(path, legacy_file=None)  # outro processo, mesmo banco
+    outro.add("de fora")
+    assert store.count() == 10
+    outro.close()
+    store.clear()
+    assert store.count() == 0
+    store.close()
+
+
+def test_campo_invalido(tmp_path):
+    store = agenda_store.AgendaStore(str(tmp_path / "agenda.db"), legacy_file=None)
+    with pytest.raises(ValueError):
+        store.count(datetime.datetime.now(), campo="texto")
+    store.close()
@@ -0,0 +1,54 @@
+import datetime
+import threading
+
+from joelma import agendador
+
+
+def _em(segundos):
+    return datetime.datetime.now() + datetime.timedelta(seconds=segundos)
+
+
+def test_limpar_no_meio_da_carga_descarta_o_que_foi_lido():
+    lendo, limpou = threading.Event(), threading.Event()
+
+    def carregar():
+        lendo.set()
+        limpou.wait(5)
+        return [(1, _em(3600), "dentista")]  # lido antes da agenda ser apagada
+    ag = agendador.Agendador(lambda *a: None, publish=False).iniciar(carregar=carregar)
+    lendo.wait(5)
+    ag.limpar()
+    limpou.set()
+    ag.parar()
+    assert len(ag) == 0 and ag.proximo() is None
+
+
+def test_dispara_em_ordem_e_respeita_cancelamento():
+    disparados = []
+    pronto = threading.Event()
+
+    def on_due(ident, quando, texto):
+        disparados.append(ident)
+        if len(disparados) == 4:
+            pronto.set()
+    ag = agendador.Agendador(on_due, publish=False).iniciar()
+    ag.agendar(3, _em(0.15), "c")
+    ag.agendar(1, _em(0.05), "a")
+    ag.agendar(2, _em(0.10), "b")
+    ag.agendar(9, _em(0.07), "cancelado")
+    ag.agendar(4, _em(3600), "d")
+    ag.agendar(4, _em(0.20), "d reagendado")  # vale o horário mais novo
+    assert ag.cancelar(9) and not ag.cancelar(9)
+    assert pronto.wait(5)
+    ag.parar()
+    assert disparados == [1, 2, 3, 4]
+
+
+def test_cancelados_saem_do_heap():
+    ag = agendador.Agendador(lambda *a: None, publish=False)
+    ag.carregar([(i, _em(3600 + i), f"evento {i}") for i in range(200)])
+    for i in range(150):
+        ag.cancelar(i)
+    assert len(ag) == 50
+    assert len(ag._heap) < 200  # reconstruído quando os cancelados passaram da metade
+    assert ag.proximo()[0] == 150
@@ -0,0 +1,14 @@
+import pytest
+
+from joelma import audio
+
+
+class SemBackends:
+    def ordem(self):
+        return []
+
+
+def test_sintese_sem_backend_levanta_runtimeerror(monkeypatch):
+    monkeypatch.setattr(audio, 'sintetizador', SemBackends)
+    with pytest.raises(RuntimeError):
+        audio._com_reserva(lambda seletor, backend: b"")
@@ -0,0 +1,35 @@
+import pytest
+
+from joelma import calculadora
+
+
+@pytest.mark.parametrize('texto, valor', [
+    ("2 mais 3 vezes 4", 14),
+    ("(2 mais 3) vezes 4", 20),
+    ("dois vírgula cinco vezes quatro", 10),
+    ("10 dividido por 4", 2.5),
+    ("2 ^ 10", 1024),
+    ("sqrt(16)", 4),
+])
+def test_contas(texto, valor):
+    assert calculadora.safe_eval(texto) == pytest.approx(valor)
+
+
+@pytest.mark.parametrize('texto', [
+    "9 ^ 9 ^ 9",        # expoente grande demais
+    "2 ^ 100000",
+    "10 ^ 400.5",       # OverflowError do float
+    "1 / 0",
+    "__import__(1)",    # só números e operadores sobrevivem à normalização
+    "42",               # um número sozinho não é conta
+])
+def test_recusadas_com_valueerror(texto):
+    with pytest.raises(ValueError):
+        calculadora.safe_eval(texto)
+
+
+def test_normalizacao_em_cache():
+    calculadora.normalize.cache_clear()
+    calculadora.safe_eval("7 vezes 6")
+    calculadora.safe_eval("7 vezes 6")
+    assert calculadora.normalize.cache_info().hits >= 1
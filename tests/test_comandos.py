@@ -0,0 +1,47 @@
+from joelma import assistente
+from joelma.comandos import CommandRegistry
+
+
+def _registro():
+    r = CommandRegistry()
+    for nome, frases, prioridade in [("hora", ["hora", "que horas"], 50),
+                                     ("agenda", ["agenda"], 90),
+                                     ("consulta", ["agenda de"], 92),
+                                     ("data", ["data"], 40)]:
+        r.register(nome, frases, prioridade)(lambda texto, nome=nome: nome)
+    r.set_fallback(lambda texto: "fallback")
+    return r
+
+
+def test_maior_prioridade_vence():
+    r = _registro()
+    assert r.match("que horas tem na agenda").name == "agenda"
+    assert r.match("ler agenda de hoje").name == "consulta"
+
+
+def test_frase_mais_longa_desempata():
+    r = CommandRegistry()
+    r.register("curta", ["hora"], 10)(None)
+    r.register("longa", ["que hora"], 10)(None)
+    assert r.match("que hora é").name == "longa"
+
+
+def test_so_palavras_inteiras():
+    r = _registro()
+    assert r.match("validade do leite") is None
+    assert r.dispatch("validade do leite") == "fallback"
+    assert r.dispatch("DATA de hoje") == "data"
+
+
+def test_registro_do_assistente():
+    casos = {
+        "ler agenda de hoje": "consultar_agenda",
+        "ler agenda": "ler_agenda",
+        "cadastrar evento": "cadastrar_evento",
+        "sexta-feira, parar": "parar",
+        "calcular 2 mais 2": "calcular",
+        "resolver equação de segundo grau": "equacao",
+        "que horas são": "hora",
+    }
+    for texto, nome in casos.items():
+        assert assistente.comandos.match(texto).name == nome, texto
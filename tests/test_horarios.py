@@ -0,0 +1,39 @@
+import datetime
+
+import pytest
+
+from joelma import horarios, wakeword
+
+AGORA = datetime.datetime(2026, 10, 14, 10, 0)  # quarta-feira, 10h
+
+
+@pytest.mark.parametrize('texto, quando, resto', [
+    ("amanhã às 15h", datetime.datetime(2026, 10, 15, 15, 0), ""),
+    ("sexta às 9 e meia", datetime.datetime(2026, 10, 16, 9, 30), ""),
+    ("dia 25 de dezembro às 10", datetime.datetime(2026, 12, 25, 10, 0), ""),
+    ("daqui a 20 minutos", datetime.datetime(2026, 10, 14, 10, 20), ""),
+    ("hoje à noite", datetime.datetime(2026, 10, 14, 20, 0), ""),
+    ("reunião às 15:30", datetime.datetime(2026, 10, 14, 15, 30), "reunião"),
+    ("reunião 15:30", datetime.datetime(2026, 10, 14, 15, 30), "reunião"),
+    ("dentista amanhã 9:05", datetime.datetime(2026, 10, 15, 9, 5), "dentista"),
+    ("lá pelas 8 da noite", datetime.datetime(2026, 10, 14, 20, 0), ""),
+])
+def test_interpretar(texto, quando, resto):
+    assert horarios.interpretar(texto, AGORA) == (quando, resto)
+
+
+@pytest.mark.parametrize('texto', ["comprar as 3 tarefas", "segunda reunião", "nota: 30 itens"])
+def test_sem_horario(texto):
+    assert horarios.interpretar(texto, AGORA) == (None, texto)
+
+
+def test_descrever():
+    assert horarios.descrever(datetime.datetime(2026, 10, 14, 15, 0), AGORA) == "hoje às 15:00"
+    assert horarios.descrever(datetime.datetime(2026, 10, 15, 12, 0), AGORA) == "amanhã ao meio-dia"
+    assert horarios.descrever(datetime.datetime(2026, 10, 16, 9, 30), AGORA) == "sexta às 9:30"
+
+
+def test_dia_falado_nao_ativa():
+    # O assistente falando de um evento na sexta não pode se interromper
+    for data in (AGORA + datetime.timedelta(days=d) for d in range(7)):
+        assert not wakeword.contains_wake_word(horarios.descrever(data, AGORA))
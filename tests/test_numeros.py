@@ -0,0 +1,58 @@
+import pytest
+
+from joelma import calculadora, numeros
+
+
+@pytest.mark.parametrize('texto, valor', [
+    ("menos três", -3),
+    ("dois vírgula cinco", 2.5),
+    ("três quartos", 0.75),
+    ("um e meio", 1.5),
+    ("cento e vinte", 120),
+    ("cento e vinte e cinco", 125),
+    ("2 mil", 2000),
+    ("1/2", 0.5),
+    ("menos meio", -0.5),
+    ("dois mil e meio", 2500),
+    ("um milhão e meio", 1500000),
+    ("dois milhões e meio", 2500000),
+    ("cem por cento", 1),
+    ("vinte por cento", 0.2),
+])
+def test_numero(texto, valor):
+    assert numeros.numero(texto) == pytest.approx(valor)
+
+
+def test_dois_numeros_seguidos():
+    assert numeros.numeros("dois três") == [2.0, 3.0]
+
+
+@pytest.mark.parametrize('texto, esperado', [
+    ("dois mais três quartos", "2 mais 0.75"),
+    ("um milhão e meio", "1500000"),
+    ("20 por cento de 150", "0.2 vezes 150"),
+    ("10 por 2", "10 por 2"),
+])
+def test_para_algarismos(texto, esperado):
+    assert numeros.para_algarismos(texto) == esperado
+
+
+@pytest.mark.parametrize('texto, valor', [
+    ("vinte por cento de 150", 30),
+    ("cinquenta por cento de dois mil e meio", 1250),
+    ("10 por 2", 5),
+])
+def test_calculadora_porcentagem(texto, valor):
+    assert calculadora.safe_eval(texto) == pytest.approx(valor)
+
+
+def test_grau():
+    assert numeros.grau("segundo grau, a igual a um")[0] == 2
+    assert numeros.grau("2º grau")[0] == 2
+    assert numeros.grau("sem grau nenhum dito")[0] is None
+
+
+def test_coeficientes():
+    assert numeros.coeficientes("a igual a um, b menos três, c dois", "abc") == {'a': 1, 'b': -3, 'c': 2}
+    assert numeros.coeficientes("um, menos três, dois", "abc") == {'a': 1, 'b': -3, 'c': 2}
+    assert numeros.coeficientes("c dois", "abc", {'a': 1, 'b': 0}) == {'a': 1, 'b': 0, 'c': 2}
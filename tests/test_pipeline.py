@@ -0,0 +1,115 @@
+import queue
+import threading
+import time
+
+from joelma import pipeline
+
+
+class Fases:
+    """Estágios falsos, sem áudio: a "fala" é o próprio texto, a reprodução
+    leva um tempo fixo e a palavra de ativação é disparada pelo teste."""
+
+    def __init__(self, falas, despachar, duracao=0.05):
+        self.ativar = threading.Event()
+        self.falas = queue.Queue()
+        for f in falas:
+            self.falas.put(f)
+        self.tocadas = []
+        self.duracao = duracao
+        self.fluxo = pipeline.Pipeline(
+            wait_wake=self.wait_wake, capture=self.capture, recognize=lambda audio: audio,
+            dispatch=despachar, synthesize=lambda texto: texto, play=self.play)
+
+    def wait_wake(self, stop):
+        while not stop.is_set():
+            if self.ativar.wait(0.01):
+                self.ativar.clear()
+                return True
+        return False
+
+    def capture(self, **kwargs):
+        return self.falas.get(timeout=5)
+
+    def play(self, audio, parar):
+        self.tocadas.append(audio)
+        parar.wait(self.duracao)
+
+    def rodar(self):
+        t = threading.Thread(target=self.fluxo.run, daemon=True)
+        t.start()
+        return t
+
+
+def esperar(condicao, timeout=5):
+    fim = time.monotonic() + timeout
+    while not condicao():
+        if time.monotonic() > fim:
+            raise AssertionError("tempo esgotado")
+        time.sleep(0.01)
+
+
+def test_ativacao_durante_leitura_paginada_cancela_o_turno():
+    comandos, cancelados = [], []
+    fases = None
+
+    def despachar(texto):
+        comandos.append(texto)
+        if texto == "parar":
+            return False
+        try:
+            for i in range(5):
+                fases.fluxo.say(f"evento {i}", priority=pipeline.BAIXA)
+            fases.fluxo.say("Quer ouvir mais?", priority=pipeline.BAIXA)
+            fases.fluxo.listen(perfil='comando')
+            comandos.append("continuou")
+        except pipeline.Cancelled:
+            cancelados.append(texto)
+            raise
+
+    fases = Fases(["ler agenda", "parar"], despachar, duracao=0.2)
+    t = fases.rodar()
+    fases.ativar.set()
+    esperar(lambda: "evento 1" in fases.tocadas)
+    fases.ativar.set()  # "sexta-feira, parar" no meio da leitura
+    t.join(5)
+    assert not t.is_alive()
+    assert comandos == ["ler agenda", "parar"]
+    assert cancelados == ["ler agenda"]
+    assert "Quer ouvir mais?" not in fases.tocadas
+
+
+def test_resposta_pedida_pelo_handler():
+    respostas = []
+    fases = None
+
+    def despachar(texto):
+        fases.fluxo.say("Qual evento?")
+        respostas.append(fases.fluxo.listen(perfil='evento'))
+        return False
+
+    fases = Fases(["cadastrar evento", "dentista amanhã"], despachar)
+    t = fases.rodar()
+    fases.ativar.set()
+    t.join(5)
+    assert respostas == ["dentista amanhã"]
+    assert "Qual evento?" in fases.tocadas
+
+
+def test_estagio_que_morre_encerra_o_run():
+    def capture(**kwargs):
+        raise OSError("microfone sumiu")
+
+    fases = Fases([], lambda texto: None)
+    fases.fluxo._capture = capture
+    erros = []
+
+    def rodar():
+        try:
+            fases.fluxo.run()
+        except OSError as e:
+            erros.append(e)
+    t = threading.Thread(target=rodar, daemon=True)
+    t.start()
+    fases.ativar.set()
+    t.join(5)
+    assert not t.is_alive() and len(erros) == 1
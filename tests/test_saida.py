@@ -0,0 +1,56 @@
+import threading
+import time
+
+from joelma import saida
+
+
+class Som:
+    """Síntese e reprodução falsas: o áudio é o texto e tocar leva um tempo fixo."""
+
+    def __init__(self, duracao=0.05):
+        self.duracao = duracao
+        self.tocadas = []
+        self.cortadas = []
+        self.tocando = threading.Event()
+
+    def play(self, audio, parar):
+        self.tocadas.append(audio)
+        self.tocando.set()
+        if parar.wait(self.duracao):
+            self.cortadas.append(audio)
+
+
+def test_interrupt_corta_a_fala_e_descarta_a_fila():
+    som = Som(duracao=2)
+    s = saida.SaidaAudio(lambda texto: texto, som.play)
+    falas = [saida.Fala(f"evento {i}", priority=saida.BAIXA) for i in range(5)]
+    for fala in falas:
+        s.put(fala)
+    assert som.tocando.wait(2)
+    t0 = time.monotonic()
+    assert s.interrupt()
+    assert s.wait_idle(2)
+    assert time.monotonic() - t0 < 1
+    assert som.tocadas == ["evento 0"] and som.cortadas == ["evento 0"]
+    assert all(f.done.is_set() for f in falas)
+    assert not s.interrupt()  # nada mais tocando nem na fila
+
+
+def test_prioridade_passa_a_frente_da_leitura():
+    som = Som()
+    s = saida.SaidaAudio(lambda texto: texto, som.play)
+    s.put(saida.Fala("primeira"))
+    som.tocando.wait(2)
+    for i in range(3):
+        s.put(saida.Fala(f"leitura {i}", priority=saida.BAIXA))
+    s.put(saida.Fala("Lembrete: dentista", priority=saida.URGENTE))
+    assert s.wait_idle(5)
+    assert som.tocadas[0] == "primeira"
+    assert som.tocadas.index("Lembrete: dentista") < som.tocadas.index("leitura 2")
+
+
+def test_dividir_trechos():
+    assert saida.dividir("Sim? Evento cadastrado.") == ["Sim?", "Evento cadastrado."]
+    assert saida.dividir("O resultado é 2.50, certo?") == ["O resultado é 2.50, certo?"]
+    longa = ", ".join(["reunião com a equipe"] * 10)
+    assert all(len(t) <= saida.TRECHO_MAX for t in saida.dividir(longa))
@@ -0,0 +1,58 @@
+import socket
+import threading
+
+import pytest
+
+from joelma import config, servidor
+
+
+@pytest.fixture
+def srv(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'DATA_DIR', str(tmp_path))
+    s = servidor.Servidor(('127.0.0.1', 0))
+    threading.Thread(target=s.serve_forever, daemon=True).start()
+    yield s
+    s.shutdown()
+    s.server_close()
+
+
+def test_lembrete_chega_as_sessoes_abertas(srv):
+    c = servidor.Cliente(porta=srv.server_address[1], timeout=5)
+    c.turno("bom dia")  # a sessão já está registrada no servidor
+    srv.avisar("Lembrete: dentista")
+    falas, _, fim = c.turno("ok sexta-feira que horas são")
+    assert c.lembretes == ["Lembrete: dentista"]
+    assert falas and falas[0].startswith("Agora são") and not fim
+    c.fechar()
+
+
+def test_quadros_ida_e_volta():
+    a, b = socket.socketpair()
+    arquivo = b.makefile('rb')
+    servidor.enviar(a, b'T', "ok sexta-feira".encode('utf-8'))
+    servidor.enviar(a, b'W')
+    assert servidor.receber(arquivo) == (b'T', "ok sexta-feira".encode('utf-8'))
+    assert servidor.receber(arquivo) == (b'W', b"")
+    a.sendall(b'A\x00\x00\x00\x10' + b"curto")  # quadro cortado: a conexão fechou no meio
+    a.close()
+    assert servidor.receber(arquivo) == (None, None)
+    arquivo.close()
+    b.close()
+
+
+def test_fala_sem_ativacao_recebe_so_o_fim_do_turno(srv):
+    c = servidor.Cliente(porta=srv.server_address[1], timeout=5)
+    assert c.turno("bom dia pessoal") == ([], [], False)
+    falas, _, fim = c.turno("ok sexta-feira", "que horas são")
+    assert falas[0] == "Sim?" and falas[1].startswith("Agora são") and not fim
+    falas, _, fim = c.turno("ok sexta-feira sair")
+    assert fim
+    c.fechar()
+
+
+def test_segmentador_recorta_a_fala():
+    seg = servidor.Segmentador(lambda: servidor.vad.perfil('comando'))
+    silencio = bytes(servidor.BLOCO * servidor.SAMPLE_WIDTH)
+    fala = (b"\x00\x40" + b"\x00\xc0") * servidor.BLOCO
+    falas = seg.push(silencio * 20 + fala * 10 + silencio * 40)
+    assert len(falas) == 1
@@ -0,0 +1,38 @@
+import threading
+import time
+
+import pytest
+
+from joelma import sintese
+
+
+class Lento(sintese.Backend):
+    name = 'lento'
+
+    def __init__(self, demora, budget=1.0):
+        self.demora = demora
+        self.budget = budget
+
+    def synthesize(self, text):
+        time.sleep(self.demora)
+        return b"audio"
+
+
+def test_medicao_nao_conta_a_espera_por_vaga():
+    backend = Lento(0.1)
+    seletor = sintese.Seletor([backend])
+    # As vagas ocupadas por outras sínteses (o aquecimento, por exemplo)
+    ocupadas = [threading.Thread(target=seletor.sintetizar, args=(backend, "x"))
+                for _ in range(sintese.MAX_CHAMADAS)]
+    for t in ocupadas:
+        t.start()
+    time.sleep(0.02)
+    data, dt = seletor.sintetizar(backend, "y", medir=True)
+    assert data == b"audio"
+    assert dt < 0.15
+
+
+def test_orcamento_estourado():
+    seletor = sintese.Seletor([Lento(0.5, budget=0.05)])
+    with pytest.raises(TimeoutError):
+        seletor.sintetizar(seletor.backends[0], "x")
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+from joelma import tts_cache
+
+
+def test_temporarios_orfaos_apagados_na_abertura(tmp_path):
+    velho = tmp_path / "tmpvelho.tmp"
+    novo = tmp_path / "tmpnovo.tmp"
+    velho.write_bytes(b"x")
+    novo.write_bytes(b"x")
+    antigo = time.time() - tts_cache.TMP_ORFAO - 60
+    os.utime(velho, (antigo, antigo))
+    tts_cache.TTSCache(str(tmp_path))
+    assert not velho.exists()
+    assert novo.exists()  # pode ser de outro cache gravando agora
+
+
+def test_acerto_em_memoria_atualiza_o_mtime(tmp_path):
+    cache = tts_cache.TTSCache(str(tmp_path), suffix=".wav")
+    cache.put_bytes("Sim?", 'pt', 'gtts', b"audio")
+    cache.flush()
+    path = cache.path_for(cache.key("Sim?", 'pt', 'gtts'))
+    os.utime(path, (1000, 1000))
+    assert cache.get_bytes("Sim?", 'pt', 'gtts') == b"audio"
+    assert os.path.getmtime(path) > 1000
+
+
+def test_clear_descarta_as_pendentes(tmp_path, monkeypatch):
+    cache = tts_cache.TTSCache(str(tmp_path), suffix=".wav")
+    gravando = threading.Event()
+    liberar = threading.Event()
+    put_key = cache._put_key
+
+    def lento(key, synthesize):
+        gravando.set()
+        liberar.wait(5)
+        return put_key(key, synthesize)
+    monkeypatch.setattr(cache, '_put_key', lento)
+    cache.put_bytes("um", 'pt', 'gtts', b"1")
+    cache.put_bytes("dois", 'pt', 'gtts', b"2")
+    gravando.wait(5)  # "um" está sendo gravado, "dois" espera na fila
+    limpeza = threading.Thread(target=cache.clear)
+    limpeza.start()
+    limpeza.join(1)
+    assert not limpeza.is_alive()  # não espera o disco
+    assert cache.get_bytes("dois", 'pt', 'gtts') is None
+    liberar.set()
+    cache.flush()
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['pendentes'] == 0
+    assert [n for n in os.listdir(tmp_path) if n.endswith(".wav")] == []
+
+
+def test_single_flight(tmp_path):
+    cache = tts_cache.TTSCache(str(tmp_path), suffix=".wav")
+    chamadas = []
+    liberar = threading.Event()
+
+    def sintetizar():
+        chamadas.append(1)
+        liberar.wait(5)
+        return b"audio"
+    resultados = []
+    ths = [threading.Thread(target=lambda: resultados.append(
+        cache.get_or_create_bytes("Sim?", 'pt', 'gtts', sintetizar))) for _ in range(8)]
+    for t in ths:
+        t.start()
+    time.sleep(0.05)
+    liberar.set()
+    for t in ths:
+        t.join()
+    assert resultados == [b"audio"] * 8
+    assert len(chamadas) == 1
+
+
+def test_gravador_persiste_para_a_proxima_abertura(tmp_path):
+    cache = tts_cache.TTSCache(str(tmp_path), suffix=".wav")
+    cache.put_bytes("Evento cadastrado.", 'pt', 'gtts', b"wav")
+    cache.flush()
+    assert cache.stats()['pendentes'] == 0
+    outro = tts_cache.TTSCache(str(tmp_path), suffix=".wav")
+    assert outro.get_bytes("Evento cadastrado.", 'pt', 'gtts') == b"wav"
+    assert outro.get_bytes("Evento cadastrado.", 'pt', 'espeak') is None  # o backend faz parte da chave
+
+
+def test_limite_em_bytes_descarta_o_menos_usado(tmp_path):
+    cache = tts_cache.TTSCache(str(tmp_path), max_bytes=10, suffix=".wav")
+    for texto in ("a", "b", "c"):
+        cache.put(texto, 'pt', 'gtts', lambda path: open(path, 'wb').write(b"1234"))
+    assert cache.get("a", 'pt', 'gtts') is None
+    assert cache.get("c", 'pt', 'gtts') is not None
+    assert cache.stats()['bytes'] <= 10